@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 import os
 import sys
+import glob
+import json
+import stat
+import shutil
+import tarfile
+import hashlib
+import sysconfig
 import subprocess
 import requests
 import time
 import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 class AllInOneVenvSetup:
-    def __init__(self):
+    def __init__(self, parallel=False, jobs=3):
         self.github_repo = "https://github.com/Thaniyanki/raspberry-pi-bots"
         self.github_raw = "https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main"
+        self.github_api = "https://api.github.com/repos/Thaniyanki/raspberry-pi-bots"
         
         # Colors for terminal output
         self.GREEN = '\033[92m'
@@ -19,6 +29,27 @@ class AllInOneVenvSetup:
         self.BLUE = '\033[94m'
         self.ENDC = '\033[0m'
         self.BOLD = '\033[1m'
+        
+        # Parallel provisioning - one apt run for every bot, then several venv builds at once
+        self.parallel = parallel
+        self.jobs = max(1, jobs)
+        self.print_lock = threading.Lock()
+        self.cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "raspberry-pi-bots")
+        self.log_dir = os.path.join(self.cache_dir, "install-logs", datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.venv_scripts = {}  # folder -> downloaded venv.sh
+        
+        # Repository snapshot - the repo unpacked from one tarball of the current commit, shared with the scheduler
+        self.repository_cache = os.path.join(self.cache_dir, "repository")
+        self.repository_snapshot = os.getenv('BOTS_REPOSITORY_SNAPSHOT')  # handed over by the scheduler
+        if self.repository_snapshot and not os.path.isdir(self.repository_snapshot):
+            self.repository_snapshot = None
+        
+        # Shared wheelhouse - every bot's Python packages built once per Python version and platform
+        python_tag = f"cp{sys.version_info.major}{sys.version_info.minor}"
+        platform_tag = sysconfig.get_platform().replace('-', '_').replace('.', '_')
+        self.wheelhouse = os.path.join(self.cache_dir, "wheelhouse", f"{python_tag}-{platform_tag}")
+        self.pip_env = {}  # PIP_FIND_LINKS / PIP_NO_INDEX handed to every venv.sh
+        self.bots_dir = os.path.join(os.path.expanduser("~"), "bots")
 
     def print_header(self, message):
         print(f"\n{self.BOLD}{self.BLUE}{'='*60}{self.ENDC}")
@@ -120,10 +151,106 @@ class AllInOneVenvSetup:
             self.print_warning(f"Could not fix pip issues: {e}")
             return False
 
+    def resolve_github_commit(self):
+        """Get the commit the main branch points at - answered with 304 while it has not moved"""
+        state_file = os.path.join(self.repository_cache, "current.json")
+        state = {}
+        try:
+            with open(state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        headers = {"Accept": "application/vnd.github.sha"}
+        if state.get('etag'):
+            headers["If-None-Match"] = state['etag']
+        
+        try:
+            response = requests.get(f"{self.github_api}/commits/main", headers=headers, timeout=30)
+            if response.status_code == 304 and state.get('sha'):
+                return state['sha']
+            if response.status_code == 200:
+                state = {'sha': response.text.strip(), 'etag': response.headers.get('ETag')}
+                os.makedirs(self.repository_cache, exist_ok=True)
+                with open(state_file + ".tmp", 'w') as f:
+                    json.dump(state, f)
+                os.replace(state_file + ".tmp", state_file)
+                return state['sha']
+            self.print_warning(f"Could not resolve the main branch: HTTP {response.status_code}")
+        except Exception as e:
+            self.print_warning(f"Could not resolve the main branch: {e}")
+        return state.get('sha')  # offline - use the last commit that was fetched
+
+    def download_repository_tarball(self, sha, snapshot):
+        """Download the repository at one commit as a tarball and unpack it into snapshot"""
+        partial = snapshot + ".partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        
+        try:
+            self.print_info(f"Downloading repository snapshot {sha[:7]}...")
+            response = requests.get(f"{self.github_api}/tarball/{sha}", timeout=120, stream=True)
+            if response.status_code != 200:
+                self.print_warning(f"Repository download failed: HTTP {response.status_code}")
+                return False
+            
+            with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+                for member in archive:
+                    # Drop the "<owner>-<repo>-<sha>/" folder every entry starts with
+                    name = member.name.split('/', 1)[1] if '/' in member.name else ''
+                    parts = [part for part in name.split('/') if part]
+                    if not parts or name.startswith('/') or '..' in parts:
+                        continue
+                    target = os.path.join(partial, *parts)
+                    if member.isdir():
+                        os.makedirs(target, exist_ok=True)
+                    elif member.isfile():  # links and devices are never needed
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with archive.extractfile(member) as source, open(target, 'wb') as destination:
+                            shutil.copyfileobj(source, destination)
+            
+            os.replace(partial, snapshot)
+            for name in os.listdir(self.repository_cache):
+                old = os.path.join(self.repository_cache, name)
+                if os.path.isdir(old) and old != snapshot:
+                    shutil.rmtree(old, ignore_errors=True)
+            self.print_success(f"Repository snapshot {sha[:7]} ready")
+            return True
+        except Exception as e:
+            self.print_warning(f"Repository download failed: {e}")
+            shutil.rmtree(partial, ignore_errors=True)
+            return False
+
+    def get_repository_snapshot(self):
+        """Get the local copy of the repository at the current commit, downloading it once per commit"""
+        if self.repository_snapshot is None:
+            sha = self.resolve_github_commit()
+            if sha:
+                snapshot = os.path.join(self.repository_cache, sha)
+                if os.path.isdir(snapshot) or self.download_repository_tarball(sha, snapshot):
+                    self.repository_snapshot = snapshot
+        return self.repository_snapshot
+
+    def get_repository_file(self, path):
+        """Get the snapshot copy of a repository file, or None when it is not available"""
+        snapshot = self.get_repository_snapshot()
+        if snapshot is None:
+            return None
+        local_file = os.path.join(snapshot, path)
+        return local_file if os.path.isfile(local_file) else None
+
     def get_all_folders_from_github(self):
-        """Get all folders from GitHub repository using GitHub API"""
+        """Get all folders from the repository snapshot, or from the GitHub API when it is not available"""
         self.print_info("Scanning GitHub repository for ALL folders...")
         
+        snapshot = self.get_repository_snapshot()
+        if snapshot is not None:
+            folders = sorted(
+                name for name in os.listdir(snapshot)
+                if os.path.isdir(os.path.join(snapshot, name)) and not name.startswith('.') and name != 'all-in-one-venv'
+            )
+            self.print_success(f"Found {len(folders)} folders in repository")
+            return folders
+        
         api_url = "https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents"
         
         try:
@@ -148,6 +275,9 @@ class AllInOneVenvSetup:
 
     def check_venv_sh_exists(self, folder_name):
         """Check if venv.sh exists in a folder"""
+        if self.get_repository_snapshot() is not None:
+            return self.get_repository_file(f"{folder_name}/venv.sh") is not None
+        
         venv_url = f"{self.github_raw}/{folder_name}/venv.sh"
         
         try:
@@ -172,18 +302,22 @@ class AllInOneVenvSetup:
             temp_script = f"/tmp/venv_{folder_name}.sh"
             
             try:
-                # Download the script first
-                self.print_info("Downloading script...")
-                response = requests.get(script_url, timeout=30)
-                if response.status_code != 200:
-                    self.print_error(f"Failed to download script from: {script_url}")
-                    attempt += 1
-                    time.sleep(10)
-                    continue
-                
-                # Save to temporary file
-                with open(temp_script, 'w') as f:
-                    f.write(response.text)
+                snapshot_script = self.get_repository_file(f"{folder_name}/venv.sh")
+                if snapshot_script is not None:
+                    shutil.copyfile(snapshot_script, temp_script)
+                else:
+                    # Download the script first
+                    self.print_info("Downloading script...")
+                    response = requests.get(script_url, timeout=30)
+                    if response.status_code != 200:
+                        self.print_error(f"Failed to download script from: {script_url}")
+                        attempt += 1
+                        time.sleep(10)
+                        continue
+                    
+                    # Save to temporary file
+                    with open(temp_script, 'w') as f:
+                        f.write(response.text)
                 
                 # Make it executable
                 subprocess.run(['chmod', '+x', temp_script], check=True)
@@ -193,6 +327,7 @@ class AllInOneVenvSetup:
                 env['PIP_DEFAULT_TIMEOUT'] = '300'
                 env['PIP_RETRIES'] = '10'
                 env['DEBIAN_FRONTEND'] = 'noninteractive'
+                env.update(self.pip_env)
                 
                 self.print_info("Running installation script with LIVE OUTPUT...")
                 self.print_info("You will see all installation progress below:")
@@ -252,6 +387,317 @@ class AllInOneVenvSetup:
         self.print_error(f"🚨 MAXIMUM ATTEMPTS REACHED: Failed to install {display_name} after {max_attempts} attempts")
         return False
 
+    def print_tagged(self, tag, message, color=None):
+        """Print one line prefixed with the bot it belongs to - safe to call from several threads"""
+        with self.print_lock:
+            print(f"{color or self.BLUE}[{tag}]{self.ENDC} {message}", flush=True)
+
+    def run_logged(self, tag, command, log_path, env=None):
+        """Run a command, writing its output to log_path and to the terminal tagged with tag"""
+        with open(log_path, 'a') as log:
+            log.write(f"\n===== {datetime.now().strftime('%d-%m-%Y %H:%M:%S')} $ {' '.join(command)}\n")
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='replace',
+                env=env
+            )
+            for line in process.stdout:
+                log.write(line)
+                log.flush()
+                self.print_tagged(tag, line.rstrip())
+            return process.wait()
+
+    def download_venv_script(self, folder_name, attempts=5):
+        """Download a bot's venv.sh to /tmp, retrying with backoff - returns the local path or None"""
+        if os.path.exists(self.venv_scripts.get(folder_name, "")):
+            return self.venv_scripts[folder_name]
+        
+        temp_script = f"/tmp/venv_{folder_name}.sh"
+        snapshot_script = self.get_repository_file(f"{folder_name}/venv.sh")
+        if snapshot_script is not None:
+            shutil.copyfile(snapshot_script, temp_script)
+            os.chmod(temp_script, 0o755)
+            self.venv_scripts[folder_name] = temp_script
+            return temp_script
+        
+        script_url = f"{self.github_raw}/{folder_name}/venv.sh"
+        delay = 5
+        
+        for attempt in range(1, attempts + 1):
+            try:
+                response = requests.get(script_url, timeout=30)
+                if response.status_code == 200:
+                    with open(temp_script, 'w') as f:
+                        f.write(response.text)
+                    os.chmod(temp_script, 0o755)
+                    self.venv_scripts[folder_name] = temp_script
+                    return temp_script
+            except Exception:
+                pass
+            if attempt < attempts:
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+        return None
+
+    def list_packages(self, script, option='--list-system-packages'):
+        """Ask a venv.sh for the apt (or, with --list-python-packages, pip) packages it needs, or None"""
+        with open(script) as f:
+            if option not in f.read():
+                return None  # older script - running it would start a full install
+        
+        try:
+            result = subprocess.run(['bash', script, option],
+                                    capture_output=True, text=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            return None
+        lines = [line for line in result.stdout.splitlines() if line.strip()]
+        if result.returncode != 0 or not lines:
+            return None
+        return lines[-1].split()
+
+    def is_bot_up_to_date(self, folder_name):
+        """True when the bot's venv.sh reports its dependency fingerprint unchanged"""
+        script = self.download_venv_script(folder_name)
+        if script is None:
+            return False
+        with open(script) as f:
+            if "--check-fingerprint" not in f.read():
+                return False
+        try:
+            result = subprocess.run(['bash', script, '--check-fingerprint'],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0
+
+    def resolve_system_packages(self, wanted):
+        """Pick the first available name of every "a|b" entry and drop packages apt does not know"""
+        known = {}
+        
+        def available(package):
+            if package not in known:
+                result = subprocess.run(['apt-cache', 'show', package],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                known[package] = result.returncode == 0
+            return known[package]
+        
+        packages = []
+        for entry in dict.fromkeys(wanted):  # every bot asks for python3, git, ...
+            choice = next((name for name in entry.split('|') if available(name)), None)
+            if choice is None:
+                self.print_warning(f"Skipping unavailable package: {entry}")
+            elif choice not in packages:
+                packages.append(choice)
+        return packages
+
+    def install_system_packages(self, wanted, attempts=5):
+        """Install the system packages of every bot in a single apt run"""
+        log_path = os.path.join(self.log_dir, "apt.log")
+        env = os.environ.copy()
+        env['DEBIAN_FRONTEND'] = 'noninteractive'
+        # Wait for unattended-upgrades instead of failing on the dpkg lock
+        lock_wait = ['-o', 'DPkg::Lock::Timeout=600']
+        delay = 10
+        
+        for attempt in range(1, attempts + 1):
+            if self.run_logged("apt", ['sudo', 'apt-get', 'update'] + lock_wait, log_path, env) == 0:
+                packages = self.resolve_system_packages(wanted)
+                self.print_info(f"Installing {len(packages)} system packages in one apt run...")
+                command = ['sudo', 'apt-get', 'install', '-y'] + lock_wait + packages
+                if self.run_logged("apt", command, log_path, env) == 0:
+                    self.print_success("System packages installed for all bots")
+                    return True
+            
+            self.print_error(f"apt failed on attempt {attempt} - see {log_path}")
+            if attempt < attempts:
+                self.print_warning(f"🔄 Retrying in {delay} seconds...")
+                time.sleep(delay)
+                delay = min(delay * 2, 300)
+        return False
+
+    def provision_bot(self, folder_name, script, max_attempts=9999):
+        """Run one bot's venv.sh without its apt phase, retrying with backoff until it succeeds"""
+        display_name = folder_name.replace('-', ' ')
+        log_path = os.path.join(self.log_dir, f"{folder_name}.log")
+        
+        env = os.environ.copy()
+        env['PIP_DEFAULT_TIMEOUT'] = '300'
+        env['PIP_RETRIES'] = '10'
+        env['DEBIAN_FRONTEND'] = 'noninteractive'
+        env['SKIP_APT'] = '1'
+        env.update(self.pip_env)
+        
+        delay = 10
+        for attempt in range(1, max_attempts + 1):
+            started = time.time()
+            self.print_tagged(display_name, f"🔄 Attempt {attempt} - log: {log_path}")
+            try:
+                returncode = self.run_logged(display_name, ['bash', script], log_path, env)
+            except Exception as e:
+                self.print_tagged(display_name, f"💥 Error: {e}", self.RED)
+                returncode = None
+            
+            if returncode == 0:
+                self.print_tagged(display_name, f"🎉 SUCCESS on attempt {attempt} ({int(time.time() - started)}s)", self.GREEN)
+                return True
+            
+            self.print_tagged(display_name, f"❌ Failed on attempt {attempt} (exit code: {returncode}) - "
+                                            f"retrying in {delay} seconds", self.RED)
+            time.sleep(delay)
+            delay = min(delay * 2, 300)
+        
+        self.print_tagged(display_name, f"🚨 Giving up after {max_attempts} attempts", self.RED)
+        return False
+
+    def run_parallel_setup(self, folders):
+        """Install every bot's system packages at once, then build the venvs side by side"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.print_header(f"⚡ PARALLEL SETUP: {len(folders)} bots, {self.jobs} at a time")
+        self.print_info(f"Per-bot logs: {self.log_dir}")
+        
+        scripts = {}
+        wanted = []
+        sequential = []
+        for folder in folders:
+            display_name = folder.replace('-', ' ')
+            script = self.download_venv_script(folder)
+            if script is None:
+                self.print_error(f"Failed to download venv.sh for {display_name}")
+                continue
+            scripts[folder] = script
+            
+            packages = self.list_packages(script)
+            if packages is None:
+                self.print_warning(f"{display_name} does not list its system packages - installing it on its own")
+                sequential.append(folder)
+            else:
+                wanted.extend(packages)
+        
+        if wanted and not self.install_system_packages(wanted):
+            self.print_error("Shared apt phase failed - falling back to one bot at a time")
+            sequential = list(scripts)
+        
+        # Build dependencies are in place now, so the wheels can be compiled once for everyone
+        self.prepare_wheelhouse(list(scripts))
+        
+        succeeded = []
+        for folder in sequential:
+            if self.run_venv_script_with_retry(folder):
+                succeeded.append(folder)
+        
+        remaining = [folder for folder in scripts if folder not in sequential]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = {folder: pool.submit(self.provision_bot, folder, scripts[folder]) for folder in remaining}
+            for folder, result in results.items():
+                if result.result():
+                    succeeded.append(folder)
+        
+        for folder, script in scripts.items():
+            self.venv_scripts.pop(folder, None)
+            if os.path.exists(script):
+                os.remove(script)
+        return succeeded
+
+    def prepare_wheelhouse(self, folders):
+        """Build every bot's Python packages once into the shared wheelhouse and point pip at it"""
+        wanted = []
+        for folder in folders:
+            script = self.download_venv_script(folder)
+            packages = self.list_packages(script, '--list-python-packages') if script else None
+            if packages:
+                wanted.extend(packages)
+        if not wanted:
+            return
+        
+        os.makedirs(self.wheelhouse, exist_ok=True)
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, "wheelhouse.log")
+        packages = ['pip', 'setuptools', 'wheel'] + list(dict.fromkeys(wanted))
+        command = [sys.executable, '-m', 'pip', 'wheel', '--wheel-dir', self.wheelhouse,
+                   '--find-links', self.wheelhouse] + packages
+        
+        env = os.environ.copy()
+        env['PIP_DEFAULT_TIMEOUT'] = '300'
+        env['PIP_RETRIES'] = '10'
+        
+        self.print_info(f"Building {len(packages)} Python packages into {self.wheelhouse}...")
+        self.pip_env = {'PIP_FIND_LINKS': self.wheelhouse}
+        complete = self.run_logged("wheelhouse", command, log_path, env) == 0
+        if not complete:
+            # Offline or the index is down - the cached wheels may still cover everything
+            self.print_warning("Could not refresh the wheelhouse, checking the cached wheels...")
+            complete = self.run_logged("wheelhouse", command + ['--no-index'], log_path, env) == 0
+        
+        if complete:
+            self.pip_env['PIP_NO_INDEX'] = '1'
+            self.print_success("Wheelhouse complete - bot venvs install without the network")
+        else:
+            self.print_warning("Wheelhouse incomplete - missing packages are downloaded by each bot")
+
+    @staticmethod
+    def file_digest(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def dedupe_site_packages(self):
+        """Hard-link identical files across the bot venvs so each package is stored on disk once"""
+        # (size, mode) -> {(device, inode): [paths]} - files already sharing an inode are hashed once
+        candidates = {}
+        pattern = os.path.join(self.bots_dir, "*", "venv", "lib", "python*", "site-packages")
+        for site_packages in glob.glob(pattern):
+            for root, dirs, files in os.walk(site_packages):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.lstat(path)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                        inodes = candidates.setdefault((st.st_size, st.st_mode), {})
+                        inodes.setdefault((st.st_dev, st.st_ino), []).append(path)
+        
+        linked = 0
+        saved = 0
+        for (size, mode), inodes in candidates.items():
+            if len(inodes) < 2:
+                continue
+            by_digest = {}
+            for inode, paths in inodes.items():
+                try:
+                    by_digest.setdefault(self.file_digest(paths[0]), []).append((inode, paths))
+                except OSError:
+                    pass
+            
+            for copies in by_digest.values():
+                (device, _), keep_paths = copies[0]
+                for (other_device, _), paths in copies[1:]:
+                    if other_device != device:
+                        continue  # hard links cannot cross filesystems
+                    relinked = 0
+                    for path in paths:
+                        temp_path = path + ".dedupe"
+                        try:
+                            os.link(keep_paths[0], temp_path)
+                            os.replace(temp_path, path)  # atomic - the file never goes missing
+                            relinked += 1
+                        except OSError:
+                            if os.path.exists(temp_path):
+                                os.remove(temp_path)
+                    linked += relinked
+                    if relinked == len(paths):
+                        saved += size  # the last name of this copy is gone, so are its blocks
+        
+        if linked:
+            self.print_success(f"Hard-linked {linked} identical files across bot venvs, "
+                               f"saving {saved / (1024 * 1024):.1f} MB")
+
     def fix_ssl_issues(self):
         """Try to fix common SSL issues on Raspberry Pi"""
         self.print_info("Attempting to fix SSL issues...")
@@ -306,18 +752,39 @@ class AllInOneVenvSetup:
         
         self.print_info(f"Found {len(folders_with_venv)} bots with venv.sh")
         
-        success_count = 0
-        
-        for i, folder in enumerate(folders_with_venv, 1):
+        # Bots whose venv still matches their dependency fingerprint need no setup run
+        folders_to_setup = []
+        for folder in folders_with_venv:
             display_name = folder.replace('-', ' ')
-            self.print_header(f"Bot {i}/{len(folders_with_venv)}: {display_name}")
-            
-            if self.run_venv_script_with_retry(folder):
-                success_count += 1
-            
-            if i < len(folders_with_venv):
-                self.print_info("Waiting 15 seconds before next bot...")
-                time.sleep(15)
+            if self.is_bot_up_to_date(folder):
+                self.print_success(f"  ✅ {display_name} is up to date - skipping")
+            else:
+                folders_to_setup.append(folder)
+        
+        success_count = len(folders_with_venv) - len(folders_to_setup)
+        
+        if self.parallel and folders_to_setup:
+            success_count += len(self.run_parallel_setup(folders_to_setup))
+        elif folders_to_setup:
+            self.prepare_wheelhouse(folders_to_setup)
+            for i, folder in enumerate(folders_to_setup, 1):
+                display_name = folder.replace('-', ' ')
+                self.print_header(f"Bot {i}/{len(folders_to_setup)}: {display_name}")
+                
+                if self.run_venv_script_with_retry(folder):
+                    success_count += 1
+                
+                if i < len(folders_to_setup):
+                    self.print_info("Waiting 15 seconds before next bot...")
+                    time.sleep(15)
+        
+        if folders_to_setup and success_count > 0:
+            self.print_info("Sharing identical package files between the bot venvs...")
+            self.dedupe_site_packages()
+        
+        for script in self.venv_scripts.values():
+            if os.path.exists(script):
+                os.remove(script)
         
         self.print_header("🎉 ALL VENV.SH SCRIPTS EXECUTION COMPLETED!")
         self.print_info(f"Total bots with venv.sh: {len(folders_with_venv)}")
@@ -338,5 +805,13 @@ class AllInOneVenvSetup:
             self.print_error("All bots failed to install!")
 
 if __name__ == "__main__":
-    setup = AllInOneVenvSetup()
+    parser = argparse.ArgumentParser(description="Run every bot's venv.sh from GitHub")
+    parser.add_argument('--parallel', action='store_true',
+                        default=os.getenv('BOTS_INSTALL_PARALLEL') == '1',
+                        help="install all system packages in one apt run, then build the venvs concurrently")
+    parser.add_argument('--jobs', type=int, default=int(os.getenv('BOTS_INSTALL_JOBS', '3')),
+                        help="venv builds to run at once in parallel mode (default: 3)")
+    args = parser.parse_args()
+    
+    setup = AllInOneVenvSetup(parallel=args.parallel, jobs=args.jobs)
     setup.main()
@@ -2,6 +2,8 @@
 # CONFIGURATION SECTION
 # ================================
 import os
+import json
+import socket
 import subprocess
 import time
 import sys
@@ -52,7 +54,8 @@ PATHS = {
     "screenshot_dir": os.path.join(FACEBOOK_BIRTHDAY_DIR, "Temp_emoji"),
     
     # Browser
-    "chrome_profile": os.path.join(USER_HOME, ".config", "chromium"),
+    # The scheduler passes the Chromium profile this bot runs with, so several bots can run at once
+    "chrome_profile": os.environ.get("BOT_CHROME_PROFILE") or os.path.join(USER_HOME, ".config", "chromium"),
     "chromedriver": "/usr/bin/chromedriver"  # System path
 }
 
@@ -117,8 +120,7 @@ def fetch_xpath_from_firebase(xpath_name, platform="Facebook"):
     while True:
         try:
             print(f"🔍 Fetching {platform.split('/')[0]} {xpath_name} from database...")
-            ref = db.reference(f"{platform}/Xpath")
-            xpaths = ref.get()
+            xpaths = read_database_node(f"{platform}/Xpath")
             
             if xpaths and xpath_name in xpaths:
                 print(f"✅ {platform.split('/')[0]} {xpath_name} fetched from database")
@@ -135,8 +137,7 @@ def fetch_color_from_firebase(color_name, platform="Facebook"):
     while True:
         try:
             print(f"🔍 Fetching {platform.split('/')[0]} {color_name} from database...")
-            ref = db.reference(f"{platform}/Color")
-            colors = ref.get()
+            colors = read_database_node(f"{platform}/Color")
             
             if colors and color_name in colors:
                 print(f"✅ {platform.split('/')[0]} {color_name} fetched from database")
@@ -342,25 +343,97 @@ def launch_chrome(url="https://www.facebook.com/", start_maximized=True):
         print(f"❌ Browser error: {str(e)}")
         return False
 
+# Connectivity state published by the scheduler's monitor - bots read it instead of forking ping
+CONNECTIVITY_STATE_FILE = os.path.join(BASE_DIR, "scheduler", "connectivity.json")
+CONNECTIVITY_MAX_AGE = 20  # seconds a shared "online" result is trusted
+_last_probe = {"online": False, "checked_at": 0.0}
+
+def is_internet_available():
+    """Return the shared connectivity state, verifying locally with a TCP probe when it is stale or offline"""
+    now = time.time()
+    try:
+        with open(CONNECTIVITY_STATE_FILE) as f:
+            state = json.load(f)
+        if state.get("online") and now - state.get("checked_at", 0) <= CONNECTIVITY_MAX_AGE:
+            return True
+    except (OSError, ValueError):
+        pass
+    
+    # Re-probe at most once a second so tight retry loops stay cheap
+    if now - _last_probe["checked_at"] >= 1:
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+            _last_probe["online"] = True
+        except OSError:
+            _last_probe["online"] = False
+        _last_probe["checked_at"] = now
+    return _last_probe["online"]
+
+# XPath service run by the scheduler - answers from memory, Firebase is only read when it is down
+XPATH_SERVICE_SOCKET = os.path.join(BASE_DIR, "scheduler", "xpath.sock")
+
+def read_xpath_service(path):
+    """Get a database node from the scheduler's XPath service, or None if the service is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(XPATH_SERVICE_SOCKET)
+            client.sendall(f"{path}\n".encode("utf-8"))
+            reply = json.loads(client.makefile("r", encoding="utf-8").readline())
+        if reply.get("found"):
+            return reply["value"]
+    except (OSError, ValueError):
+        pass
+    return None
+
+def read_database_node(path):
+    """Read a database node through the XPath service, falling back to Firebase"""
+    value = read_xpath_service(path)
+    if value is not None:
+        return value
+    return db.reference(path).get()
+
+# Step timings are pushed to the scheduler's /metrics endpoint
+METRICS_SOCKET = os.path.join(BASE_DIR, "scheduler", "metrics.sock")
+METRICS_BOT_NAME = "facebook birthday wisher"
+
+def report_step_time(step, seconds):
+    """Send a step timing to the scheduler - skipped silently when the scheduler is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as client:
+            message = {"bot": METRICS_BOT_NAME, "step": step, "seconds": round(seconds, 3)}
+            client.sendto(json.dumps(message).encode("utf-8"), METRICS_SOCKET)
+    except OSError:
+        pass
+
+def timed_step(step, func, *args):
+    """Run one step and report how long it took"""
+    started = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        report_step_time(step, time.monotonic() - started)
+
 def check_internet():
     """Check internet connection"""
     retry_count = 1
     while True:
-        try:
-            subprocess.run(['ping', '-c', '1', '-W', '1', '8.8.8.8'], 
-                          stdout=subprocess.PIPE, 
-                          stderr=subprocess.PIPE, 
-                          timeout=5,
-                          check=True)
+        if is_internet_available():
             sys.stdout.write('\r' + ' ' * 50 + '\r')
             print("🌐 Internet connection established")
             return True
-            
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
-            sys.stdout.write(f'\r🔄 Waiting for internet... ({retry_count})')
-            sys.stdout.flush()
-            retry_count += 1
-            time.sleep(1)
+        
+        sys.stdout.write(f'\r🔄 Waiting for internet... ({retry_count})')
+        sys.stdout.flush()
+        retry_count += 1
+        time.sleep(1)
+
+def get_browser_pattern(browser):
+    """pgrep/pkill pattern for this bot's browser processes - all of them unless the scheduler assigned a profile"""
+    if os.environ.get("BOT_CHROME_PROFILE"):
+        # Other bots run their own profiles alongside this one - leave their browsers open
+        return f"{browser}.*--user-data-dir={PATHS['chrome_profile']}( |$)"
+    return browser
 
 def close_chrome():
     """Clean up browser processes"""
@@ -377,13 +450,13 @@ def close_chrome():
     for browser in browsers:
         print(f"🔍 Checking for {browser} processes...")
         try:
-            result = subprocess.run(['pgrep', '-f', browser], 
+            result = subprocess.run(['pgrep', '-f', get_browser_pattern(browser)], 
                                   stdout=subprocess.PIPE, 
                                   stderr=subprocess.PIPE,
                                   timeout=5)
             if result.stdout:
                 print(f"🛑 Closing {browser}...")
-                subprocess.run(['pkill', '-f', browser], 
+                subprocess.run(['pkill', '-f', get_browser_pattern(browser)], 
                               check=True,
                               timeout=5)
                 print(f"✅ {browser.capitalize()} closed")
@@ -764,15 +837,10 @@ def count_birthday_people():
             print(f"✅ Birthday person {i} found")
             
         except NoSuchElementException:
-            try:
-                subprocess.run(['ping', '-c', '1', '-W', '1', '8.8.8.8'], 
-                             stdout=subprocess.PIPE, 
-                             stderr=subprocess.PIPE, 
-                             timeout=5,
-                             check=True)
+            if is_internet_available():
                 print(f"Today's birthday people: {count}")
                 return count
-            except:
+            else:
                 print("Internet not available while counting - restarting from Step14")
                 return -1
                 
@@ -780,15 +848,10 @@ def count_birthday_people():
             print(f"❌ Error during counting: {str(e)}")
             return -1
     
-    try:
-        subprocess.run(['ping', '-c', '1', '-W', '1', '8.8.8.8'], 
-                      stdout=subprocess.PIPE, 
-                      stderr=subprocess.PIPE, 
-                      timeout=5,
-                      check=True)
+    if is_internet_available():
         print(f"Reached maximum check limit ({max_attempts}), found {count} birthday people")
         return count
-    except:
+    else:
         print("Internet not available at max count - restarting from Step14")
         return -1
 
@@ -879,19 +942,14 @@ def fetch_birthday_people_details(count):
                 time.sleep(3)
                 return False
     
-    try:
-        subprocess.run(['ping', '-c', '1', '-W', '1', '8.8.8.8'], 
-                      stdout=subprocess.PIPE, 
-                      stderr=subprocess.PIPE, 
-                      timeout=5,
-                      check=True)
+    if is_internet_available():
         print("\n✅ Internet connection verified after fetching all details")
         
         if create_google_sheets_temp_file():
             return people_details
         return False
         
-    except:
+    else:
         print("\n❌ Internet connection lost after fetching details")
         print("🔄 Refreshing page and restarting from Step14 due to internet issue...")
         driver.refresh()
@@ -1699,12 +1757,12 @@ def main_flow():
     flow_vars = {'attempt_count': 0, 'reset_attempt': False}
     
     # Initialize Firebase if not already done
-    if not firebase_initialized and not initialize_firebase():
+    if not firebase_initialized and not timed_step("initialize firebase", initialize_firebase):
         print("❌ Failed to initialize Firebase. Exiting...")
         sys.exit(0)
 
     # Connect to Google Sheets once at start
-    client = connect_to_google_sheets()
+    client = timed_step("connect google sheets", connect_to_google_sheets)
 
     while True:
         if flow_vars['reset_attempt']:
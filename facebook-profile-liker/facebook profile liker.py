@@ -1,5 +1,7 @@
 # facebook profile liker Python Script
 import os
+import json
+import socket
 import subprocess
 import time
 import sys
@@ -47,7 +49,8 @@ PATHS = {
     "report_number_file": os.path.join(CURRENT_BOT_DIR, "venv", "report number"),
     
     # Browser
-    "chrome_profile": os.path.join(USER_HOME, ".config", "chromium"),
+    # The scheduler passes the Chromium profile this bot runs with, so several bots can run at once
+    "chrome_profile": os.environ.get("BOT_CHROME_PROFILE") or os.path.join(USER_HOME, ".config", "chromium"),
     "chromedriver": "/usr/bin/chromedriver"  # System path
 }
 
@@ -113,8 +116,7 @@ def fetch_xpath_from_firebase(xpath_name, platform="Facebook"):
     while True:
         try:
             print(f"🔍 Fetching {xpath_name} from database...")
-            ref = db.reference(f"{platform}/Xpath")
-            xpaths = ref.get()
+            xpaths = read_database_node(f"{platform}/Xpath")
             
             if xpaths and xpath_name in xpaths:
                 print(f"✅ {xpath_name} fetched from database")
@@ -131,8 +133,7 @@ def fetch_url_from_firebase(url_name, platform="Facebook"):
     while True:
         try:
             print(f"🔍 Fetching {url_name} from database...")
-            ref = db.reference(f"{platform}/URL")
-            urls = ref.get()
+            urls = read_database_node(f"{platform}/URL")
             
             if urls and url_name in urls:
                 print(f"✅ {url_name} fetched from database")
@@ -148,30 +149,102 @@ def fetch_url_from_firebase(url_name, platform="Facebook"):
 # STEP 1: INTERNET CHECK
 # ================================
 
+# Connectivity state published by the scheduler's monitor - bots read it instead of forking ping
+CONNECTIVITY_STATE_FILE = os.path.join(BASE_DIR, "scheduler", "connectivity.json")
+CONNECTIVITY_MAX_AGE = 20  # seconds a shared "online" result is trusted
+_last_probe = {"online": False, "checked_at": 0.0}
+
+def is_internet_available():
+    """Return the shared connectivity state, verifying locally with a TCP probe when it is stale or offline"""
+    now = time.time()
+    try:
+        with open(CONNECTIVITY_STATE_FILE) as f:
+            state = json.load(f)
+        if state.get("online") and now - state.get("checked_at", 0) <= CONNECTIVITY_MAX_AGE:
+            return True
+    except (OSError, ValueError):
+        pass
+    
+    # Re-probe at most once a second so tight retry loops stay cheap
+    if now - _last_probe["checked_at"] >= 1:
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+            _last_probe["online"] = True
+        except OSError:
+            _last_probe["online"] = False
+        _last_probe["checked_at"] = now
+    return _last_probe["online"]
+
+# XPath service run by the scheduler - answers from memory, Firebase is only read when it is down
+XPATH_SERVICE_SOCKET = os.path.join(BASE_DIR, "scheduler", "xpath.sock")
+
+def read_xpath_service(path):
+    """Get a database node from the scheduler's XPath service, or None if the service is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(XPATH_SERVICE_SOCKET)
+            client.sendall(f"{path}\n".encode("utf-8"))
+            reply = json.loads(client.makefile("r", encoding="utf-8").readline())
+        if reply.get("found"):
+            return reply["value"]
+    except (OSError, ValueError):
+        pass
+    return None
+
+def read_database_node(path):
+    """Read a database node through the XPath service, falling back to Firebase"""
+    value = read_xpath_service(path)
+    if value is not None:
+        return value
+    return db.reference(path).get()
+
+# Step timings are pushed to the scheduler's /metrics endpoint
+METRICS_SOCKET = os.path.join(BASE_DIR, "scheduler", "metrics.sock")
+METRICS_BOT_NAME = "facebook profile liker"
+
+def report_step_time(step, seconds):
+    """Send a step timing to the scheduler - skipped silently when the scheduler is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as client:
+            message = {"bot": METRICS_BOT_NAME, "step": step, "seconds": round(seconds, 3)}
+            client.sendto(json.dumps(message).encode("utf-8"), METRICS_SOCKET)
+    except OSError:
+        pass
+
+def timed_step(step, func, *args):
+    """Run one step and report how long it took"""
+    started = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        report_step_time(step, time.monotonic() - started)
+
 def check_internet():
-    """Check internet connection with ping method"""
+    """Check internet connection using the shared connectivity state"""
     retry_count = 0
     while True:
-        try:
-            subprocess.run(['ping', '-c', '1', '-W', '1', '8.8.8.8'], 
-                          stdout=subprocess.PIPE, 
-                          stderr=subprocess.PIPE, 
-                          timeout=5,
-                          check=True)
+        if is_internet_available():
             sys.stdout.write('\r' + ' ' * 50 + '\r')
             print("🌐 Internet is present good to go")
             return True
-            
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
-            sys.stdout.write(f'\r🔄 Internet is not available waiting for connection {retry_count}sec...')
-            sys.stdout.flush()
-            retry_count += 1
-            time.sleep(1)
+        
+        sys.stdout.write(f'\r🔄 Internet is not available waiting for connection {retry_count}sec...')
+        sys.stdout.flush()
+        retry_count += 1
+        time.sleep(1)
 
 # ================================
 # STEP 2: CHROME BROWSER CHECK
 # ================================
 
+def get_browser_pattern(browser):
+    """pgrep/pkill pattern for this bot's browser processes - all of them unless the scheduler assigned a profile"""
+    if os.environ.get("BOT_CHROME_PROFILE"):
+        # Other bots run their own profiles alongside this one - leave their browsers open
+        return f"{browser}.*--user-data-dir={PATHS['chrome_profile']}( |$)"
+    return browser
+
 def close_chrome():
     """Close Chrome browser if already open"""
     global driver
@@ -190,13 +263,13 @@ def close_chrome():
     for browser in browsers:
         print(f"🔍 Checking for {browser} processes...")
         try:
-            result = subprocess.run(['pgrep', '-f', browser], 
+            result = subprocess.run(['pgrep', '-f', get_browser_pattern(browser)], 
                                   stdout=subprocess.PIPE, 
                                   stderr=subprocess.PIPE,
                                   timeout=5)
             if result.stdout:
                 print(f"🛑 Closing {browser} processes...")
-                subprocess.run(['pkill', '-f', browser], 
+                subprocess.run(['pkill', '-f', get_browser_pattern(browser)], 
                               check=True,
                               timeout=5)
                 print(f"✅ {browser.capitalize()} processes closed")
@@ -212,7 +285,7 @@ def check_and_close_chrome():
     
     for browser in browsers:
         try:
-            result = subprocess.run(['pgrep', '-f', browser], 
+            result = subprocess.run(['pgrep', '-f', get_browser_pattern(browser)], 
                                   stdout=subprocess.PIPE, 
                                   stderr=subprocess.PIPE,
                                   timeout=5)
@@ -3196,12 +3269,13 @@ def main():
         sys.exit(1)
     
     # Initialize Firebase
-    if not initialize_firebase():
+    if not timed_step("initialize firebase", initialize_firebase):
         print("❌ Cannot continue without Firebase connection")
         return
     
     # Fetch ONLY NEEDED XPaths to avoid unnecessary Firebase calls
     print("🔍 Fetching required XPaths from Firebase...")
+    xpaths_started = time.monotonic()
     try:
         XPATHS = {
             'xpath012': fetch_xpath_from_firebase("Xpath012"),
@@ -3214,6 +3288,7 @@ def main():
             'xpath021': fetch_xpath_from_firebase("Xpath021"),
             'xpath022': fetch_xpath_from_firebase("Xpath022")
         }
+        report_step_time("fetch xpaths", time.monotonic() - xpaths_started)
         print("✅ Required XPaths fetched successfully")
     except Exception as e:
         print(f"❌ Failed to fetch XPaths: {str(e)}")
@@ -16,38 +16,88 @@ OS=$(uname -s)
 ARCH=$(uname -m)
 echo "[INFO] Detected OS: $OS | Architecture: $ARCH"
 
-# === Step 1: Folder Setup ===
-mkdir -p "$BOTS_DIR"
-if [ -d "$BOT_PATH" ]; then
-    echo "[INFO] Removing existing bot folder..."
-    rm -rf "$BOT_PATH"
-fi
-mkdir -p "$BOT_PATH"
-echo "[OK] Created bot folder at: $BOT_PATH"
-
-# === Step 2: Dependencies ===
-echo "[INFO] Installing system dependencies..."
-sudo apt update -y
-sudo apt install -y python3 python3-venv python3-pip git curl unzip build-essential x11-utils \
+# System packages from apt - "a|b" means the first of a, b that apt knows about.
+# The all-in-one installer reads this list from every bot, installs them all in a
+# single apt run and then runs this script with SKIP_APT=1.
+SYSTEM_PACKAGES="python3 python3-venv python3-pip git curl unzip build-essential x11-utils \
     libnss3 libxkbcommon0 libdrm2 libgbm1 libxshmfence1 libjpeg-dev zlib1g-dev \
     libfreetype6-dev liblcms2-dev libopenjp2-7-dev libtiff-dev libwebp-dev tk-dev \
-    libharfbuzz-dev libfribidi-dev libxcb1-dev || true
+    libharfbuzz-dev libfribidi-dev libxcb1-dev libasound2t64 libatk-bridge2.0-0t64 \
+    chromium|chromium-browser chromium-driver|chromium-chromedriver"
+
+# Python packages - the all-in-one installer pre-builds these into a shared wheelhouse
+# and points pip at it through PIP_FIND_LINKS
+PYTHON_PACKAGES="firebase_admin gspread selenium google-auth google-auth-oauthlib \
+    google-cloud-storage google-cloud-firestore psutil pyautogui python3-xlib requests Pillow oauth2client python-dateutil"
+
+if [ "$1" = "--list-system-packages" ]; then
+    echo $SYSTEM_PACKAGES
+    exit 0
+fi
+if [ "$1" = "--list-python-packages" ]; then
+    echo $PYTHON_PACKAGES
+    exit 0
+fi
+
+# Dependency fingerprint, kept in the venv so a re-run only redoes what changed: apt when
+# the system packages change, pip when the Python packages change and a venv rebuild only
+# for a new interpreter. FORCE_REBUILD=1 redoes everything.
+FINGERPRINT_FILE="$VENV_PATH/.dependency-fingerprint"
+
+dependency_fingerprint() {
+    echo "interpreter=$(python3 -c 'import sys; print(sys.version.split()[0])' 2>/dev/null || echo none) $ARCH"
+    echo "system=$(echo $SYSTEM_PACKAGES | sha256sum | cut -d' ' -f1)"
+    echo "python=$(echo $PYTHON_PACKAGES | sha256sum | cut -d' ' -f1)"
+}
 
-# Try installing "t64" versions safely
-for pkg in libasound2t64 libatk-bridge2.0-0t64; do
-    if apt-cache show "$pkg" >/dev/null 2>&1; then
-        sudo apt install -y "$pkg"
+fingerprint_matches() {
+    [ "$FORCE_REBUILD" != "1" ] && [ -f "$FINGERPRINT_FILE" ] &&
+        [ "$(grep "^$1=" "$FINGERPRINT_FILE")" = "$(dependency_fingerprint | grep "^$1=")" ]
+}
+
+# Exit 0 when a setup run would change nothing
+if [ "$1" = "--check-fingerprint" ]; then
+    if [ -x "$VENV_PATH/bin/python" ] && [ -f "$VENV_PATH/resources" ] && fingerprint_matches interpreter &&
+        fingerprint_matches system && fingerprint_matches python; then
+        exit 0
     fi
-done
+    exit 1
+fi
 
-# === Step 3: Chromium & Chromedriver ===
-echo "[INFO] Installing Chromium and Chromedriver..."
-if [[ "$ARCH" == "armv7l" ]]; then
-    echo "[INFO] 32-bit Raspberry Pi detected."
-    sudo apt install -y chromium chromium-driver || sudo apt install -y chromium-browser chromium-chromedriver
+# === Step 1: Folder Setup ===
+# An existing folder is kept - it holds the access keys, report number and local data
+mkdir -p "$BOT_PATH"
+echo "[OK] Bot folder at: $BOT_PATH"
+
+# === Step 2: Dependencies ===
+if [ "$SKIP_APT" = "1" ]; then
+    echo "[INFO] System packages already installed by the all-in-one installer"
+elif fingerprint_matches system; then
+    echo "[OK] System packages unchanged since the last setup"
 else
-    echo "[INFO] 64-bit Raspberry Pi detected."
-    sudo apt install -y chromium chromium-driver
+    echo "[INFO] Installing system dependencies..."
+    sudo apt update -y
+    sudo apt install -y python3 python3-venv python3-pip git curl unzip build-essential x11-utils \
+        libnss3 libxkbcommon0 libdrm2 libgbm1 libxshmfence1 libjpeg-dev zlib1g-dev \
+        libfreetype6-dev liblcms2-dev libopenjp2-7-dev libtiff-dev libwebp-dev tk-dev \
+        libharfbuzz-dev libfribidi-dev libxcb1-dev || true
+
+    # Try installing "t64" versions safely
+    for pkg in libasound2t64 libatk-bridge2.0-0t64; do
+        if apt-cache show "$pkg" >/dev/null 2>&1; then
+            sudo apt install -y "$pkg"
+        fi
+    done
+
+    # === Step 3: Chromium & Chromedriver ===
+    echo "[INFO] Installing Chromium and Chromedriver..."
+    if [[ "$ARCH" == "armv7l" ]]; then
+        echo "[INFO] 32-bit Raspberry Pi detected."
+        sudo apt install -y chromium chromium-driver || sudo apt install -y chromium-browser chromium-chromedriver
+    else
+        echo "[INFO] 64-bit Raspberry Pi detected."
+        sudo apt install -y chromium chromium-driver
+    fi
 fi
 
 CHROME_BIN=$(command -v chromium-browser || command -v chromium)
@@ -63,13 +113,43 @@ echo "[OK] Chromium: $($CHROME_BIN --version)"
 echo "[OK] Chromedriver: $($CHROMEDRIVER_BIN --version)"
 
 # === Step 4: Python Virtual Environment ===
-echo "[INFO] Creating Python virtual environment..."
-python3 -m venv "$VENV_PATH"
-source "$VENV_PATH/bin/activate"
+if [ -x "$VENV_PATH/bin/python" ] && fingerprint_matches interpreter; then
+    source "$VENV_PATH/bin/activate"
+    if fingerprint_matches python; then
+        echo "[OK] Python packages unchanged - keeping the virtual environment"
+    else
+        echo "[INFO] Python packages changed - updating the virtual environment in place..."
+        pip install --no-cache-dir $PYTHON_PACKAGES
+    fi
+else
+    echo "[INFO] Creating Python virtual environment..."
+    # Access keys and the report number live in venv/ - move them aside during the rebuild.
+    # The keep folder sits in the bot folder so a failed rebuild cannot lose them.
+    KEEP_DIR="$BOT_PATH/.venv-keep"
+    mkdir -p "$KEEP_DIR"
+    if [ -d "$VENV_PATH" ]; then
+        echo "[INFO] Removing old virtual environment..."
+        find "$VENV_PATH" -mindepth 1 -maxdepth 1 ! -name bin ! -name include ! -name lib ! -name lib64 \
+            ! -name share ! -name pyvenv.cfg ! -name .dependency-fingerprint -exec mv -t "$KEEP_DIR" {} +
+        rm -rf "$VENV_PATH"
+    fi
+    python3 -m venv "$VENV_PATH"
+    find "$KEEP_DIR" -mindepth 1 -maxdepth 1 -exec mv -t "$VENV_PATH" {} +
+    rmdir "$KEEP_DIR"
+    source "$VENV_PATH/bin/activate"
 
-pip install --upgrade pip setuptools wheel
-pip install --no-cache-dir firebase_admin gspread selenium google-auth google-auth-oauthlib \
-    google-cloud-storage google-cloud-firestore psutil pyautogui python3-xlib requests Pillow oauth2client python-dateutil
+    pip install --upgrade pip setuptools wheel
+    pip install --no-cache-dir $PYTHON_PACKAGES
+fi
+dependency_fingerprint > "$FINGERPRINT_FILE"
+
+# Resources the scheduler must not share with another running bot. Both Facebook bots use
+# one Facebook login, so they name the same Chromium profile and run one at a time. An
+# edited file is kept.
+if [ ! -f "$VENV_PATH/resources" ]; then
+    echo "chromium profile: facebook" > "$VENV_PATH/resources"
+fi
+echo "[OK] Scheduler resources: $(tr '\n' ' ' < "$VENV_PATH/resources")"
 
 # === Step 5: Summary ===
 echo "------------------------------------------------------------"
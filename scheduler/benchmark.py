@@ -0,0 +1,916 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for Google Sheets / Drive / GitHub / Firebase and scheduler benchmarks
+
+Run from the scheduler folder:  python3 benchmark.py
+"""
+
+import os
+import io
+import json
+import asyncio
+import selectors
+import socket
+import sys
+import time
+import tarfile
+import tempfile
+import importlib.util
+import subprocess
+import contextlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('USER', 'pi')
+
+import scheduler as scheduler_module
+from scheduler import BotScheduler, ZygoteProcess, ZYGOTE_SOURCE
+
+# Stand-ins for the bot modules when selenium, gspread etc. are not installed
+FALLBACK_PRELOAD_MODULES = [
+    'asyncio', 'email.mime.multipart', 'http.client', 'json', 'sqlite3',
+    'xml.dom.minidom', 'decimal', 'unittest', 'urllib.request', 'logging.handlers'
+]
+
+SCHEDULER_HEADERS = [
+    'bots name',
+    'sun_start at', 'sun_stop at', 'mon_start at', 'mon_stop at',
+    'tue_start at', 'tue_stop at', 'wed_start at', 'wed_stop at',
+    'thu_start at', 'thu_stop at', 'fri_start at ', 'fri_stop at',
+    'sat_start at', 'sat_stop at',
+    'switch', 'status', 'last_run', 'remark'
+]
+SWITCH_COLUMN = SCHEDULER_HEADERS.index('switch') + 1
+
+
+class CallCounter:
+    """Counts fake API calls by name"""
+    def __init__(self):
+        self.calls = {}
+
+    def add(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def total(self, prefix=''):
+        return sum(count for name, count in self.calls.items() if name.startswith(prefix))
+
+
+class FakeWorksheet:
+    """In-memory stand-in for a gspread worksheet"""
+    def __init__(self, spreadsheet, rows):
+        self.spreadsheet = spreadsheet
+        self.rows = [list(row) for row in rows]
+
+    @property
+    def row_count(self):
+        # New sheets have 1000 rows in the grid whether or not they hold data
+        return max(1000, len(self.rows))
+
+    def _parse_a1(self, cell):
+        letters = ''.join(ch for ch in cell if ch.isalpha())
+        digits = ''.join(ch for ch in cell if ch.isdigit())
+        col = 0
+        for ch in letters.upper():
+            col = col * 26 + (ord(ch) - ord('A') + 1)
+        return int(digits), col
+
+    def _values(self, range_name):
+        start, _, end = range_name.partition(':')
+        start_row = int(''.join(ch for ch in start if ch.isdigit()) or 1)
+        end_row = ''.join(ch for ch in (end or start) if ch.isdigit())
+        last_col = ''.join(ch for ch in (end or start) if ch.isalpha())
+        first_col = ''.join(ch for ch in start if ch.isalpha())
+        rows = self.rows[start_row - 1:int(end_row) if end_row else None]
+        if last_col:
+            first = self._parse_a1(f"{first_col}1")[1] if first_col else 1
+            rows = [row[first - 1:self._parse_a1(f"{last_col}1")[1]] for row in rows]
+        # Like the Sheets API, trailing blank rows are left out
+        rows = [list(row) for row in rows]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+    def get(self, range_name):
+        self.spreadsheet.counter.add('sheets.values.get')
+        return self._values(range_name)
+
+    def batch_get(self, ranges):
+        self.spreadsheet.counter.add('sheets.values.batchGet')
+        return [self._values(range_name) for range_name in ranges]
+
+    def _set(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        line = self.rows[row - 1]
+        while len(line) < col:
+            line.append('')
+        line[col - 1] = value
+
+    def update_cell(self, row, col, value):
+        self.spreadsheet.counter.add('sheets.values.update')
+        self._set(row, col, value)
+        self.spreadsheet.touch()
+
+    def batch_update(self, data):
+        self.spreadsheet.counter.add('sheets.values.batchUpdate')
+        for item in data:
+            row, col = self._parse_a1(item['range'])
+            self._set(row, col, item['values'][0][0])
+        self.spreadsheet.touch()
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for a gspread spreadsheet with a Drive revision"""
+    def __init__(self, name, rows, counter):
+        self.name = name
+        self.id = f"fake-{name.replace(' ', '-')}"
+        self.counter = counter
+        self.version = 1
+        self.sheet1 = FakeWorksheet(self, rows)
+
+    def touch(self):
+        self.version += 1
+
+    def modified_time(self):
+        return f"2024-01-01T00:00:{self.version:02d}.000Z"
+
+
+class FakeSheetsClient:
+    """In-memory stand-in for gspread.authorize()"""
+    def __init__(self, counter=None):
+        self.counter = counter or CallCounter()
+        self.spreadsheets = {}
+
+    def add_spreadsheet(self, name, rows):
+        self.spreadsheets[name] = FakeSpreadsheet(name, rows, self.counter)
+        return self.spreadsheets[name]
+
+    def open(self, name):
+        self.counter.add('sheets.open')
+        return self.spreadsheets[name]
+
+
+class FakeDriveRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeDriveFiles:
+    def __init__(self, drive):
+        self.drive = drive
+
+    def get(self, fileId, fields=None):
+        self.drive.counter.add('drive.files.get')
+        spreadsheet = self.drive.by_id[fileId]
+        return FakeDriveRequest({'modifiedTime': spreadsheet.modified_time(), 'version': str(spreadsheet.version)})
+
+
+class FakeDrive:
+    """In-memory stand-in for build('drive', 'v3', ...)"""
+    def __init__(self, sheets_client):
+        self.counter = sheets_client.counter
+        self.by_id = {sheet.id: sheet for sheet in sheets_client.spreadsheets.values()}
+
+    def files(self):
+        return FakeDriveFiles(self)
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.headers = headers or {}
+        self.content = json.dumps(self.data).encode()
+
+    def json(self):
+        return self.data
+
+
+class FakeGitHub:
+    """In-memory stand-in for the requests calls to the GitHub API and raw files"""
+    def __init__(self, counter, bot_names):
+        self.counter = counter
+        self.tree = {
+            'sha': 'fake-tree-sha',
+            'tree': [{'path': name.replace(' ', '-'), 'type': 'tree'} for name in bot_names]
+        }
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.counter.add('github.get')
+        if (headers or {}).get('If-None-Match') == '"fake-etag"':
+            return FakeResponse(304)
+        return FakeResponse(200, self.tree, {'ETag': '"fake-etag"'})
+
+
+class FakeRepositoryHost:
+    """In-memory GitHub serving one repository through the tree API, raw files, commits and tarballs"""
+    def __init__(self, counter, files, sha="0123456789abcdef"):
+        self.counter = counter
+        self.files = files  # repository path -> text
+        self.sha = sha
+        self.tarball = self.build_tarball()
+
+    def build_tarball(self):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+            for path, text in self.files.items():
+                data = text.encode('utf-8')
+                member = tarfile.TarInfo(f"owner-repo-{self.sha[:7]}/{path}")
+                member.size = len(data)
+                archive.addfile(member, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def tree_entries(self):
+        entries = {}
+        for path in self.files:
+            parts = path.split('/')
+            for depth in range(1, len(parts)):
+                entries['/'.join(parts[:depth])] = 'tree'
+            entries[path] = 'blob'
+        return [{'path': path, 'type': path_type} for path, path_type in entries.items()]
+
+    def get(self, url, headers=None, timeout=None, stream=False, **kwargs):
+        headers = headers or {}
+        if '/commits/' in url:
+            self.counter.add('github.commit')
+            if headers.get('If-None-Match') == '"commit-etag"':
+                return FakeResponse(304)
+            response = FakeResponse(200, headers={'ETag': '"commit-etag"'})
+            response.text = self.sha
+            return response
+        if '/tarball/' in url:
+            self.counter.add('github.tarball')
+            response = FakeResponse(200)
+            response.raw = io.BytesIO(self.tarball)
+            return response
+        if '/git/trees/' in url:
+            self.counter.add('github.tree')
+            return FakeResponse(200, {'sha': self.sha, 'tree': self.tree_entries()}, {'ETag': '"tree-etag"'})
+        
+        self.counter.add('github.raw')
+        path = url.split('/main/', 1)[1].replace('%20', ' ')
+        response = FakeResponse(200 if path in self.files else 404)
+        response.text = self.files.get(path, '')
+        return response
+
+
+class FakeFirebaseReference:
+    def __init__(self, database, path):
+        self.database = database
+        self.path = path
+
+    def get(self):
+        self.database.counter.add('firebase.get')
+        return self.database.data.get(self.path)
+
+
+class FakeFirebaseDB:
+    """In-memory stand-in for firebase_admin.db"""
+    def __init__(self, counter, data=None):
+        self.counter = counter
+        self.data = data or {}
+
+    def reference(self, path):
+        return FakeFirebaseReference(self, path)
+
+
+def make_scheduler_rows(bot_count):
+    """Build a scheduler sheet with bot_count rows, every bot on 09:00-10:00 each day"""
+    rows = [list(SCHEDULER_HEADERS)]
+    for i in range(1, bot_count + 1):
+        row = [f"bot {i}"]
+        for _ in range(7):
+            row.extend(['09:00', '10:00'])
+        row.extend(['on', 'idle', '', ''])
+        rows.append(row)
+    return rows
+
+
+def make_offline_scheduler(gc):
+    """Create a BotScheduler wired to the fake spreadsheets"""
+    scheduler = BotScheduler()
+    scheduler.available_sheets = [
+        {'name': sheet.name, 'id': sheet.id, 'number': number}
+        for number, sheet in enumerate(gc.spreadsheets.values(), 1)
+    ]
+    return scheduler
+
+
+def benchmark_change_detection(cycles=120, edit_every=20, bot_count=5):
+    """Compare full reads every cycle with Drive revision change detection"""
+    print("=" * 60)
+    print(f"Change detection: {cycles} sync cycles, sheet edited every {edit_every} cycles")
+    print("=" * 60)
+
+    results = {}
+    for mode in ('full read', 'change detection'):
+        gc = FakeSheetsClient()
+        sheet = gc.add_spreadsheet("scheduler", make_scheduler_rows(bot_count))
+        drive = FakeDrive(gc)
+        scheduler = make_offline_scheduler(gc)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for cycle in range(1, cycles + 1):
+                if cycle % edit_every == 0:
+                    sheet.sheet1.update_cell(2, SWITCH_COLUMN, 'off' if cycle % (2 * edit_every) else 'on')
+                if mode == 'full read':
+                    scheduler.get_scheduler_data(gc)
+                else:
+                    scheduler.get_scheduler_data_if_changed(gc, drive)
+        elapsed = time.perf_counter() - started
+
+        reads = gc.counter.total('sheets.values.get') + gc.counter.total('sheets.values.batchGet')
+        results[mode] = (reads, gc.counter.total('drive.files.get'), elapsed)
+
+    print()
+    for mode, (reads, revisions, elapsed) in results.items():
+        print(f"  {mode:<18} sheet reads: {reads:4d}  drive revision checks: {revisions:4d}  ({elapsed:.3f}s)")
+    return results
+
+
+def benchmark_sheet_size(sizes=(10, 100, 500), cycles=20):
+    """Sheet calls and time per sync as the scheduler sheet grows - cost should stay flat"""
+    print("=" * 60)
+    print(f"Sheet size: {cycles} syncs per size, one row edited per sync")
+    print("=" * 60)
+
+    results = {}
+    for bot_count in sizes:
+        gc = FakeSheetsClient()
+        sheet = gc.add_spreadsheet("scheduler", make_scheduler_rows(bot_count))
+        drive = FakeDrive(gc)
+        scheduler = make_offline_scheduler(gc)
+        with tempfile.TemporaryDirectory() as state_dir:
+            scheduler.state_db_path = Path(state_dir) / "scheduler state.db"
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for cycle in range(cycles):
+                    sheet.sheet1.update_cell(2 + cycle % bot_count, SWITCH_COLUMN, 'on' if cycle % 2 else 'off')
+                    data = scheduler.get_scheduler_data_if_changed(gc, drive)
+                    scheduler.write_scheduler_row(gc, f"bot {bot_count}", {'status': 'idle'})
+            elapsed = time.perf_counter() - started
+
+        results[bot_count] = (gc.counter.total('sheets.values.get') + gc.counter.total('sheets.values.batchGet'),
+                              len(data), elapsed)
+
+    print()
+    for bot_count, (reads, rows, elapsed) in results.items():
+        print(f"  {bot_count:4d} rows  sheet reads: {reads:3d}  rows seen: {rows:4d}  "
+              f"per sync: {1000 * elapsed / cycles:6.2f}ms")
+    return results
+
+
+def query_xpath_service(socket_path, path):
+    """What a bot does - one request per connection"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(f"{path}\n".encode("utf-8"))
+        return json.loads(client.makefile("r", encoding="utf-8").readline())
+
+
+def benchmark_xpath_service(lookups=500, xpath_count=60):
+    """Round-trip time of an XPath lookup through the scheduler's Unix socket service"""
+    print("=" * 60)
+    print(f"XPath service: {lookups} lookups, {xpath_count} XPaths per node")
+    print("=" * 60)
+
+    scheduler = BotScheduler()
+    with tempfile.TemporaryDirectory() as socket_dir:
+        scheduler.xpath_service_socket = Path(socket_dir) / "xpath.sock"
+        for path in scheduler.xpath_service_nodes:
+            scheduler.store_xpath_node(path, {f"Xpath{i:03d}": f"//div[@data-id='{i}']" for i in range(1, xpath_count + 1)})
+        scheduler.start_xpath_server()
+        try:
+            socket_path = str(scheduler.xpath_service_socket)
+            timings = {}
+            for label, path in (('whole node', 'Facebook/Xpath'), ('single XPath', 'Facebook/Xpath/Xpath007')):
+                started = time.perf_counter()
+                for _ in range(lookups):
+                    reply = query_xpath_service(socket_path, path)
+                timings[label] = (time.perf_counter() - started) / lookups
+                assert reply['found']
+        finally:
+            scheduler.stop_xpath_service()
+
+    print()
+    for label, seconds in timings.items():
+        print(f"  {label:<14} {seconds * 1e6:8.0f}µs per lookup")
+    return timings
+
+
+def benchmark_repository_fetch(bot_count=5, csv_per_bot=3):
+    """GitHub requests for one bot + sheets format sync: per-file downloads against one repository tarball"""
+    print("=" * 60)
+    print(f"Repository fetch: {bot_count} bots with {csv_per_bot} sheets format CSVs each")
+    print("=" * 60)
+
+    files = {"all-in-one-venv/all in one venv.py": "print('installer')\n"}
+    for i in range(1, bot_count + 1):
+        files[f"bot-{i}/venv.sh"] = "#!/bin/bash\n"
+        for j in range(1, csv_per_bot + 1):
+            files[f"bot-{i}/sheets format/sheet {j}.csv"] = "name,number,status\nexample,1,ok\n"
+
+    def sync(scheduler):
+        """The GitHub side of a sync - bot folders, their CSV lists and every CSV header"""
+        jobs = []
+        for folder in scheduler.get_github_bot_folders():
+            jobs.extend((folder, csv_file) for csv_file in scheduler.get_csv_files_from_github(folder))
+        return scheduler.download_csv_headers_concurrently(jobs)
+
+    results = {}
+    original_requests = scheduler_module.requests
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, use_snapshot in (('per-file', False), ('snapshot, first run', True), ('snapshot, unchanged', True)):
+            counter = CallCounter()
+            host = FakeRepositoryHost(counter, files)
+            scheduler = BotScheduler()
+            scheduler.http_session = host
+            scheduler.github_tree_cache_file = Path(cache_dir) / "github tree.json"
+            scheduler.repository_cache_path = Path(cache_dir) / "repository"
+            if not use_snapshot:
+                scheduler.get_repository_snapshot = lambda: None
+            
+            scheduler_module.requests = host
+            try:
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    headers = sync(scheduler)
+                elapsed = time.perf_counter() - started
+            finally:
+                scheduler_module.requests = original_requests
+            
+            assert len(headers) == bot_count * csv_per_bot and all(headers.values())
+            results[label] = (counter.total('github.'), dict(counter.calls), elapsed)
+
+    print()
+    for label, (requests_made, calls, elapsed) in results.items():
+        detail = ", ".join(f"{name.split('.')[1]} {count}" for name, count in sorted(calls.items()))
+        print(f"  {label:<20} {requests_made:3d} requests ({detail})  {1000 * elapsed:6.1f}ms")
+    return results
+
+
+def get_preload_modules():
+    """The scheduler's preload list, or stdlib stand-ins when the bot modules are not installed"""
+    modules = []
+    for name in BotScheduler().zygote_preload_modules:
+        try:
+            if importlib.util.find_spec(name):
+                modules.append(name)
+        except ImportError:
+            pass
+    return modules or FALLBACK_PRELOAD_MODULES
+
+
+def benchmark_warm_start(runs=5):
+    """Compare cold bot starts (fresh interpreter) with forks from a preloaded zygote"""
+    modules = get_preload_modules()
+    source = "".join(f"import {name}\n" for name in modules) + "print('bot started')\n"
+
+    print("=" * 60)
+    print(f"Warm start: {runs} bot runs importing {len(modules)} modules")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        cold_times = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", source], cwd=work_dir, stdout=subprocess.DEVNULL, check=True)
+            cold_times.append(time.perf_counter() - started)
+
+        socket_path = os.path.join(work_dir, "zygote.sock")
+        started = time.perf_counter()
+        zygote = subprocess.Popen(
+            [sys.executable, "-c", ZYGOTE_SOURCE, socket_path] + modules,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        if zygote.stdout.readline().strip() != "ready":
+            raise RuntimeError("zygote failed to start")
+        zygote_startup = time.perf_counter() - started
+
+        warm_times = []
+        try:
+            for _ in range(runs):
+                started = time.perf_counter()
+                process = ZygoteProcess(socket_path, {'cwd': work_dir, 'source': source})
+                output = list(process.stdout)
+                exit_code = process.wait(timeout=30)
+                warm_times.append(time.perf_counter() - started)
+                if exit_code != 0 or output != ["bot started\n"]:
+                    raise RuntimeError(f"warm run failed: exit {exit_code}, output {output}")
+        finally:
+            zygote.terminate()
+            zygote.wait()
+
+    cold = sum(cold_times) / runs
+    warm = sum(warm_times) / runs
+    print()
+    print(f"  zygote startup (once)      {zygote_startup * 1000:8.1f} ms")
+    print(f"  cold start (avg)           {cold * 1000:8.1f} ms")
+    print(f"  warm start (avg)           {warm * 1000:8.1f} ms  ({cold / warm:.1f}x faster)")
+    return cold, warm
+
+
+class SimulationFinished(BaseException):
+    """Raised from the virtual clock to end run_step9's endless loop"""
+
+
+class VirtualClock:
+    """Virtual time for the scheduler - sleeping jumps straight to the next simulated event"""
+    def __init__(self, start, end):
+        self.now = start.timestamp()
+        self.end = end.timestamp()
+        self.events = []  # (time, sequence, callback)
+        self.sequence = 0
+        self.in_callback = False
+
+    def schedule(self, at, callback):
+        self.sequence += 1
+        self.events.append((at, self.sequence, callback))
+        self.events.sort(key=lambda event: event[:2])
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds, wakeup=None):
+        """Advance time, running due events; stops early once the wakeup event is set"""
+        target = self.now + max(seconds, 0)
+        if self.in_callback:
+            self.now = target
+            return
+        
+        while self.events and self.events[0][0] <= target:
+            at, _, callback = self.events.pop(0)
+            self.now = max(self.now, at)
+            self.in_callback = True
+            try:
+                callback()
+            finally:
+                self.in_callback = False
+            if wakeup is not None and wakeup.is_set():
+                break
+        else:
+            self.now = target
+        
+        if self.now >= self.end:
+            raise SimulationFinished()
+
+
+class VirtualTimeModule:
+    """Replaces the scheduler module's time import"""
+    def __init__(self, clock):
+        self.clock = clock
+
+    def time(self):
+        return self.clock.time()
+
+    def monotonic(self):
+        return self.clock.monotonic()
+
+    def sleep(self, seconds):
+        self.clock.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class VirtualDatetime(datetime):
+    """Replaces the scheduler module's datetime import"""
+    clock = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.fromtimestamp(cls.clock.now, tz)
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Selector whose idle waits advance the virtual clock instead of blocking"""
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def is_set(self):
+        # Stops the clock once an event callback woke the loop (call_soon_threadsafe writes its self-pipe)
+        return bool(super().select(0))
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            raise RuntimeError("simulated event loop has nothing scheduled")
+        self.clock.sleep(timeout, wakeup=self)
+        return super().select(0)
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """asyncio loop on the virtual clock - timers and waits jump straight to the next simulated event"""
+    def __init__(self, clock):
+        super().__init__(VirtualSelector(clock))
+        self.clock = clock
+        self.origin = clock.monotonic()
+
+    def time(self):
+        # Relative to the start - epoch-sized floats cannot resolve the loop's 1ns clock resolution
+        return self.clock.monotonic() - self.origin
+
+
+class VirtualEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """Makes asyncio.run in run_step9 use the virtual event loop"""
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def new_event_loop(self):
+        return VirtualEventLoop(self.clock)
+
+
+class SimulatedBotRun:
+    """Stands in for a bot worker thread - finishes on the virtual clock"""
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+class SchedulerSimulation:
+    """Runs run_step9 against in-memory services on a virtual clock"""
+    def __init__(self, bot_count=5, days=7, bot_minutes=20, edit_every_hours=6, max_parallel_bots=2,
+                 start=datetime(2024, 1, 1)):
+        self.bot_count = bot_count
+        self.bot_minutes = bot_minutes
+        self.edit_every_hours = edit_every_hours
+        self.max_parallel_bots = max_parallel_bots
+        self.start = start
+        self.end = start + timedelta(days=days)
+        self.clock = VirtualClock(start, self.end)
+        self.counter = CallCounter()
+        self.launches = []    # (bot name, launch time)
+        self.reads = []       # (time, sheet version) for every scheduler sheet read
+        self.direct_starts = []  # (bot name, time) for bot processes started outside a worker
+        self.edits = []       # (time, sheet version) for every simulated user edit
+        self.gc = None
+        self.scheduler = None
+
+    def record_read(self, worksheet, original_batch_get):
+        def batch_get(ranges):
+            self.reads.append((self.clock.now, worksheet.spreadsheet.version))
+            return original_batch_get(ranges)
+        return batch_get
+
+    def make_home(self, home):
+        """Bot folders with the key files step 9 looks for, a venv interpreter and a local copy of the main script"""
+        for name in [f"bot {i}" for i in range(1, self.bot_count + 1)] + ["scheduler"]:
+            venv_path = Path(home) / "bots" / name / "venv"
+            (venv_path / "bin").mkdir(parents=True)
+            (venv_path / "spread sheet access key.json").write_text("{}")
+            (venv_path / "bin" / "python3").write_text("")
+            (venv_path.parent / f"{name}.py").write_text("print('bot started')\n")
+    
+    def start_bot_process(self, bot_name, request, cold_command, **popen_kwargs):
+        """Every real bot start goes through launch_bot_worker, which the simulation replaces - record any other"""
+        self.direct_starts.append((bot_name, self.clock.now))
+        raise RuntimeError(f"{bot_name} started outside a bot worker")
+
+    def launch_bot_worker(self, bot_name, resources, start_time, stop_time, gc):
+        """Simulated launch_bot_worker - the bot finishes bot_minutes later or at its stop time"""
+        scheduler = self.scheduler
+        run = SimulatedBotRun()
+        with scheduler.worker_lock:
+            for resource in resources:
+                scheduler.held_resources[resource] = bot_name
+            scheduler.bot_workers[bot_name] = run
+        
+        launched = self.clock.now
+        self.launches.append((bot_name, launched))
+        
+        launched_at = datetime.fromtimestamp(launched)
+        stop_at = datetime.strptime(f"{launched_at:%d-%m-%Y} {scheduler.normalize_time_format(stop_time)}", "%d-%m-%Y %H:%M")
+        if stop_at < launched_at:
+            stop_at += timedelta(days=1)
+        # The real worker is only stopped once the stop minute has passed
+        finish = min(launched + self.bot_minutes * 60, stop_at.timestamp() + 60)
+        forced = finish < launched + self.bot_minutes * 60
+        
+        def finish_run():
+            ended = datetime.fromtimestamp(self.clock.now)
+            last_run = ended.strftime("%d-%m-%Y %H:%M:%S")
+            remark = "forcefully stopped" if forced else "sucessfully done"
+            scheduler.update_local_status(bot_name, "idle")
+            scheduler.update_local_last_run_and_remark(bot_name, last_run, remark)
+            scheduler.update_google_sheet_transition(gc, bot_name, "idle", last_run, remark)
+            scheduler.record_run_history(bot_name, launched_at, ended, None if forced else 0, remark)
+            run.alive = False
+            with scheduler.worker_lock:
+                for resource in resources:
+                    if scheduler.held_resources.get(resource) == bot_name:
+                        del scheduler.held_resources[resource]
+                scheduler.bot_workers.pop(bot_name, None)
+            scheduler.scheduler_wakeup.set()
+        
+        self.clock.schedule(finish, finish_run)
+
+    async def run_blocking(self, func, *args):
+        """Blocking calls run inline - executor threads would race on the virtual clock"""
+        return func(*args)
+
+    def flush_sheet_writes(self):
+        """Runs where the background flusher would - right after state changes are queued"""
+        if self.scheduler.flush_event.is_set():
+            self.scheduler.flush_event.clear()
+            self.scheduler.flush_pending_sheet_writes(self.gc)
+
+    def schedule_edits(self, sheet):
+        """A user touches the sheet every edit_every_hours - rewriting a cell still bumps the Drive revision"""
+        def edit():
+            sheet.sheet1.update_cell(2, SWITCH_COLUMN, sheet.sheet1.rows[1][SWITCH_COLUMN - 1])
+            self.edits.append((self.clock.now, sheet.version))
+        
+        at = self.start + timedelta(hours=self.edit_every_hours)
+        while self.edit_every_hours and at < self.end:
+            self.clock.schedule(at.timestamp(), edit)
+            at += timedelta(hours=self.edit_every_hours)
+
+    def windows(self, rows):
+        """Every (bot, start, stop) window with the switch on during the simulated period"""
+        headers = rows[0]
+        result = []
+        day = self.start
+        while day < self.end:
+            start_name, stop_name = self.scheduler.weekday_columns[day.weekday()]
+            start_col, stop_col = headers.index(start_name), headers.index(stop_name)
+            for row in rows[1:]:
+                if row[SWITCH_COLUMN - 1] != 'on':
+                    continue
+                window_start = datetime.strptime(f"{day:%Y-%m-%d} {row[start_col]}", "%Y-%m-%d %H:%M")
+                window_stop = datetime.strptime(f"{day:%Y-%m-%d} {row[stop_col]}", "%Y-%m-%d %H:%M")
+                result.append((row[0], window_start.timestamp(), window_stop.timestamp()))
+            day += timedelta(days=1)
+        return result
+
+    def run(self):
+        patches = {
+            'time': VirtualTimeModule(self.clock),
+            'datetime': VirtualDatetime,
+            'gspread': None,
+            'Credentials': None,
+            'build': None,
+            'requests': None,
+            'db': None
+        }
+        originals = {name: getattr(scheduler_module, name) for name in patches}
+        VirtualDatetime.clock = self.clock
+        original_home = os.environ.get('HOME')
+        
+        with tempfile.TemporaryDirectory() as home:
+            self.make_home(home)
+            os.environ['HOME'] = home
+            try:
+                self.gc = FakeSheetsClient(self.counter)
+                rows = make_scheduler_rows(self.bot_count)
+                sheet = self.gc.add_spreadsheet("scheduler", rows)
+                for i in range(1, self.bot_count + 1):
+                    self.gc.add_spreadsheet(f"bot {i}", [["header"]])
+                sheet.sheet1.batch_get = self.record_read(sheet.sheet1, sheet.sheet1.batch_get)
+                drive = FakeDrive(self.gc)
+                
+                patches['gspread'] = type('FakeGspread', (), {'authorize': staticmethod(lambda creds: self.gc)})
+                patches['Credentials'] = type('FakeCredentials', (), {
+                    'from_service_account_file': staticmethod(lambda path, scopes=None: object())
+                })
+                patches['build'] = lambda service, version, credentials=None: drive
+                patches['requests'] = FakeGitHub(self.counter, [f"bot {i}" for i in range(1, self.bot_count + 1)])
+                patches['db'] = FakeFirebaseDB(self.counter)
+                for name, value in patches.items():
+                    setattr(scheduler_module, name, value)
+                
+                self.scheduler = make_offline_scheduler(self.gc)
+                self.scheduler.max_parallel_bots = self.max_parallel_bots
+                self.scheduler.warm_start_enabled = False
+                self.scheduler.show_countdown = False
+                self.scheduler.run_blocking = self.run_blocking
+                self.scheduler.launch_bot_worker = self.launch_bot_worker
+                self.scheduler.start_bot_process = self.start_bot_process
+                self.scheduler.start_sheet_flusher = lambda gc: None
+                self.scheduler.metrics_port = 0  # no HTTP endpoint in the simulation
+                self.schedule_edits(sheet)
+                
+                # The flusher runs whenever the main loop sleeps
+                original_sleep = self.clock.sleep
+                def sleep(seconds, wakeup=None):
+                    self.flush_sheet_writes()
+                    original_sleep(seconds, wakeup)
+                self.clock.sleep = sleep
+                
+                started = time.perf_counter()
+                original_policy = asyncio.get_event_loop_policy()
+                asyncio.set_event_loop_policy(VirtualEventLoopPolicy(self.clock))
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    try:
+                        self.scheduler.run_step9()
+                    except SimulationFinished:
+                        pass
+                    finally:
+                        asyncio.set_event_loop_policy(original_policy)
+                elapsed = time.perf_counter() - started
+                
+                return self.report(rows, elapsed)
+            finally:
+                for name, value in originals.items():
+                    setattr(scheduler_module, name, value)
+                if original_home is None:
+                    os.environ.pop('HOME', None)
+                else:
+                    os.environ['HOME'] = original_home
+
+    def report(self, rows, elapsed):
+        hours = (self.end - self.start).total_seconds() / 3600
+        
+        latencies = []
+        missed = []
+        for bot_name, window_start, window_stop in self.windows(rows):
+            # The stop minute itself is still inside the window
+            launched = [at for name, at in self.launches if name == bot_name and window_start <= at < window_stop + 60]
+            if launched:
+                latencies.append(launched[0] - window_start)
+            else:
+                missed.append((bot_name, datetime.fromtimestamp(window_start)))
+        
+        edit_latencies = []
+        for edited_at, version in self.edits:
+            seen = [at for at, read_version in self.reads if at >= edited_at and read_version >= version]
+            if seen:
+                edit_latencies.append(seen[0] - edited_at)
+        
+        return {
+            'hours': hours,
+            'elapsed': elapsed,
+            'calls_per_hour': {name: count / hours for name, count in sorted(self.counter.calls.items())},
+            'launches': len(self.launches),
+            'windows': len(latencies) + len(missed),
+            'missed': missed,
+            'direct_starts': self.direct_starts,
+            'start_latency': latencies,
+            'edit_latency': edit_latencies
+        }
+
+
+def describe_latencies(values):
+    if not values:
+        return "n/a"
+    ordered = sorted(values)
+    return (f"avg {sum(ordered) / len(ordered):6.1f}s  p95 {ordered[int(0.95 * (len(ordered) - 1))]:6.1f}s  "
+            f"max {ordered[-1]:6.1f}s")
+
+
+def benchmark_simulated_week(**options):
+    """Run the scheduler over a simulated week and report API calls, decision latency and missed windows"""
+    simulation = SchedulerSimulation(**options)
+    print("=" * 60)
+    print(f"Simulation: {simulation.bot_count} bots, {(simulation.end - simulation.start).days} days, "
+          f"{simulation.bot_minutes} min per run, sheet edited every {simulation.edit_every_hours}h")
+    print("=" * 60)
+    
+    result = simulation.run()
+    
+    print()
+    print(f"  simulated {result['hours']:.0f}h in {result['elapsed']:.1f}s")
+    print("  API calls per hour:")
+    for name, rate in result['calls_per_hour'].items():
+        print(f"    {name:<28} {rate:8.1f}")
+    print(f"  bot runs started:          {result['launches']}")
+    print(f"  schedule windows:          {result['windows']}  (missed {len(result['missed'])})")
+    print(f"  window start -> launch     {describe_latencies(result['start_latency'])}")
+    print(f"  sheet edit -> re-read      {describe_latencies(result['edit_latency'])}")
+    for bot_name, window_start in result['missed'][:10]:
+        print(f"    missed: {bot_name} at {window_start:%a %d-%m %H:%M}")
+    
+    assert not result['direct_starts'], f"bots started outside a worker: {result['direct_starts'][:5]}"
+    assert not result['missed'], f"missed schedule windows: {result['missed'][:5]}"
+    return result
+
+
+def main():
+    benchmark_change_detection()
+    print()
+    benchmark_sheet_size()
+    print()
+    benchmark_xpath_service()
+    print()
+    benchmark_repository_fetch()
+    print()
+    benchmark_warm_start()
+    print()
+    benchmark_simulated_week()
+
+
+if __name__ == "__main__":
+    main()
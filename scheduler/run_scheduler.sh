@@ -3,5 +3,71 @@
 # Activate the virtual environment (works for any username)
 source ~/bots/scheduler/venv/bin/activate
 
-# Run the scheduler Python script directly from GitHub
-curl -sL "https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main/scheduler/scheduler.py" | python3
+# The scheduler runs from a local copy so startup needs no network round-trip.
+# A newer upstream version is fetched in the background and swapped in on the next start.
+SCHEDULER_URL="https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main/scheduler/scheduler.py"
+CACHE_DIR="$HOME/.cache/raspberry-pi-bots/scheduler"
+LOCAL_SCRIPT="$CACHE_DIR/scheduler.py"
+PENDING_SCRIPT="$CACHE_DIR/scheduler.py.new"
+ETAG_FILE="$CACHE_DIR/etag"
+
+mkdir -p "$CACHE_DIR"
+
+# --etag-compare/--etag-save need curl 7.68 - older curl (e.g. on Buster) always downloads in full
+etag_supported() {
+    local version major minor
+    version=$(curl --version 2>/dev/null | awk 'NR == 1 {print $2}')
+    IFS=. read -r major minor _ <<< "$version"
+    [ -n "$major" ] && [ -n "$minor" ] && { [ "$major" -gt 7 ] || { [ "$major" -eq 7 ] && [ "$minor" -ge 68 ]; }; }
+}
+
+# Download the scheduler if upstream changed, keeping it only if it byte-compiles
+fetch_scheduler() {
+    local target="$1"
+    local temp_script="$CACHE_DIR/scheduler.py.download"
+    local temp_etag="$CACHE_DIR/etag.download"
+    local status
+    local etag_args=()
+
+    if etag_supported; then
+        etag_args=(--etag-compare "$ETAG_FILE" --etag-save "$temp_etag")
+    fi
+
+    status=$(curl -sL --max-time 60 "${etag_args[@]}" \
+        -o "$temp_script" -w '%{http_code}' "$SCHEDULER_URL") || status="000"
+
+    if [ "$status" = "200" ] && python3 -m py_compile "$temp_script" 2>/dev/null; then
+        mv -f "$temp_script" "$target"
+        if [ -f "$temp_etag" ]; then
+            mv -f "$temp_etag" "$ETAG_FILE.new"
+        fi
+        return 0
+    fi
+
+    rm -f "$temp_script" "$temp_etag"
+    return 1
+}
+
+# Swap in the version downloaded during the previous run (rename is atomic)
+if [ -f "$PENDING_SCRIPT" ]; then
+    mv -f "$PENDING_SCRIPT" "$LOCAL_SCRIPT"
+    [ -f "$ETAG_FILE.new" ] && mv -f "$ETAG_FILE.new" "$ETAG_FILE"
+    echo "Scheduler updated to the latest version"
+fi
+
+if [ ! -f "$LOCAL_SCRIPT" ]; then
+    # First start - nothing cached yet, so download in the foreground
+    rm -f "$ETAG_FILE"
+    if ! fetch_scheduler "$PENDING_SCRIPT"; then
+        echo "Could not download the scheduler and no local copy exists"
+        exit 1
+    fi
+    mv -f "$PENDING_SCRIPT" "$LOCAL_SCRIPT"
+    [ -f "$ETAG_FILE.new" ] && mv -f "$ETAG_FILE.new" "$ETAG_FILE"
+else
+    # Check upstream in the background with a conditional request
+    fetch_scheduler "$PENDING_SCRIPT" >/dev/null 2>&1 &
+fi
+
+# Import instead of running the file so Python keeps the byte-compiled form in __pycache__
+cd "$CACHE_DIR" && exec python3 -c "import scheduler; scheduler.main()"
@@ -8,27 +8,698 @@ import sys
 import subprocess
 import time
 import shutil
+import tarfile
 import csv
 import requests
+import psutil
 import json
-import platform
+import hashlib
+import sqlite3
+import socket
 import threading
+import asyncio
+import queue
+import selectors
+import socketserver
+import http.server
+import contextlib
+import copy
+import heapq
+import logging
+import logging.handlers
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 import signal
-import firebase_admin
-from firebase_admin import credentials, db
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Selenium and firebase_admin are only needed by a few steps - they are imported on first use
+firebase_admin = credentials = db = None
+webdriver = By = Keys = Options = Service = WebDriverWait = EC = None
+TimeoutException = NoSuchElementException = None
+
+def import_firebase():
+    """Import firebase_admin on first use"""
+    global firebase_admin, credentials, db
+    if firebase_admin is None:
+        import firebase_admin
+        from firebase_admin import credentials, db
+
+def import_selenium():
+    """Import selenium on first use"""
+    global webdriver, By, Keys, Options, Service, WebDriverWait, EC, TimeoutException, NoSuchElementException
+    if webdriver is None:
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+# Warm-start server run inside a bot venv: imports the heavy modules once, then forks one child per bot run.
+# Protocol: the client sends one JSON line {token, cwd, url|path|source}; the child writes its pid on the first
+# line, then the bot's stdout/stderr; after reaping the child the zygote writes "<token> <exit code>".
+ZYGOTE_SOURCE = r'''
+import os
+import sys
+import json
+import socket
+import signal
+import atexit
+import builtins
+import selectors
+import importlib
+import traceback
+import urllib.request
+
+socket_path = sys.argv[1]
+for module_name in sys.argv[2:]:
+    try:
+        importlib.import_module(module_name)
+    except Exception:
+        pass
+
+try:
+    os.unlink(socket_path)
+except FileNotFoundError:
+    pass
+server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+server.bind(socket_path)
+os.chmod(socket_path, 0o600)
+server.listen(8)
+server.setblocking(False)
+parent_pid = os.getppid()
+children = {}
+
+# SIGCHLD wakes the select loop so exit codes are reported as soon as a child exits
+wakeup_read, wakeup_write = os.pipe()
+os.set_blocking(wakeup_read, False)
+os.set_blocking(wakeup_write, False)
+signal.set_wakeup_fd(wakeup_write)
+signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+selector = selectors.DefaultSelector()
+selector.register(server, selectors.EVENT_READ)
+selector.register(wakeup_read, selectors.EVENT_READ)
+
+def run_child(connection, request):
+    signal.set_wakeup_fd(-1)
+    selector.close()
+    server.close()
+    os.close(wakeup_read)
+    os.close(wakeup_write)
+    for other_connection, _ in children.values():
+        other_connection.close()
+    os.setsid()
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGPIPE, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(connection.fileno(), 1)
+    os.dup2(connection.fileno(), 2)
+    connection.close()
+    sys.stdout = open(1, 'w', buffering=1, closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+    exit_code = 0
+    try:
+        os.chdir(request['cwd'])
+        os.environ.update(request.get('env', {}))
+        print(os.getpid(), flush=True)
+        if 'url' in request:
+            source = urllib.request.urlopen(request['url'], timeout=60).read()
+        elif 'path' in request:
+            with open(request['path'], 'rb') as f:
+                source = f.read()
+        else:
+            source = request['source']
+        sys.argv = [request.get('path', '')]
+        exec(compile(source, request.get('path', '<stdin>'), 'exec'), {'__name__': '__main__', '__builtins__': builtins})
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    try:
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code)
+
+def reap_children():
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        if pid in children:
+            connection, token = children.pop(pid)
+            try:
+                # The leading newline ends a last output line that had none of its own
+                connection.sendall(f"\n{token} {os.waitstatus_to_exitcode(status)}\n".encode())
+            except OSError:
+                pass
+            connection.close()
+
+print("ready", flush=True)
+while os.getppid() == parent_pid:
+    connection = None
+    for key, _ in selector.select(timeout=1):
+        if key.fileobj is server:
+            try:
+                connection, _ = server.accept()
+            except BlockingIOError:
+                pass
+        else:
+            try:
+                os.read(wakeup_read, 512)
+            except BlockingIOError:
+                pass
+    if connection is not None:
+        try:
+            connection.settimeout(5)
+            request = json.loads(connection.makefile('r').readline())
+            connection.setblocking(True)
+            pid = os.fork()
+            if pid == 0:
+                run_child(connection, request)
+            children[pid] = (connection, request['token'])
+        except Exception:
+            connection.close()
+    reap_children()
+'''
+
+
+class ZygoteProcess:
+    """Popen-like handle for a bot forked by a warm-start zygote - output and exit code arrive over its socket"""
+
+    def __init__(self, socket_path, request):
+        self.token = f"zygote-exit-{os.urandom(8).hex()}"
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.settimeout(10)
+        self.connection.connect(socket_path)
+        self.connection.sendall((json.dumps(dict(request, token=self.token)) + "\n").encode())
+        self.reader = self.connection.makefile('r', encoding='utf-8', errors='replace')
+        
+        first_line = self.reader.readline().strip()
+        if not first_line.isdigit():
+            self.connection.close()
+            raise RuntimeError(f"zygote did not start the bot: {first_line or 'no response'}")
+        
+        self.connection.settimeout(None)
+        self.pid = int(first_line)
+        self.returncode = None
+        self.exited = threading.Event()
+        self.exit_callbacks = []
+        self.lines = queue.Queue()
+        self.stdout = self.iter_output()
+        
+        reader_thread = threading.Thread(target=self.read_output, name=f"zygote-output-{self.pid}")
+        reader_thread.daemon = True
+        reader_thread.start()
+
+    def read_output(self):
+        """Queue output lines until the zygote reports the exit code"""
+        held_blank = False  # the zygote puts a newline before its exit trailer - held back until the next line
+        try:
+            for line in self.reader:
+                output, token, trailer = line.rpartition(self.token)
+                if token:
+                    if output.strip():
+                        self.lines.put(output + "\n")
+                    self.returncode = int(trailer.split()[0])
+                    break
+                if held_blank:
+                    self.lines.put("\n")
+                held_blank = line == "\n"
+                if not held_blank:
+                    self.lines.put(line)
+        except Exception:
+            pass
+        finally:
+            if self.returncode is None:
+                # The zygote went away without reporting - treat it like a killed process
+                self.returncode = -signal.SIGKILL
+            self.reader.close()
+            self.connection.close()
+            self.lines.put(None)
+            self.exited.set()
+            for callback in self.exit_callbacks:
+                callback()
+
+    def iter_output(self):
+        while True:
+            line = self.lines.get()
+            if line is None:
+                return
+            yield line
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self.exited.wait(timeout):
+            raise subprocess.TimeoutExpired(f"zygote child {self.pid}", timeout)
+        return self.returncode
+
+    def communicate(self, timeout=None):
+        self.wait(timeout)
+        remaining = []
+        while True:
+            try:
+                line = self.lines.get_nowait()
+            except queue.Empty:
+                break
+            if line is not None:
+                remaining.append(line)
+        return ''.join(remaining), None
+
+    def send_signal(self, sig):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class WakeupEvent(threading.Event):
+    """threading.Event that also wakes an asyncio loop awaiting it - set from worker threads, awaited by the loop"""
+
+    def __init__(self):
+        super().__init__()
+        self.binding = None  # (loop, asyncio.Event) of the loop currently waiting
+
+    def set(self):
+        super().set()
+        binding = self.binding
+        if binding is not None:
+            try:
+                binding[0].call_soon_threadsafe(binding[1].set)
+            except RuntimeError:
+                pass  # the loop has closed
+
+    async def wait_async(self, timeout=None):
+        loop = asyncio.get_running_loop()
+        if self.binding is None or self.binding[0] is not loop:
+            self.binding = (loop, asyncio.Event())
+        async_event = self.binding[1]
+        async_event.clear()
+        if self.is_set():
+            return True
+        try:
+            await asyncio.wait_for(async_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.is_set()
+
+
+class ProcessExitWatcher:
+    """Sets an event the moment a watched bot process exits - one thread blocked on Linux pidfds"""
+
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        self.selector.register(self.wakeup_read, selectors.EVENT_READ)
+        self.pending = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def watch(self, process, event):
+        """Set event once process has exited and been reaped"""
+        if isinstance(process, ZygoteProcess):
+            # Not our child - the exit code arrives over the zygote socket
+            process.exit_callbacks.append(event.set)
+            if process.exited.is_set():
+                event.set()
+            return
+        
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            # No pidfd support (kernel < 5.3) - block in waitpid on a helper thread instead
+            def wait_for_exit():
+                try:
+                    process.wait()
+                finally:
+                    event.set()
+            waiter = threading.Thread(target=wait_for_exit, name=f"exit-watch-{process.pid}")
+            waiter.daemon = True
+            waiter.start()
+            return
+        
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="process-exit-watcher")
+                self.thread.daemon = True
+                self.thread.start()
+        self.pending.put((pidfd, process, event))
+        os.write(self.wakeup_write, b"\0")
+
+    def run(self):
+        """Sleep until a pidfd turns readable (its process exited), then reap it and set its event"""
+        while True:
+            for key, _ in self.selector.select():
+                if key.fd == self.wakeup_read:
+                    os.read(self.wakeup_read, 4096)
+                    while not self.pending.empty():
+                        pidfd, process, event = self.pending.get()
+                        self.selector.register(pidfd, selectors.EVENT_READ, (process, event))
+                    continue
+                
+                process, event = key.data
+                self.selector.unregister(key.fd)
+                os.close(key.fd)
+                process.poll()  # reap and record the exit code
+                event.set()
+
+
+def get_lease_holder(lease, run_id, node_id, now):
+    """Get who blocks this node from claiming a bot run - None when the run is free or already ours"""
+    if not lease:
+        return None
+    if lease.get('run_id') == run_id and lease.get('done'):
+        return lease.get('owner') or 'another node'
+    if lease.get('owner') == node_id or lease.get('done'):
+        return None
+    if (lease.get('expires_at') or 0) > now:
+        return lease.get('owner')
+    return None
+
+
+class SQLiteLeaseBackend:
+    """Bot run leases in a SQLite file - for schedulers on one host or a shared mount, and for testing"""
+    writes_status = False
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=10)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    bot_name TEXT PRIMARY KEY,
+                    run_id TEXT,
+                    owner TEXT,
+                    expires_at REAL,
+                    done INTEGER DEFAULT 0
+                )
+            """)
+            self.connection = connection
+        return self.connection
+
+    def acquire(self, bot_name, run_id, node_id, ttl):
+        """Claim a bot run - returns (acquired, holder, expires_at)"""
+        now = time.time()
+        with self.lock:
+            connection = self.connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT run_id, owner, expires_at, done FROM leases WHERE bot_name = ?", (bot_name,)
+                ).fetchone()
+                lease = dict(zip(('run_id', 'owner', 'expires_at', 'done'), row)) if row else None
+                holder = get_lease_holder(lease, run_id, node_id, now)
+                if holder is None:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO leases (bot_name, run_id, owner, expires_at, done) VALUES (?, ?, ?, ?, 0)",
+                        (bot_name, run_id, node_id, now + ttl)
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        
+        if holder is None:
+            return True, node_id, now + ttl
+        return False, holder, None if lease['done'] else lease['expires_at']
+
+    def renew(self, bot_name, run_id, node_id, ttl):
+        """Extend a held lease - False if another node took it over"""
+        with self.lock:
+            cursor = self.connect().execute(
+                "UPDATE leases SET expires_at = ? WHERE bot_name = ? AND run_id = ? AND owner = ? AND done = 0",
+                (time.time() + ttl, bot_name, run_id, node_id)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, bot_name, run_id, node_id, done):
+        """Give a lease back - a done run is never claimed again"""
+        with self.lock:
+            self.connect().execute(
+                "UPDATE leases SET expires_at = ?, done = ? WHERE bot_name = ? AND run_id = ? AND owner = ?",
+                (time.time(), int(done), bot_name, run_id, node_id)
+            )
+
+
+class FirebaseLeaseBackend:
+    """Bot run leases in the Realtime Database, claimed and renewed with transactions"""
+    writes_status = False
+
+    def __init__(self, path="scheduler leases"):
+        self.path = path
+
+    def reference(self, bot_name):
+        key = ''.join('_' if ch in '.$#[]/' else ch for ch in bot_name)
+        return db.reference(f"{self.path}/{key}")
+
+    def acquire(self, bot_name, run_id, node_id, ttl):
+        """Claim a bot run - returns (acquired, holder, expires_at)"""
+        now = time.time()
+        outcome = {}
+        
+        def claim(lease):
+            outcome['holder'] = get_lease_holder(lease, run_id, node_id, now)
+            outcome['lease'] = lease
+            if outcome['holder'] is not None:
+                return lease
+            return {'run_id': run_id, 'owner': node_id, 'expires_at': now + ttl, 'done': False}
+        
+        self.reference(bot_name).transaction(claim)
+        if outcome['holder'] is None:
+            return True, node_id, now + ttl
+        lease = outcome['lease']
+        return False, outcome['holder'], None if lease.get('done') else lease.get('expires_at')
+
+    def renew(self, bot_name, run_id, node_id, ttl):
+        """Extend a held lease - False if another node took it over"""
+        outcome = {'renewed': False}
+        
+        def extend(lease):
+            if not lease or lease.get('owner') != node_id or lease.get('run_id') != run_id or lease.get('done'):
+                outcome['renewed'] = False
+                return lease
+            outcome['renewed'] = True
+            return dict(lease, expires_at=time.time() + ttl)
+        
+        self.reference(bot_name).transaction(extend)
+        return outcome['renewed']
+
+    def release(self, bot_name, run_id, node_id, done):
+        """Give a lease back - a done run is never claimed again"""
+        def give_back(lease):
+            if not lease or lease.get('owner') != node_id or lease.get('run_id') != run_id:
+                return lease
+            return dict(lease, expires_at=time.time(), done=done)
+        
+        self.reference(bot_name).transaction(give_back)
+
+
+class SheetLeaseBackend:
+    """Bot run leases in the scheduler sheet's status column, written as 'in progress on <node> until <time>'"""
+    writes_status = True
+    settle_seconds = 2  # the sheet has no compare-and-swap, so a claim is re-read after this long
+    prefix = "in progress on "
+    separator = " until "
+    time_format = "%d-%m-%Y %H:%M:%S"
+
+    def __init__(self, scheduler, gc):
+        self.scheduler = scheduler
+        self.gc = gc
+
+    def read_lease(self, bot_name, run_id):
+        """Read the bot's status, last_run and remark cells as a lease"""
+        scheduler = self.scheduler
+        if bot_name not in scheduler.scheduler_row_index:
+            scheduler.refresh_scheduler_index(self.gc)
+        row_number = scheduler.scheduler_row_index.get(bot_name)
+        columns = [scheduler.get_scheduler_column(name) for name in ('status', 'last_run', 'remark')]
+        if not row_number or None in columns:
+            raise ValueError(f"{bot_name} has no status row in the scheduler sheet")
+        
+        ranges = [rowcol_to_a1(row_number, column) for column in columns]
+        cells = [values[0][0] if values and values[0] else '' for values in scheduler.scheduler_worksheet.batch_get(ranges)]
+        status, last_run, remark = (cell.strip() for cell in cells)
+        
+        if status.startswith(self.prefix) and self.separator in status:
+            owner, _, until = status[len(self.prefix):].rpartition(self.separator)
+            try:
+                expires_at = datetime.strptime(until, self.time_format).timestamp()
+            except ValueError:
+                expires_at = 0
+            return {'run_id': run_id, 'owner': owner, 'expires_at': expires_at, 'done': False}
+        
+        # A successful last_run inside this window marks the run done
+        try:
+            done = (datetime.strptime(last_run, self.time_format) >= datetime.strptime(run_id, "%d-%m-%Y %H:%M")
+                    and "sucessfully done" in remark.lower())
+        except ValueError:
+            done = False
+        return {'run_id': run_id, 'owner': '', 'expires_at': 0, 'done': done} if done else None
+
+    def write_lease(self, bot_name, node_id, ttl):
+        until = datetime.fromtimestamp(time.time() + ttl).strftime(self.time_format)
+        return self.scheduler.write_scheduler_row(self.gc, bot_name, {'status': f"{self.prefix}{node_id}{self.separator}{until}"})
+
+    def acquire(self, bot_name, run_id, node_id, ttl):
+        """Claim a bot run - returns (acquired, holder, expires_at)"""
+        lease = self.read_lease(bot_name, run_id)
+        holder = get_lease_holder(lease, run_id, node_id, time.time())
+        if holder is None:
+            if not self.write_lease(bot_name, node_id, ttl):
+                raise RuntimeError(f"could not write the lease for {bot_name}")
+            # Last writer wins - only the node whose claim is still there after the settle time runs the bot
+            time.sleep(self.settle_seconds)
+            lease = self.read_lease(bot_name, run_id)
+            if lease and lease['owner'] == node_id:
+                return True, node_id, lease['expires_at']
+            holder = get_lease_holder(lease, run_id, node_id, time.time()) or 'another node'
+        return False, holder, None if lease and lease['done'] else (lease or {}).get('expires_at')
+
+    def renew(self, bot_name, run_id, node_id, ttl):
+        """Extend a held lease - False if another node took it over"""
+        lease = self.read_lease(bot_name, run_id)
+        if not lease or lease['owner'] != node_id:
+            return False
+        return self.write_lease(bot_name, node_id, ttl)
+
+    def release(self, bot_name, run_id, node_id, done):
+        """Give a lease back - the worker already queued the idle status, last_run and remark, so push them now"""
+        self.scheduler.flush_pending_sheet_writes(self.gc)
+
+
+class SchedulerMetrics:
+    """Counters, gauges and histograms rendered in the Prometheus text format - no client library needed"""
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800, 3600)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.families = {}  # name -> {'type', 'help', 'buckets', 'samples': {label items: value or histogram}}
+
+    def family(self, name, metric_type, help_text, buckets=None):
+        if name not in self.families:
+            self.families[name] = {'type': metric_type, 'help': help_text, 'buckets': buckets, 'samples': {}}
+        return self.families[name]
+
+    def inc(self, name, help_text, labels=None, amount=1):
+        with self.lock:
+            samples = self.family(name, 'counter', help_text)['samples']
+            key = tuple(sorted((labels or {}).items()))
+            samples[key] = samples.get(key, 0) + amount
+
+    def set(self, name, help_text, labels=None, value=0):
+        with self.lock:
+            self.family(name, 'gauge', help_text)['samples'][tuple(sorted((labels or {}).items()))] = value
+
+    def observe(self, name, help_text, labels=None, value=0, buckets=DEFAULT_BUCKETS):
+        with self.lock:
+            family = self.family(name, 'histogram', help_text, buckets)
+            key = tuple(sorted((labels or {}).items()))
+            histogram = family['samples'].setdefault(key, {'counts': [0] * len(family['buckets']), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(family['buckets']):
+                if value <= bound:
+                    histogram['counts'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextlib.contextmanager
+    def time_request(self, service, operation):
+        """Count and time one external API request (Sheets, Drive, Firebase, GitHub)"""
+        labels = {'service': service, 'operation': operation}
+        started = time.monotonic()
+        outcome = 'error'
+        try:
+            yield
+            outcome = 'ok'
+        finally:
+            self.observe('scheduler_api_request_duration_seconds', "External API request latency",
+                         labels, time.monotonic() - started)
+            self.inc('scheduler_api_requests_total', "External API requests by outcome", dict(labels, outcome=outcome))
+
+    @staticmethod
+    def format_labels(items, extra=()):
+        items = list(items) + list(extra)
+        if not items:
+            return ""
+        pairs = []
+        for key, value in items:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, family in sorted(self.families.items()):
+                lines.append(f"# HELP {name} {family['help']}")
+                lines.append(f"# TYPE {name} {family['type']}")
+                for key, value in sorted(family['samples'].items()):
+                    if family['type'] != 'histogram':
+                        lines.append(f"{name}{self.format_labels(key)} {value}")
+                        continue
+                    for bound, count in zip(family['buckets'], value['counts']):
+                        lines.append(f"{name}_bucket{self.format_labels(key, [('le', bound)])} {count}")
+                    lines.append(f"{name}_bucket{self.format_labels(key, [('le', '+Inf')])} {value['count']}")
+                    lines.append(f"{name}_sum{self.format_labels(key)} {value['sum']}")
+                    lines.append(f"{name}_count{self.format_labels(key)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves GET /metrics"""
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of the scheduler output
+
+
+class XPathRequestHandler(socketserver.StreamRequestHandler):
+    """Answers one database path per line with a JSON line from the scheduler's in-memory copy"""
+    def handle(self):
+        for line in self.rfile:
+            path = line.decode('utf-8', 'replace').strip().strip('/')
+            if path:
+                self.wfile.write(self.server.scheduler.get_xpath_service_reply(path))
+
 
 class BotScheduler:
     def __init__(self):
@@ -43,9 +714,31 @@ class BotScheduler:
         self.scheduler_folder = "scheduler"
         self.github_repo = "https://github.com/Thaniyanki/raspberry-pi-bots"
         self.github_raw_base = "https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main"
+        self.github_api_base = "https://api.github.com/repos/Thaniyanki/raspberry-pi-bots"
+        self.github_branch = "main"
+        
+        # Repository tree cached on disk with its ETag
+        self.github_tree_cache_file = self.bots_base_path / self.scheduler_folder / "github tree.json"
+        self.github_tree = None
+        
+        # Locally cached copies of scripts that used to be piped from curl
+        self.launcher_cache_path = self.USER_HOME / ".cache" / "raspberry-pi-bots"
+        
+        # Repository snapshot - the whole repo unpacked from one tarball of the branch's current commit.
+        # Folder, venv.sh and sheets format lookups read from it instead of one request per file.
+        self.repository_cache_path = self.launcher_cache_path / "repository"
+        self.repository_snapshot = None
+        self.repository_lock = threading.Lock()
+        
+        # Shared pooled HTTP session for concurrent GitHub downloads
+        self.http_session = None
+        self.download_workers = 6
         
         # Browser paths
         self.chrome_profile = self.USER_HOME / ".config" / "chromium"
+        # Bots get their own profile here so they can run side by side - bots sharing a login
+        # (both WhatsApp bots) name the same profile in their venv 'resources' file
+        self.bot_profiles_path = self.USER_HOME / ".config" / "chromium-bots"
         self.chromedriver = "/usr/bin/chromedriver"
         
         # Firebase database URL
@@ -82,6 +775,146 @@ class BotScheduler:
         self.local_schedule_data = {}  # Store local copy of schedule data
         self.bot_execution_status = {}  # Track bot execution status
         
+        # Scheduler sheet write layer - row index from the last sheet snapshot
+        self.scheduler_worksheet = None
+        self.scheduler_headers = []
+        self.scheduler_row_index = {}  # bot name -> 1-based sheet row
+        self.scheduler_page_rows = 100  # rows per range when reading the scheduler sheet
+        self.scheduler_parsed_rows = {}  # raw row values -> row dict, reused while a row is unchanged
+        self.stored_schedule_rows = None  # row JSON last written to the local store, by position
+        self.stored_schedule_objects = []  # row dicts that JSON was encoded from, by position
+        self.scheduler_used_rows = 0  # sheet rows holding data at the last read, header included
+        self.sheet_lock = threading.Lock()
+        
+        # Schedule timeline - start/stop events compiled from the weekly columns
+        self.weekday_columns = [  # indexed by datetime.weekday(), Monday = 0
+            ('mon_start at', 'mon_stop at'),
+            ('tue_start at', 'tue_stop at'),
+            ('wed_start at', 'wed_stop at'),
+            ('thu_start at', 'thu_stop at'),
+            ('fri_start at ', 'fri_stop at'),
+            ('sat_start at', 'sat_stop at'),
+            ('sun_start at', 'sun_stop at')
+        ]
+        self.schedule_timeline = []  # heap of (event time, event kind, bot name)
+        self.timeline_signature = None
+        self.timeline_date = None
+        self.parsed_time_cache = {}
+        self.sync_interval = 30  # seconds between scheduler sheet syncs
+        self.show_countdown = sys.stdout.isatty()  # tick the "Next sync" countdown every second
+        
+        # Parallel bot execution - bots only wait for each other when they share a resource
+        self.max_parallel_bots = int(os.getenv('SCHEDULER_MAX_PARALLEL_BOTS', '2'))
+        self.bot_workers = {}  # bot name -> worker thread running the bot
+        self.held_resources = {}  # resource -> bot name holding it
+        self.worker_lock = threading.Lock()
+        self.scheduler_wakeup = WakeupEvent()  # set when a worker finishes
+        self.bot_retry_after = {}  # bot name -> (time a failed bot may run again, consecutive failures)
+        self.retry_backoff_seconds = 30  # wait after a failed run, doubled for each further failure
+        self.retry_backoff_max_seconds = 600
+        self.blocking_workers = 4  # threads for blocking Sheets/Drive calls made from the event loop
+        self.blocking_executor = None
+        self.process_watcher = ProcessExitWatcher()
+        self.bot_run_events = {}  # bot name -> event waking its run monitor (exit, lost lease)
+        
+        # Scheduler sheet change detection through the Drive revision
+        self.scheduler_revision = None
+        self.cached_schedule_data = None
+        self.schedule_cache_lock = threading.Lock()
+        self.sheet_write_generation = 0  # bumped whenever queued changes reach the sheet
+        self.last_full_read = None
+        self.schedule_polled = False  # set once the sheet poll task has fetched the rows
+        self.schedule_poll_error = None  # error from the last sheet poll
+        self.full_read_interval = 600  # seconds - re-read even when Drive reports no change
+        
+        # Bot output capture - last lines in memory, full stream in a rotating log per bot
+        self.bot_output_tail_lines = 200
+        self.bot_logs_path = self.bots_base_path / self.scheduler_folder / "logs"
+        self.bot_log_max_bytes = 1024 * 1024  # rotate each bot log at 1 MB
+        self.bot_log_backup_count = 3
+        self.echo_bot_output = os.getenv('SCHEDULER_ECHO_BOT_OUTPUT', '1') != '0'
+        
+        # Connectivity monitor - one background prober shared by the scheduler and, via the state file, the bots
+        self.connectivity_targets = [('8.8.8.8', 53), ('1.1.1.1', 53), ('google.com', 443)]
+        self.connectivity_probe_timeout = 3
+        self.connectivity_interval = 15  # seconds between probes while online
+        self.connectivity_state_file = self.bots_base_path / self.scheduler_folder / "connectivity.json"
+        self.connectivity_lock = threading.Lock()
+        self.connectivity_changed = threading.Event()
+        self.connectivity_monitor = None
+        self.internet_online = None  # unknown until the first probe
+        self.internet_checked_at = None
+        self.internet_changed_at = None
+        
+        # Per-bot resource accounting - 0 disables a limit, a bot's venv/limits file overrides these
+        self.resource_sample_interval = float(os.getenv('SCHEDULER_RESOURCE_SAMPLE_INTERVAL', 10))  # seconds between process tree samples
+        # Memory is measured as PSS - 60% of RAM for all bots together, no per-bot ceiling unless configured
+        self.total_memory_limit_mb = float(os.getenv('SCHEDULER_TOTAL_MEMORY_LIMIT_MB',
+                                                     psutil.virtual_memory().total * 0.6 / (1024 * 1024)))
+        self.bot_memory_limit_mb = float(os.getenv('SCHEDULER_BOT_MEMORY_LIMIT_MB', 0))
+        self.bot_rss_mb = {}  # bot name -> memory of its process tree at the last sample
+        self.bot_cpu_limit_seconds = float(os.getenv('SCHEDULER_BOT_CPU_LIMIT_SECONDS', 0))
+        
+        # Startup fingerprint - steps 1-8 are skipped when nothing changed since the last full startup
+        self.startup_fingerprint_file = self.bots_base_path / self.scheduler_folder / "startup fingerprint.json"
+        self.startup_key_files = ["database access key.json", "spread sheet access key.json", "report number"]
+        self.startup_state_lock = threading.Lock()  # guards swapping in the sheet lists re-validation found
+        
+        # Warm-start zygotes - one preloaded interpreter per bot venv that forks each bot run
+        self.warm_start_enabled = os.getenv('SCHEDULER_WARM_START', '1') != '0'
+        self.zygote_path = self.bots_base_path / self.scheduler_folder / "zygotes"
+        self.zygote_preload_modules = [
+            'selenium.webdriver', 'gspread', 'google.oauth2.service_account',
+            'firebase_admin', 'firebase_admin.db', 'psutil', 'requests'
+        ]
+        self.bot_zygotes = {}
+        self.zygote_locks = {}
+        self.zygote_lock = threading.Lock()
+        
+        # Local state store - sheet writes are queued here and flushed in the background
+        self.state_db_path = self.bots_base_path / self.scheduler_folder / "scheduler state.db"
+        self.state_db = None
+        self.state_db_lock = threading.Lock()
+        self.sheet_flusher = None
+        self.flusher_gc = None
+        self.flusher_stop = threading.Event()
+        self.flush_event = threading.Event()
+        self.flush_interval = 5  # seconds between background sheet syncs
+        
+        # Metrics - Prometheus text format on localhost, bots push step timings over a datagram socket
+        self.metrics = SchedulerMetrics()
+        self.metrics_address = os.getenv('SCHEDULER_METRICS_ADDRESS', '127.0.0.1')
+        self.metrics_port = int(os.getenv('SCHEDULER_METRICS_PORT', '9108'))  # 0 disables the endpoint
+        self.metrics_socket = self.bots_base_path / self.scheduler_folder / "metrics.sock"
+        self.metrics_server = None
+        self.metrics_receiver = None
+        
+        # XPath service - database nodes the bots need, held in memory and served over a Unix socket
+        self.xpath_service_nodes = ["WhatsApp/Xpath", "Facebook/Xpath", "Facebook/URL", "Facebook/Color"]
+        self.xpath_service_socket = self.bots_base_path / self.scheduler_folder / "xpath.sock"
+        self.xpath_refresh_interval = 300  # seconds between ETag checks backing up the live listeners
+        self.xpath_nodes = {}  # node path -> {'value', 'etag', 'version', 'reply'}
+        self.xpath_nodes_lock = threading.Lock()
+        self.xpath_server = None
+        self.xpath_listeners = []
+        self.xpath_refresher = None
+        self.xpath_refresher_stop = threading.Event()
+        
+        # Multi-node mode - schedulers on several Pis claim bot runs through expiring leases
+        self.node_id = os.getenv('SCHEDULER_NODE_ID') or socket.gethostname()
+        self.lease_backend_name = os.getenv('SCHEDULER_LEASE_BACKEND', '').strip().lower()  # '', sheet, firebase or sqlite
+        self.lease_db_path = Path(os.getenv('SCHEDULER_LEASE_DB', str(self.bots_base_path / self.scheduler_folder / "leases.db")))
+        self.lease_backend = None  # None runs every bot on this node
+        self.lease_ttl = 120  # seconds a claim survives without renewal
+        self.lease_claim_delay = 5  # seconds of claim delay per bot already running here, so idle nodes claim first
+        self.held_leases = {}  # bot name -> run id claimed by this node
+        self.lost_leases = set()  # bots whose lease another node took over
+        self.lease_refusals = {}  # bot name -> (run id, holder, lease expiry or None once done)
+        self.claim_deadlines = {}  # bot name -> (run id, time this node may claim it)
+        self.lease_lock = threading.Lock()
+        self.lease_renewer = None
+        self.lease_renewer_stop = threading.Event()
+        
     def initialize_firebase(self):
         """Initialize Firebase connection using database access key from any bot (excluding scheduler)"""
         if self.firebase_initialized:
@@ -99,6 +932,7 @@ class BotScheduler:
             return False
         
         try:
+            import_firebase()
             cred = credentials.Certificate(str(source_key_file))
             firebase_admin.initialize_app(cred, {
                 "databaseURL": self.database_url
@@ -118,8 +952,10 @@ class BotScheduler:
             return False
             
         try:
-            ref = db.reference("WhatsApp/Xpath")
-            xpaths_data = ref.get()
+            # The XPath service already holds a live copy once it is running
+            with self.xpath_nodes_lock:
+                cached = self.xpath_nodes.get("WhatsApp/Xpath")
+            xpaths_data = cached['value'] if cached else db.reference("WhatsApp/Xpath").get()
             
             if xpaths_data:
                 self.xpaths = xpaths_data
@@ -152,19 +988,70 @@ class BotScheduler:
             return self.xpaths.get(xpath_key)
         return None
 
+    def get_cached_script(self, url, cache_name):
+        """Refresh a locally cached copy of a GitHub script with a conditional request - returns its path or None"""
+        self.launcher_cache_path.mkdir(parents=True, exist_ok=True)
+        script_file = self.launcher_cache_path / cache_name
+        etag_file = self.launcher_cache_path / f"{cache_name}.etag"
+        
+        headers = {}
+        if script_file.exists() and etag_file.exists():
+            headers["If-None-Match"] = etag_file.read_text().strip()
+        
+        try:
+            with self.metrics.time_request('github', 'script'):
+                response = self.get_http_session().get(url, headers=headers, timeout=60)
+            
+            if response.status_code == 304:
+                print(f"  ✓ Cached {cache_name} is up to date")
+                return script_file
+            
+            if response.status_code == 200:
+                # Only replace the cached copy with a version that compiles
+                compile(response.content, str(script_file), 'exec')
+                temp_file = script_file.with_name(script_file.name + ".tmp")
+                temp_file.write_bytes(response.content)
+                os.replace(temp_file, script_file)
+                if response.headers.get('ETag'):
+                    etag_file.write_text(response.headers['ETag'])
+                print(f"  ✓ Downloaded latest {cache_name}")
+                return script_file
+            
+            print(f"  ⚠ Could not download {cache_name}: HTTP {response.status_code}")
+            
+        except Exception as e:
+            print(f"  ⚠ Could not download {cache_name}: {e}")
+        
+        if script_file.exists():
+            print(f"  ⚠ Using cached copy of {cache_name}")
+            return script_file
+        return None
+
     def run_curl_command(self):
-        """Run the curl command to setup bots with LIVE output"""
-        print("Setting up bots using curl command...")
+        """Run the all-in-one installer from its locally cached copy with LIVE output"""
+        print("Setting up bots using the all-in-one installer...")
         try:
+            installer_url = "https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main/all-in-one-venv/all%20in%20one%20venv.py"
+            installer_file = (self.get_repository_file("all-in-one-venv/all in one venv.py")
+                              or self.get_cached_script(installer_url, "all in one venv.py"))
+            if not installer_file:
+                print("Error executing setup: installer not available offline")
+                sys.exit(0)
+            
             print("Starting bot installation... This may take several minutes.")
             print("=" * 60)
             
+            # The installer reads venv.sh files from the same snapshot instead of fetching them again
+            env = os.environ.copy()
+            if self.repository_snapshot is not None:
+                env['BOTS_REPOSITORY_SNAPSHOT'] = str(self.repository_snapshot)
+            
             process = subprocess.run(
-                'curl -sL "https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main/all-in-one-venv/all%20in%20one%20venv.py" | python3',
-                shell=True,
+                [sys.executable, str(installer_file)],
                 stdout=None,
                 stderr=None,
-                text=True
+                text=True,
+                env=env
             )
             
             print("=" * 60)
@@ -943,75 +1830,259 @@ class BotScheduler:
             self.missing_sheets = missing_sheets
             return True, False
 
-    def get_github_bot_folders(self):
-        """Get list of bot folders from GitHub repository"""
-        print("Fetching bot information from GitHub repository...")
+    def resolve_github_commit(self):
+        """Get the commit the branch points at - one small request, answered with 304 while it has not moved"""
+        state_file = self.repository_cache_path / "current.json"
+        state = {}
+        try:
+            state = json.loads(state_file.read_text())
+        except (OSError, ValueError):
+            pass
+        
+        headers = {"Accept": "application/vnd.github.sha"}
+        if state.get('etag'):
+            headers["If-None-Match"] = state['etag']
         
         try:
-            # Get the main repository structure
-            api_url = "https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents/"
-            response = requests.get(api_url, timeout=30)
-            
-            if response.status_code != 200:
-                print(f"Error accessing GitHub repository: {response.status_code}")
-                return []
-            
-            contents = response.json()
-            bot_folders = []
+            with self.metrics.time_request('github', 'commit'):
+                response = self.get_http_session().get(
+                    f"{self.github_api_base}/commits/{self.github_branch}", headers=headers, timeout=30)
+            
+            if response.status_code == 304 and state.get('sha'):
+                return state['sha']
+            
+            if response.status_code == 200:
+                state = {'sha': response.text.strip(), 'etag': response.headers.get('ETag')}
+                self.repository_cache_path.mkdir(parents=True, exist_ok=True)
+                temp_file = state_file.with_name(state_file.name + ".tmp")
+                temp_file.write_text(json.dumps(state))
+                os.replace(temp_file, state_file)
+                return state['sha']
+            
+            print(f"  ⚠ Could not resolve {self.github_branch} on GitHub: HTTP {response.status_code}")
+        except Exception as e:
+            print(f"  ⚠ Could not resolve {self.github_branch} on GitHub: {e}")
+        
+        # Offline - keep working from the last commit that was fetched
+        return state.get('sha')
+
+    def download_repository_tarball(self, sha, snapshot):
+        """Download the repository at one commit as a tarball and unpack it into snapshot"""
+        partial = snapshot.with_name(snapshot.name + ".partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        
+        try:
+            print(f"  Downloading repository snapshot {sha[:7]}...")
+            with self.metrics.time_request('github', 'tarball'):
+                response = self.get_http_session().get(
+                    f"{self.github_api_base}/tarball/{sha}", timeout=120, stream=True)
+                if response.status_code != 200:
+                    print(f"  ⚠ Repository download failed: HTTP {response.status_code}")
+                    return False
+                
+                file_count = 0
+                with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+                    for member in archive:
+                        # Drop the "<owner>-<repo>-<sha>/" folder every entry starts with
+                        name = member.name.split('/', 1)[1] if '/' in member.name else ''
+                        parts = Path(name).parts
+                        if not parts or name.startswith('/') or '..' in parts:
+                            continue
+                        target = partial.joinpath(*parts)
+                        if member.isdir():
+                            target.mkdir(parents=True, exist_ok=True)
+                        elif member.isfile():  # links and devices are never needed
+                            target.parent.mkdir(parents=True, exist_ok=True)
+                            with archive.extractfile(member) as source, open(target, 'wb') as destination:
+                                shutil.copyfileobj(source, destination)
+                            file_count += 1
+            
+            os.replace(partial, snapshot)
+            print(f"  ✓ Repository snapshot {sha[:7]} unpacked ({file_count} files)")
+            
+            # Older commits are no longer needed
+            for old in self.repository_cache_path.iterdir():
+                if old.is_dir() and old != snapshot:
+                    shutil.rmtree(old, ignore_errors=True)
+            return True
             
-            for item in contents:
-                if item['type'] == 'dir':
-                    folder_name = item['name']
-                    # Skip only non-bot folders
-                    if folder_name in ['all-in-one-venv', '.github']:
-                        continue
-                    
-                    # Check if this folder has 'sheets format' folder
-                    folder_url = f"https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents/{folder_name}"
-                    folder_response = requests.get(folder_url, timeout=30)
-                    
-                    if folder_response.status_code == 200:
-                        folder_contents = folder_response.json()
-                        has_sheets_format = any(content['name'] == 'sheets format' and content['type'] == 'dir' for content in folder_contents)
-                        
-                        if has_sheets_format:
-                            bot_folders.append(folder_name)
-                            print(f"  ✓ Found bot with sheets format: {folder_name}")
+        except Exception as e:
+            print(f"  ⚠ Repository download failed: {e}")
+            shutil.rmtree(partial, ignore_errors=True)
+            return False
+
+    def get_repository_snapshot(self):
+        """Get the local copy of the repository at the branch's current commit, downloading it once per commit"""
+        with self.repository_lock:
+            if self.repository_snapshot is not None:
+                return self.repository_snapshot
+            
+            sha = self.resolve_github_commit()
+            if not sha:
+                return None
             
-            print(f"{self.GREEN}✓ Found {len(bot_folders)} bots with sheets format on GitHub{self.ENDC}")
-            return bot_folders
+            snapshot = self.repository_cache_path / sha
+            if not snapshot.is_dir() and not self.download_repository_tarball(sha, snapshot):
+                return None
             
-        except Exception as e:
-            print(f"{self.RED}❌ Error fetching GitHub repository: {e}{self.ENDC}")
-            return []
+            self.repository_snapshot = snapshot
+            return snapshot
 
-    def get_csv_files_from_github(self, bot_folder_name):
-        """Get the list of CSV files from the 'sheets format' folder for a bot"""
+    def get_repository_file(self, path):
+        """Get the snapshot copy of a repository file, or None when it is not available"""
+        snapshot = self.get_repository_snapshot()
+        if snapshot is None:
+            return None
+        local_file = snapshot / path
+        return local_file if local_file.is_file() else None
+
+    def get_github_tree(self):
+        """Get the whole repository tree from the snapshot, or from the tree API revalidated with its ETag"""
+        if self.github_tree is not None:
+            return self.github_tree
+        
+        snapshot = self.get_repository_snapshot()
+        if snapshot is not None:
+            paths = {}
+            for root, dirs, files in os.walk(snapshot):
+                prefix = Path(root).relative_to(snapshot)
+                for name in dirs:
+                    paths[(prefix / name).as_posix()] = 'tree'
+                for name in files:
+                    paths[(prefix / name).as_posix()] = 'blob'
+            self.github_tree = {'etag': None, 'sha': snapshot.name, 'paths': paths}
+            return self.github_tree
+        
+        cached = None
+        if self.github_tree_cache_file.exists():
+            try:
+                with open(self.github_tree_cache_file, 'r') as f:
+                    cached = json.load(f)
+            except Exception as e:
+                print(f"  ⚠ Ignoring unreadable GitHub tree cache: {e}")
+        
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get('etag'):
+            headers["If-None-Match"] = cached['etag']
+        
         try:
-            # Try to get the directory listing from GitHub
-            api_url = f"https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents/{bot_folder_name}/sheets%20format"
-            response = requests.get(api_url, timeout=30)
+            api_url = f"{self.github_api_base}/git/trees/{self.github_branch}?recursive=1"
+            with self.metrics.time_request('github', 'tree'):
+                response = requests.get(api_url, headers=headers, timeout=30)
             
-            if response.status_code != 200:
-                print(f"  Error accessing sheets format for {bot_folder_name}: {response.status_code}")
-                return []
+            if response.status_code == 304 and cached:
+                print("  ✓ GitHub tree unchanged (ETag match), using cached tree")
+                self.github_tree = cached
+                return self.github_tree
             
-            contents = response.json()
-            csv_files = []
+            if response.status_code != 200:
+                print(f"Error accessing GitHub repository tree: {response.status_code}")
+                if cached:
+                    print("  ⚠ Using cached GitHub tree")
+                    self.github_tree = cached
+                return self.github_tree
+            
+            data = response.json()
+            if data.get('truncated'):
+                print(f"{self.YELLOW}  ⚠ GitHub tree listing was truncated{self.ENDC}")
+            
+            self.github_tree = {
+                'etag': response.headers.get('ETag'),
+                'sha': data.get('sha'),
+                'paths': {item['path']: item['type'] for item in data.get('tree', [])}
+            }
             
-            for item in contents:
-                if item['name'].endswith('.csv'):
-                    csv_files.append(item['name'])
-                    print(f"    - Found CSV: {item['name']}")
+            try:
+                self.github_tree_cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.github_tree_cache_file.with_name(self.github_tree_cache_file.name + ".tmp")
+                with open(temp_file, 'w') as f:
+                    json.dump(self.github_tree, f)
+                os.replace(temp_file, self.github_tree_cache_file)
+            except Exception as e:
+                print(f"  ⚠ Could not save GitHub tree cache: {e}")
             
-            return csv_files
+            print(f"  ✓ Fetched GitHub tree ({len(self.github_tree['paths'])} entries)")
+            return self.github_tree
             
         except Exception as e:
-            print(f"  Error getting sheets format for {bot_folder_name}: {e}")
+            print(f"{self.RED}❌ Error fetching GitHub repository tree: {e}{self.ENDC}")
+            if cached:
+                print("  ⚠ Using cached GitHub tree")
+                self.github_tree = cached
+            return self.github_tree
+
+    def get_github_path_type(self, path):
+        """Get 'tree' (folder), 'blob' (file) or None for a repository path from the cached tree"""
+        tree = self.get_github_tree()
+        if not tree:
+            return None
+        return tree['paths'].get(path)
+
+    def get_github_top_level_folders(self):
+        """Get the top-level folders of the repository, skipping non-bot folders"""
+        tree = self.get_github_tree()
+        if not tree:
+            return None
+        
+        return [
+            path for path, path_type in tree['paths'].items()
+            if path_type == 'tree' and '/' not in path and path not in ['all-in-one-venv', '.github']
+        ]
+
+    def get_github_bot_folders(self):
+        """Get list of bot folders from GitHub repository"""
+        print("Fetching bot information from GitHub repository...")
+        
+        folders = self.get_github_top_level_folders()
+        if folders is None:
+            return []
+        
+        bot_folders = []
+        for folder_name in folders:
+            # Check if this folder has 'sheets format' folder
+            if self.get_github_path_type(f"{folder_name}/sheets format") == 'tree':
+                bot_folders.append(folder_name)
+                print(f"  ✓ Found bot with sheets format: {folder_name}")
+        
+        print(f"{self.GREEN}✓ Found {len(bot_folders)} bots with sheets format on GitHub{self.ENDC}")
+        return bot_folders
+
+    def get_csv_files_from_github(self, bot_folder_name):
+        """Get the list of CSV files from the 'sheets format' folder for a bot"""
+        tree = self.get_github_tree()
+        if not tree:
+            print(f"  Error accessing sheets format for {bot_folder_name}: GitHub tree not available")
             return []
+        
+        prefix = f"{bot_folder_name}/sheets format/"
+        csv_files = []
+        for path, path_type in tree['paths'].items():
+            name = path[len(prefix):]
+            if path.startswith(prefix) and path_type == 'blob' and '/' not in name and name.endswith('.csv'):
+                csv_files.append(name)
+                print(f"    - Found CSV: {name}")
+        
+        return csv_files
+
+    def get_http_session(self):
+        """Get the shared pooled HTTP session used for GitHub downloads"""
+        if self.http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=self.download_workers
+            )
+            session.mount("https://", adapter)
+            self.http_session = session
+        return self.http_session
 
     def download_csv_header_with_retry(self, bot_folder_name, csv_file, max_retries=3):
         """Download only the header row from a CSV file with retry logic"""
+        local_file = self.get_repository_file(f"{bot_folder_name}/sheets format/{csv_file}")
+        if local_file is not None:
+            with open(local_file, newline='', encoding='utf-8') as f:
+                return next(csv.reader(f), [])
+        
         for attempt in range(1, max_retries + 1):
             try:
                 # URL encode the file name properly
@@ -1019,7 +2090,8 @@ class BotScheduler:
                 csv_url = f"{self.github_raw_base}/{bot_folder_name}/sheets%20format/{encoded_file}"
                 
                 print(f"    Download attempt {attempt} for {csv_file}...")
-                response = requests.get(csv_url, timeout=30)
+                with self.metrics.time_request('github', 'csv_header'):
+                    response = self.get_http_session().get(csv_url, timeout=30)
                 
                 if response.status_code == 200:
                     # Read only the first line (header)
@@ -1040,6 +2112,7 @@ class BotScheduler:
             
             # Wait before retrying (exponential backoff)
             if attempt < max_retries:
+                self.metrics.inc('scheduler_retries_total', "Retried operations", {'operation': 'csv_header'})
                 wait_time = 2 ** attempt  # 2, 4, 8 seconds
                 print(f"    Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
@@ -1071,44 +2144,71 @@ class BotScheduler:
             print(f"    Error accessing Google Sheet '{sheet_name}': {e}")
             return []
 
-    def compare_and_update_worksheet(self, sheet, worksheet_name, csv_header, gc):
-        """Compare CSV header with worksheet header and update if different"""
-        try:
-            # Check if worksheet exists
-            try:
-                worksheet = sheet.worksheet(worksheet_name)
-                worksheet_exists = True
-            except gspread.WorksheetNotFound:
-                worksheet_exists = False
-            
-            if worksheet_exists:
-                # Get current header
-                current_header = worksheet.row_values(1)
-                
-                # Compare headers
-                if current_header == csv_header:
-                    print(f"      ✓ Worksheet '{worksheet_name}' header matches CSV")
-                    return False  # No update needed
-                else:
-                    print(f"      ⚠ Worksheet '{worksheet_name}' header differs from CSV")
-                    print(f"        Current: {current_header}")
-                    print(f"        CSV: {csv_header}")
-                    
-                    # Update the header row
-                    worksheet.update(range_name='A1', values=[csv_header])
-                    print(f"      ✓ Updated worksheet '{worksheet_name}' header")
-                    return True  # Updated
-            else:
-                # Create new worksheet with CSV header
-                print(f"      ⚠ Creating missing worksheet: {worksheet_name}")
-                worksheet = sheet.add_worksheet(title=worksheet_name, rows=100, cols=len(csv_header))
-                worksheet.update(range_name='A1', values=[csv_header])
-                print(f"      ✓ Created worksheet '{worksheet_name}' with CSV header")
-                return True  # Created
-                
-        except Exception as e:
-            print(f"      ❌ Error updating worksheet '{worksheet_name}': {e}")
-            return False
+    def download_csv_headers_concurrently(self, jobs):
+        """Download CSV headers for many (bot folder, csv file) pairs at once through a bounded thread pool"""
+        headers = {}
+        if not jobs:
+            return headers
+        
+        print(f"  Downloading {len(jobs)} CSV header(s) with up to {self.download_workers} parallel downloads...")
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = {
+                executor.submit(self.download_csv_header_with_retry, bot_folder_name, csv_file): (bot_folder_name, csv_file)
+                for bot_folder_name, csv_file in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    headers[futures[future]] = future.result()
+                except Exception as e:
+                    print(f"    Error downloading {futures[future][1]}: {e}")
+                    headers[futures[future]] = None
+        
+        return headers
+
+    def quote_worksheet_title(self, worksheet_title):
+        """Quote a worksheet title for use in an A1 range"""
+        return "'" + worksheet_title.replace("'", "''") + "'"
+
+    def read_worksheet_headers(self, sheet):
+        """Read the header row of every worksheet in a spreadsheet with one values:batchGet"""
+        worksheet_titles = [worksheet.title for worksheet in sheet.worksheets()]
+        if not worksheet_titles:
+            return {}
+        
+        ranges = [f"{self.quote_worksheet_title(title)}!1:1" for title in worksheet_titles]
+        response = sheet.values_batch_get(ranges)
+        
+        headers = {}
+        for title, value_range in zip(worksheet_titles, response.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            headers[title] = values[0] if values else []
+        return headers
+
+    def apply_worksheet_header_fixes(self, sheet, missing_worksheets, header_fixes):
+        """Create missing worksheets in one batch request, then write all header fixes in one values batch"""
+        if missing_worksheets:
+            sheet.batch_update({
+                'requests': [
+                    {
+                        'addSheet': {
+                            'properties': {
+                                'title': worksheet_name,
+                                'gridProperties': {'rowCount': 100, 'columnCount': len(csv_header)}
+                            }
+                        }
+                    }
+                    for worksheet_name, csv_header in missing_worksheets.items()
+                ]
+            })
+        
+        if header_fixes:
+            sheet.values_batch_update({
+                'valueInputOption': 'RAW',
+                'data': [
+                    {'range': f"{self.quote_worksheet_title(worksheet_name)}!A1", 'values': [csv_header]}
+                    for worksheet_name, csv_header in header_fixes.items()
+                ]
+            })
 
     def run_step6(self):
         """Step 6: Compare CSV headers with Google Sheets and create/update worksheets"""
@@ -1153,6 +2253,7 @@ class BotScheduler:
             created_count = 0
             error_count = 0
             processed_bots = []
+            bot_jobs = []  # (local bot name, github bot, sheet, csv files)
             
             for github_bot in github_bots:
                 # Convert GitHub folder name to local folder name format
@@ -1180,33 +2281,65 @@ class BotScheduler:
                             continue
                         
                         print(f"  CSV files to process: {csv_files}")
-                        
-                        # Process each CSV file
-                        for csv_file in csv_files:
-                            worksheet_name = csv_file.replace('.csv', '')
-                            print(f"  Processing: {worksheet_name}")
-                            
-                            # Download CSV header from GitHub with retry logic
-                            csv_header = self.download_csv_header_with_retry(github_bot, csv_file)
-                            if not csv_header:
-                                print(f"    ✗ Failed to download header for {csv_file} after retries")
-                                error_count += 1
-                                continue
-                            
-                            print(f"    CSV Header: {csv_header}")
-                            
-                            # Compare and update worksheet
-                            if self.compare_and_update_worksheet(sheet, worksheet_name, csv_header, gc):
-                                if worksheet_name in [ws.title for ws in sheet.worksheets()]:
-                                    updated_count += 1
-                                else:
-                                    created_count += 1
+                        bot_jobs.append((local_bot_name, github_bot, sheet, csv_files))
                     
                     except Exception as e:
                         print(f"  ❌ Error processing bot '{local_bot_name}': {e}")
                         error_count += 1
                         continue
             
+            # Download every CSV header at once - the downloads overlap instead of queueing
+            print(f"\n{self.BOLD}Downloading CSV headers from GitHub...{self.ENDC}")
+            csv_headers = self.download_csv_headers_concurrently(
+                [(github_bot, csv_file) for _, github_bot, _, csv_files in bot_jobs for csv_file in csv_files]
+            )
+            
+            for local_bot_name, github_bot, sheet, csv_files in bot_jobs:
+                print(f"\n{self.BOLD}Comparing worksheets: {local_bot_name}{self.ENDC}")
+                
+                try:
+                    # One batchGet for the header rows of all worksheets in this spreadsheet
+                    current_headers = self.read_worksheet_headers(sheet)
+                    missing_worksheets = {}
+                    header_fixes = {}
+                    
+                    # Process each CSV file
+                    for csv_file in csv_files:
+                        worksheet_name = csv_file.replace('.csv', '')
+                        csv_header = csv_headers.get((github_bot, csv_file))
+                        if not csv_header:
+                            print(f"    ✗ Failed to download header for {csv_file} after retries")
+                            error_count += 1
+                            continue
+                        
+                        if worksheet_name not in current_headers:
+                            print(f"      ⚠ Creating missing worksheet: {worksheet_name}")
+                            missing_worksheets[worksheet_name] = csv_header
+                            header_fixes[worksheet_name] = csv_header
+                        elif current_headers[worksheet_name] == csv_header:
+                            print(f"      ✓ Worksheet '{worksheet_name}' header matches CSV")
+                        else:
+                            print(f"      ⚠ Worksheet '{worksheet_name}' header differs from CSV")
+                            print(f"        Current: {current_headers[worksheet_name]}")
+                            print(f"        CSV: {csv_header}")
+                            header_fixes[worksheet_name] = csv_header
+                    
+                    # Send all fixes for this spreadsheet together
+                    self.apply_worksheet_header_fixes(sheet, missing_worksheets, header_fixes)
+                    
+                    for worksheet_name in header_fixes:
+                        if worksheet_name in missing_worksheets:
+                            print(f"      ✓ Created worksheet '{worksheet_name}' with CSV header")
+                            created_count += 1
+                        else:
+                            print(f"      ✓ Updated worksheet '{worksheet_name}' header")
+                            updated_count += 1
+                
+                except Exception as e:
+                    print(f"  ❌ Error updating worksheets for '{local_bot_name}': {e}")
+                    error_count += 1
+                    continue
+
             # Summary
             print("\n" + "=" * 50)
             print("STEP 6 SUMMARY:")
@@ -1237,42 +2370,96 @@ class BotScheduler:
             print(f"{self.YELLOW}⚠ Continuing to next step despite Step 6 errors{self.ENDC}")
             return False, False
 
-    def check_internet_connection(self):
-        """Check internet connection using ping method"""
-        print("Checking internet connection...")
-        
-        ping_targets = ['8.8.8.8', '1.1.1.1', 'google.com']
-        
-        for target in ping_targets:
+    def probe_internet_connection(self):
+        """Probe connectivity in-process with short TCP connects - returns the target that answered, or None"""
+        for host, port in self.connectivity_targets:
             try:
-                if platform.system().lower() == 'windows':
-                    command = ['ping', '-n', '2', '-w', '5000', target]
-                else:
-                    command = ['ping', '-c', '2', '-W', '5', target]
-                
-                result = subprocess.run(
-                    command,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    print(f"  ✓ Internet connection available (ping to {target} successful)")
-                    return True
-                    
-            except subprocess.TimeoutExpired:
-                print(f"  ⚠ Ping to {target} timed out")
-                continue
-            except Exception as e:
-                print(f"  ⚠ Ping to {target} failed: {e}")
+                with socket.create_connection((host, port), timeout=self.connectivity_probe_timeout):
+                    return f"{host}:{port}"
+            except OSError:
                 continue
+        return None
+
+    def publish_connectivity_state(self, online, target):
+        """Store the latest probe result and share it with bots through the state file"""
+        now = time.time()
+        with self.connectivity_lock:
+            changed = online != self.internet_online
+            self.internet_online = online
+            self.internet_checked_at = now
+            if changed:
+                self.internet_changed_at = now
+            state = {
+                'online': online,
+                'target': target,
+                'checked_at': now,
+                'changed_at': self.internet_changed_at
+            }
+        
+        try:
+            self.connectivity_state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.connectivity_state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.connectivity_state_file)
+        except Exception:
+            pass
+        
+        if changed:
+            self.connectivity_changed.set()
+
+    def run_connectivity_monitor(self):
+        """Background thread - probe connectivity, backing off from 1s while offline up to the online interval"""
+        offline_delay = 1
+        while True:
+            target = self.probe_internet_connection()
+            self.publish_connectivity_state(target is not None, target)
+            
+            if target is not None:
+                offline_delay = 1
+                delay = self.connectivity_interval
+            else:
+                delay = offline_delay
+                offline_delay = min(offline_delay * 2, self.connectivity_interval)
+            
+            time.sleep(delay)
+
+    def start_connectivity_monitor(self):
+        """Start the shared connectivity monitor thread once"""
+        with self.connectivity_lock:
+            if self.connectivity_monitor is not None:
+                return
+            self.connectivity_monitor = threading.Thread(target=self.run_connectivity_monitor, name="connectivity-monitor")
+            self.connectivity_monitor.daemon = True
+        self.connectivity_monitor.start()
+
+    def check_internet_connection(self):
+        """Check internet connection using the cached state of the connectivity monitor"""
+        print("Checking internet connection...")
+        
+        self.start_connectivity_monitor()
+        
+        with self.connectivity_lock:
+            checked_at = self.internet_checked_at
+        
+        # No fresh result yet (first call or monitor stalled) - probe once in-process
+        if checked_at is None or time.time() - checked_at > 2 * self.connectivity_interval:
+            target = self.probe_internet_connection()
+            self.publish_connectivity_state(target is not None, target)
+        
+        with self.connectivity_lock:
+            online = self.internet_online
+            age = time.time() - self.internet_checked_at
+        
+        if online:
+            print(f"  ✓ Internet connection available (checked {age:.0f}s ago)")
+            return True
         
         print("  ✗ No internet connection available")
         return False
 
     def wait_for_internet_connection(self):
-        """Wait for internet connection to become available, checking every 2 seconds"""
+        """Wait for internet connection to become available, re-checking every 2 seconds or when it changes"""
         print(f"{self.YELLOW}Waiting for internet connection...{self.ENDC}")
         print("Checking every 2 seconds. Press Ctrl+C to cancel.")
         
@@ -1280,6 +2467,7 @@ class BotScheduler:
         try:
             while True:
                 check_count += 1
+                self.connectivity_changed.clear()
                 
                 if self.check_internet_connection():
                     print(f"{self.GREEN}✓ Internet connection established!{self.ENDC}")
@@ -1288,7 +2476,7 @@ class BotScheduler:
                 dots = "." * (check_count % 4)
                 spaces = " " * (3 - len(dots))
                 print(f"\rWaiting for internet{dots}{spaces} (Attempt {check_count})", end="", flush=True)
-                time.sleep(2)
+                self.connectivity_changed.wait(2)
                 
         except KeyboardInterrupt:
             print(f"\n\n{self.RED}Operation cancelled by user.{self.ENDC}")
@@ -1329,6 +2517,7 @@ class BotScheduler:
         print("Setting up Selenium WebDriver...")
         
         try:
+            import_selenium()
             options = Options()
             options.add_argument(f"--user-data-dir={self.chrome_profile}")
             options.add_argument("--no-sandbox")
@@ -1624,63 +2813,31 @@ class BotScheduler:
 
     def check_github_bot_requirements(self, bot_folder_name):
         """Check if a GitHub bot folder has all required files (venv.sh, sheets format folder, README.md)"""
-        try:
-            # Check if bot folder exists on GitHub
-            api_url = f"https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents/{bot_folder_name}"
-            response = requests.get(api_url, timeout=30)
-            
-            if response.status_code != 200:
-                return False
-            
-            contents = response.json()
-            
-            # Check for required files/folders
-            has_venv_sh = any(content['name'] == 'venv.sh' and content['type'] == 'file' for content in contents)
-            has_sheets_format = any(content['name'] == 'sheets format' and content['type'] == 'dir' for content in contents)
-            has_readme = any(content['name'] == 'README.md' and content['type'] == 'file' for content in contents)
-            
-            return has_venv_sh and has_sheets_format and has_readme
-            
-        except Exception as e:
-            print(f"  Error checking requirements for {bot_folder_name}: {e}")
-            return False
+        has_venv_sh = self.get_github_path_type(f"{bot_folder_name}/venv.sh") == 'blob'
+        has_sheets_format = self.get_github_path_type(f"{bot_folder_name}/sheets format") == 'tree'
+        has_readme = self.get_github_path_type(f"{bot_folder_name}/README.md") == 'blob'
+        
+        return has_venv_sh and has_sheets_format and has_readme
 
     def get_completed_github_bots(self):
         """Get list of completed bots from GitHub that have all required files"""
         print("Fetching completed bots from GitHub repository...")
         
-        try:
-            # Get the main repository structure
-            api_url = "https://api.github.com/repos/Thaniyanki/raspberry-pi-bots/contents/"
-            response = requests.get(api_url, timeout=30)
-            
-            if response.status_code != 200:
-                print(f"Error accessing GitHub repository: {response.status_code}")
-                return []
-            
-            contents = response.json()
-            completed_bots = []
-            
-            for item in contents:
-                if item['type'] == 'dir':
-                    folder_name = item['name']
-                    # Skip non-bot folders
-                    if folder_name in ['all-in-one-venv', '.github']:
-                        continue
-                    
-                    # Check if this bot has all required files
-                    if self.check_github_bot_requirements(folder_name):
-                        completed_bots.append(folder_name)
-                        print(f"  ✓ Completed bot: {folder_name}")
-                    else:
-                        print(f"  ⚠ Incomplete bot (missing files): {folder_name}")
-            
-            print(f"{self.GREEN}✓ Found {len(completed_bots)} completed bots on GitHub{self.ENDC}")
-            return completed_bots
-            
-        except Exception as e:
-            print(f"{self.RED}❌ Error fetching GitHub repository: {e}{self.ENDC}")
+        folders = self.get_github_top_level_folders()
+        if folders is None:
             return []
+        
+        completed_bots = []
+        for folder_name in folders:
+            # Check if this bot has all required files
+            if self.check_github_bot_requirements(folder_name):
+                completed_bots.append(folder_name)
+                print(f"  ✓ Completed bot: {folder_name}")
+            else:
+                print(f"  ⚠ Incomplete bot (missing files): {folder_name}")
+        
+        print(f"{self.GREEN}✓ Found {len(completed_bots)} completed bots on GitHub{self.ENDC}")
+        return completed_bots
 
     def convert_github_to_local_name(self, github_name):
         """Convert GitHub bot name to local bot name format"""
@@ -1702,20 +2859,25 @@ class BotScheduler:
             # This is more compatible than bash <(curl) syntax
             temp_script = Path("/tmp/install_bot.sh")
             
-            # Download the script first
-            download_cmd = f'curl -sL {venv_sh_url} -o {temp_script}'
-            print(f"Downloading script: {download_cmd}")
-            
-            download_process = subprocess.run(
-                download_cmd,
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-            
-            if download_process.returncode != 0:
-                print(f"{self.RED}❌ Failed to download script: {download_process.stderr}{self.ENDC}")
-                return False
+            # Take the script from the repository snapshot, downloading it only when that is unavailable
+            snapshot_script = self.get_repository_file(f"{github_bot_name}/venv.sh")
+            if snapshot_script is not None:
+                print(f"Using venv.sh from repository snapshot {self.repository_snapshot.name[:7]}")
+                shutil.copyfile(snapshot_script, temp_script)
+            else:
+                download_cmd = f'curl -sL {venv_sh_url} -o {temp_script}'
+                print(f"Downloading script: {download_cmd}")
+                
+                download_process = subprocess.run(
+                    download_cmd,
+                    shell=True,
+                    capture_output=True,
+                    text=True
+                )
+                
+                if download_process.returncode != 0:
+                    print(f"{self.RED}❌ Failed to download script: {download_process.stderr}{self.ENDC}")
+                    return False
             
             # Make the script executable
             chmod_process = subprocess.run(
@@ -2063,6 +3225,11 @@ class BotScheduler:
             print(f"{self.RED}❌ Error in Step 8: {e}{self.ENDC}")
             return True, []
 
+    def get_available_sheets(self):
+        """The sheets found by step 4 - background re-validation swaps in a new list under startup_state_lock"""
+        with self.startup_state_lock:
+            return getattr(self, 'available_sheets', [])
+
     def get_valid_bot_names(self):
         """Get valid bot names that exist in both local folders and Google Sheets (case-sensitive)"""
         local_bot_folders = self.get_bot_folders()
@@ -2081,51 +3248,163 @@ class BotScheduler:
         
         return valid_bots
 
+    def read_scheduler_values(self, worksheet):
+        """Read the used rows of the scheduler sheet - pages of scheduler_page_rows rows, fetched in one batch request"""
+        row_count = max(getattr(worksheet, 'row_count', 0) or 0, 1)
+        page_rows = self.scheduler_page_rows
+        # Rows used at the last read plus a page for new ones - the whole grid only on the first read
+        first_row = 1
+        last_row = min(row_count, self.scheduler_used_rows + page_rows) if self.scheduler_used_rows else row_count
+        
+        values = []
+        while True:
+            starts = range(first_row, last_row + 1, page_rows)
+            ranges = [f"{start}:{min(start + page_rows - 1, last_row)}" for start in starts]
+            with self.metrics.time_request('sheets', 'read'):
+                pages = worksheet.batch_get(ranges)
+            for start, page_values in zip(starts, pages):
+                values.extend(list(row) for row in page_values)
+                # Sheets drops trailing blank rows of each range - pad so row numbers stay aligned
+                values.extend([] for _ in range(min(start + page_rows - 1, last_row) - start + 1 - len(page_values)))
+            
+            # Data reaching the end of the read may go on past it
+            if last_row >= row_count or not values or not any(cell.strip() for cell in values[-1]):
+                break
+            first_row, last_row = last_row + 1, min(row_count, 2 * last_row)
+        
+        while values and not any(cell.strip() for cell in values[-1]):
+            values.pop()
+        self.scheduler_used_rows = len(values)
+        return values
+
+    def parse_scheduler_rows(self, headers, rows):
+        """Map rows to dicts by header name - rows unchanged since the last read reuse their parsed dict"""
+        previous = self.scheduler_parsed_rows
+        parsed = {}
+        data = []
+        for row in rows:
+            key = (tuple(headers), tuple(row))
+            row_dict = previous.get(key)
+            if row_dict is None:
+                row_dict = dict(zip(headers, row + [''] * (len(headers) - len(row))))
+            parsed[key] = row_dict
+            data.append(row_dict)
+        self.scheduler_parsed_rows = parsed
+        return data
+
     def get_scheduler_data(self, gc):
-        """Get scheduler data from Google Sheets - MODIFIED: Only read first 30 rows and up to column S"""
+        """Get scheduler data from Google Sheets - every row, columns mapped by header name"""
         try:
             # Check if scheduler sheet exists
-            sheet_names = [sheet['name'] for sheet in self.available_sheets]
+            sheet_names = [sheet['name'] for sheet in self.get_available_sheets()]
             if "scheduler" not in sheet_names:
                 return None
             
             # Open scheduler sheet
-            sheet = gc.open("scheduler")
+            with self.metrics.time_request('sheets', 'open'):
+                sheet = gc.open("scheduler")
             worksheet = sheet.sheet1
             
-            # MODIFIED: Only read first 30 rows and columns up to S (19 columns)
-            # Get data from row 1 (header) to row 30, columns A to S
-            data_range = "A1:S30"
-            data_values = worksheet.get(data_range)
-            
+            data_values = self.read_scheduler_values(worksheet)
             if not data_values:
                 return None
             
-            # Convert to list of dictionaries
             headers = data_values[0]  # First row is headers
             rows = data_values[1:]   # Remaining rows are data
-            
-            # Ensure we have exactly 19 columns (A to S)
-            if len(headers) < 19:
-                # Pad headers if needed
-                headers.extend([''] * (19 - len(headers)))
-            
-            data = []
-            for row in rows:
-                # Ensure each row has exactly 19 columns
-                if len(row) < 19:
-                    row.extend([''] * (19 - len(row)))
-                
-                row_dict = dict(zip(headers, row))
-                data.append(row_dict)
-            
-            print(f"  ✓ Read {len(data)} rows from scheduler sheet (first 30 rows, columns A-S)")
+            data = self.parse_scheduler_rows(headers, rows)
+
+            # Rebuild the row index from this snapshot so writes skip the re-read
+            self.index_scheduler_rows(worksheet, headers, rows)
+
+            print(f"  ✓ Read {len(data)} rows from scheduler sheet ({len(headers)} columns)")
             return data
             
         except Exception as e:
             print(f"Error accessing scheduler sheet: {e}")
             return None
 
+    def get_scheduler_revision(self, drive):
+        """Get the scheduler spreadsheet's (modifiedTime, version) from Drive - a cheap call compared to a full read"""
+        scheduler_sheet = next((sheet for sheet in self.get_available_sheets() if sheet['name'] == "scheduler"), None)
+        if not scheduler_sheet:
+            return None
+        
+        try:
+            with self.metrics.time_request('drive', 'revision'):
+                metadata = drive.files().get(
+                    fileId=scheduler_sheet['id'],
+                    fields="modifiedTime, version"
+                ).execute()
+            return metadata.get('modifiedTime'), metadata.get('version')
+        except Exception as e:
+            print(f"\n  ⚠ Could not read scheduler revision from Drive: {e}")
+            return None
+
+    def fetch_scheduler_rows(self, gc, drive):
+        """Get the scheduler sheet rows, re-reading the sheet only when its Drive revision changed or a full read is due"""
+        now = time.monotonic()
+        revision = self.get_scheduler_revision(drive)
+        full_read_due = self.last_full_read is None or now - self.last_full_read >= self.full_read_interval
+        
+        if (revision is not None and revision == self.scheduler_revision
+                and not full_read_due and self.cached_schedule_data is not None):
+            print(f"  ✓ Scheduler sheet unchanged (revision {revision[1]}), using cached rows")
+            return self.cached_schedule_data
+        
+        if full_read_due:
+            # Scan the whole grid again, catching rows added below blank ones
+            self.scheduler_used_rows = 0
+        
+        write_generation = self.sheet_write_generation
+        data = self.get_scheduler_data(gc)
+        with self.schedule_cache_lock:
+            if (data is not None and write_generation != self.sheet_write_generation
+                    and self.cached_schedule_data is not None):
+                # Queued changes reached the sheet mid-read - keep the merged cache and re-read on the next poll
+                self.scheduler_revision = None
+                return self.cached_schedule_data
+            if data is not None:
+                self.cached_schedule_data = data
+                self.scheduler_revision = revision
+                self.last_full_read = now
+            cached = self.cached_schedule_data
+        
+        if data is not None:
+            self.store_schedule_rows(data)
+            return data
+        
+        # Sheets unreachable - keep scheduling from the last rows stored locally
+        data = cached or self.load_schedule_rows()
+        if data is None:
+            return None
+        print(f"  ⚠ Using locally stored scheduler rows ({len(data)} bots)")
+        with self.schedule_cache_lock:
+            if self.cached_schedule_data is None:
+                self.cached_schedule_data = data
+        return data
+
+    def get_scheduler_data_if_changed(self, gc, drive):
+        """Get scheduler data with unsent local changes applied, re-reading the sheet only when it changed"""
+        data = self.fetch_scheduler_rows(gc, drive)
+        if data is None:
+            return None
+        return self.apply_local_state(data)
+
+    def merge_cached_schedule_rows(self, values_by_bot):
+        """Apply values just written to the sheet to the cached rows, so they still count once dropped from the queue"""
+        with self.schedule_cache_lock:
+            self.sheet_write_generation += 1
+            if self.cached_schedule_data is None:
+                return
+            merged = []
+            for row in self.cached_schedule_data:
+                bot_name = row.get('bots name', '').strip()
+                if bot_name in values_by_bot:
+                    row = dict(row)
+                    row.update(values_by_bot[bot_name])
+                merged.append(row)
+            self.cached_schedule_data = merged
+
     def format_schedule_display(self, schedule_data, valid_bots):
         """Format the schedule display for terminal output including status, last_run, and remark"""
         # Get current day
@@ -2241,25 +3520,6 @@ class BotScheduler:
         if countdown is not None and check_count is not None:
             print(f"{day} {date} | Check #{check_count} | Next sync: {countdown:02d}s")
 
-    def get_bot_main_script(self, bot_folder):
-        """Get the main Python script for a bot folder"""
-        bot_path = self.bots_base_path / bot_folder
-        
-        # Look for main Python files
-        python_files = list(bot_path.glob("*.py"))
-        
-        # Prioritize files that look like main scripts
-        main_scripts = []
-        for py_file in python_files:
-            if py_file.name != "scheduler.py" and not py_file.name.startswith('test'):
-                main_scripts.append(py_file)
-        
-        if main_scripts:
-            # Return the first main script found
-            return main_scripts[0]
-        
-        return None
-
     def is_bot_running(self, bot_name):
         """Check if a bot is currently running - FIXED to prevent false positives"""
         if bot_name not in self.bot_processes:
@@ -2277,50 +3537,6 @@ class BotScheduler:
             self.bot_processes[bot_name] = None
             return False
 
-    def start_bot(self, bot_name):
-        """Start a bot process"""
-        if self.is_bot_running(bot_name):
-            print(f"  ⚠ {bot_name} is already running")
-            return True
-        
-        try:
-            bot_folder = self.bots_base_path / bot_name
-            main_script = self.get_bot_main_script(bot_name)
-            
-            if not main_script:
-                print(f"  ✗ No main script found for {bot_name}")
-                return False
-            
-            # Get venv path
-            venv_path = self.get_venv_path(bot_folder)
-            if not venv_path:
-                print(f"  ✗ No venv found for {bot_name}")
-                return False
-            
-            # Activate venv and run the bot
-            python_executable = venv_path / "bin" / "python3"
-            
-            if not python_executable.exists():
-                print(f"  ✗ Python executable not found for {bot_name}")
-                return False
-            
-            # Start the bot process
-            process = subprocess.Popen(
-                [str(python_executable), str(main_script)],
-                cwd=str(bot_folder),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            self.bot_processes[bot_name] = process
-            print(f"  ✓ Started {bot_name}")
-            return True
-            
-        except Exception as e:
-            print(f"  ✗ Error starting {bot_name}: {e}")
-            return False
-
     def stop_bot(self, bot_name):
         """Stop a bot process"""
         if not self.is_bot_running(bot_name):
@@ -2370,41 +3586,133 @@ class BotScheduler:
         
         return None
 
+    def parse_schedule_time(self, time_str):
+        """Parse a schedule cell into a time object, caching the result per cell value"""
+        if time_str in self.parsed_time_cache:
+            return self.parsed_time_cache[time_str]
+        
+        time_norm = self.normalize_time_format(time_str)
+        parsed = None
+        if time_norm:
+            try:
+                parsed = datetime.strptime(time_norm, "%H:%M").time()
+            except ValueError:
+                parsed = None
+        
+        self.parsed_time_cache[time_str] = parsed
+        return parsed
+
     def check_time_in_range(self, start_time, stop_time):
         """Check if current time is between start_time and stop_time - FIXED VERSION"""
-        current_time = datetime.now().strftime("%H:%M")
+        current_t = datetime.now().replace(second=0, microsecond=0).time()
         
-        # Normalize time formats
-        start_time_norm = self.normalize_time_format(start_time)
-        stop_time_norm = self.normalize_time_format(stop_time)
+        # Parsed times are cached, so repeated checks of the same cells are cheap
+        start_t = self.parse_schedule_time(start_time)
+        stop_t = self.parse_schedule_time(stop_time)
         
-        if not start_time_norm or not stop_time_norm:
+        if not start_t or not stop_t:
             print(f"  ⚠ Invalid time format: start='{start_time}', stop='{stop_time}'")
             return False
         
-        print(f"  Time Check: Current={current_time}, Start={start_time_norm}, Stop={stop_time_norm}")
+        # Handle overnight schedules (stop time < start time)
+        if stop_t < start_t:
+            # Overnight: current time should be >= start_time OR <= stop_time
+            return current_t >= start_t or current_t <= stop_t
+        else:
+            # Normal: current time should be between start_time and stop_time
+            return start_t <= current_t <= stop_t
+
+    def build_schedule_timeline(self, schedule_data, valid_bots):
+        """Compile the weekly start/stop columns into a heap of upcoming events - only rebuilt when the sheet changes"""
+        now = datetime.now()
         
-        try:
-            # Convert to time objects for proper comparison
-            current_t = datetime.strptime(current_time, "%H:%M").time()
-            start_t = datetime.strptime(start_time_norm, "%H:%M").time()
-            stop_t = datetime.strptime(stop_time_norm, "%H:%M").time()
-            
-            # Handle overnight schedules (stop time < start time)
-            if stop_t < start_t:
-                # Overnight: current time should be >= start_time OR <= stop_time
-                result = current_t >= start_t or current_t <= stop_t
-                print(f"  Overnight schedule: {result}")
-                return result
-            else:
-                # Normal: current time should be between start_time and stop_time
-                result = start_t <= current_t <= stop_t
-                print(f"  Normal schedule: {result}")
-                return result
-                
-        except ValueError as e:
-            print(f"  ⚠ Time parsing error: {e}")
+        column_names = [column for columns in self.weekday_columns for column in columns]
+        signature = []
+        for row in schedule_data:
+            bot_name = row.get('bots name', '').strip()
+            if bot_name in valid_bots:
+                times = tuple(row.get(column, '').strip() for column in column_names)
+                signature.append((bot_name, row.get('switch', '').strip().lower(), times))
+        signature = tuple(signature)
+        
+        if signature == self.timeline_signature and self.timeline_date == now.date():
             return False
+        
+        timeline = []
+        for bot_name, switch, times in signature:
+            if switch != 'on':
+                continue
+            
+            row_times = dict(zip(column_names, times))
+            # One day back catches overnight windows that started yesterday
+            for day_offset in range(-1, 8):
+                day = now.date() + timedelta(days=day_offset)
+                start_col, stop_col = self.weekday_columns[day.weekday()]
+                start_t = self.parse_schedule_time(row_times[start_col])
+                stop_t = self.parse_schedule_time(row_times[stop_col])
+                if not start_t or not stop_t:
+                    continue
+                
+                start_at = datetime.combine(day, start_t)
+                stop_at = datetime.combine(day, stop_t)
+                if stop_at < start_at:
+                    stop_at += timedelta(days=1)
+                
+                if start_at > now:
+                    timeline.append((start_at, 'start', bot_name))
+                if stop_at > now:
+                    # Wake just after the stop minute, when the time check turns false
+                    timeline.append((stop_at + timedelta(minutes=1), 'stop', bot_name))
+        
+        heapq.heapify(timeline)
+        self.schedule_timeline = timeline
+        self.timeline_signature = signature
+        self.timeline_date = now.date()
+        return True
+
+    def get_next_schedule_event(self):
+        """Get the next upcoming (event time, event kind, bot name), dropping events already passed"""
+        now = datetime.now()
+        while self.schedule_timeline and self.schedule_timeline[0][0] <= now:
+            heapq.heappop(self.schedule_timeline)
+        return self.schedule_timeline[0] if self.schedule_timeline else None
+
+    def get_seconds_until_next_sync(self):
+        """Seconds to sleep until the next schedule event - sheet changes and finished bots wake the loop earlier"""
+        now = datetime.now()
+        # With nothing scheduled, still wake at midnight to rebuild the timeline for the new day
+        wake_at = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        next_event = self.get_next_schedule_event()
+        if next_event:
+            wake_at = min(wake_at, next_event[0])
+        wait_seconds = max((wake_at - now).total_seconds(), 0)
+        
+        # Wake when a delayed claim becomes due or another node's lease runs out
+        with self.lease_lock:
+            lease_times = [deadline for _, deadline in self.claim_deadlines.values()]
+            lease_times += [expires_at for _, _, expires_at in self.lease_refusals.values() if expires_at]
+        # ... and when a failed bot's retry backoff ends
+        with self.worker_lock:
+            lease_times += [retry_at for retry_at, _ in self.bot_retry_after.values()]
+        now = time.time()
+        for lease_time in lease_times:
+            if lease_time > now:
+                wait_seconds = min(wait_seconds, lease_time - now)
+        return wait_seconds
+
+    async def wait_for_next_sync(self, day, date, check_count, wait_seconds):
+        """Countdown until the next sync, waking exactly at the deadline or when a bot worker finishes"""
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            print(f"\r{day} {date} | Check #{check_count} | Next sync: {int(remaining + 0.999):02d}s", end="", flush=True)
+            # A finishing bot worker cuts the wait short - without a terminal there is no countdown to tick
+            if await self.scheduler_wakeup.wait_async(min(1, remaining) if self.show_countdown else remaining):
+                self.scheduler_wakeup.clear()
+                break
+        print("\r" + " " * 80 + "\r", end="", flush=True)
 
     def check_remark_and_last_run(self, remark, last_run):
         """Check remark and last_run conditions for step 9b - FIXED VERSION"""
@@ -2436,7 +3744,7 @@ class BotScheduler:
         return False
 
     def sync_bots_with_schedule(self, schedule_data, valid_bots):
-        """Sync bot processes with current schedule - FIXED to use same logic as step 9a-9d"""
+        """Stop bot processes left running outside their scheduled window - bots are only started by steps 9a-9d"""
         current_day = datetime.now().strftime("%A").lower()
         
         # Map day names to column names
@@ -2457,6 +3765,10 @@ class BotScheduler:
         
         # Process each valid bot
         for bot_name in valid_bots:
+            # Bots running on a worker are managed by execute_steps_9a_to_9d, which enforces their stop time
+            if self.is_bot_worker_active(bot_name) or not self.is_bot_running(bot_name):
+                continue
+            
             # Find bot schedule
             bot_schedule = None
             for row in schedule_data:
@@ -2464,36 +3776,20 @@ class BotScheduler:
                     bot_schedule = {
                         'start_at': row.get(start_col, '').strip(),
                         'stop_at': row.get(stop_col, '').strip(),
-                        'switch': row.get('switch', '').strip().lower(),
-                        'remark': row.get('remark', '').strip(),
-                        'last_run': row.get('last_run', '').strip()
+                        'switch': row.get('switch', '').strip().lower()
                     }
                     break
             
             if not bot_schedule:
                 continue
             
-            # Use the same logic as step 9a-9d to determine if bot should run
-            should_run = False
-            
-            # Step 9a: Check if current time is between start_at and stop_at
-            if self.check_time_in_range(bot_schedule['start_at'], bot_schedule['stop_at']):
-                # Step 9a: Check switch column
-                if bot_schedule['switch'] == 'on':
-                    # Step 9b: Check remark and last_run - FIXED LOGIC
-                    should_continue = self.check_remark_and_last_run(bot_schedule['remark'], bot_schedule['last_run'])
-                    should_run = should_continue
-            
-            is_running = self.is_bot_running(bot_name)
-            
-            # Only take action if there's a mismatch between desired state and actual state
-            if should_run and not is_running:
-                print(f"  Starting {bot_name} (scheduled to run)")
-                self.start_bot(bot_name)
-            elif not should_run and is_running:
-                print(f"  Stopping {bot_name} (not in scheduled time or already executed)")
+            # Starting is left to steps 9a-9d, which apply the parallel limit, resource locks,
+            # leases, deadlines and resource limits and record the run
+            in_window = (bot_schedule['switch'] == 'on'
+                         and self.check_time_in_range(bot_schedule['start_at'], bot_schedule['stop_at']))
+            if not in_window:
+                print(f"  Stopping {bot_name} (not in scheduled time or switched off)")
                 self.stop_bot(bot_name)
-            # If state matches desired state, no action needed
 
     def update_local_status(self, bot_name, status):
         """Update bot status in local schedule data"""
@@ -2509,119 +3805,1188 @@ class BotScheduler:
             print(f"  ✓ Updated local last_run for {bot_name}: {last_run}")
             print(f"  ✓ Updated local remark for {bot_name}: {remark}")
 
-    def update_google_sheet_status(self, gc, bot_name, status, max_retries=3):
-        """Update bot status in Google Sheet with retry logic - MODIFIED: Only update first 30 rows"""
+    def index_scheduler_rows(self, worksheet, headers, rows):
+        """Cache the worksheet handle, headers and bot name -> row index from a sheet snapshot"""
+        with self.sheet_lock:
+            self.scheduler_worksheet = worksheet
+            self.scheduler_headers = [header.strip() for header in headers]
+            self.scheduler_row_index = {}
+            name_column = self.scheduler_headers.index('bots name') if 'bots name' in self.scheduler_headers else 0
+            for i, row in enumerate(rows, start=2):  # start=2 because row 1 is header
+                if len(row) > name_column and row[name_column].strip():
+                    self.scheduler_row_index.setdefault(row[name_column].strip(), i)
+
+    def invalidate_scheduler_index(self):
+        """Drop the cached row index so the next write re-reads the scheduler sheet"""
+        self.scheduler_worksheet = None
+        self.scheduler_headers = []
+        self.scheduler_row_index = {}
+
+    def refresh_scheduler_index(self, gc):
+        """Re-read the scheduler sheet once to rebuild the row index"""
+        with self.metrics.time_request('sheets', 'open'):
+            worksheet = gc.open("scheduler").sheet1
+        data_values = self.read_scheduler_values(worksheet)
+        if not data_values:
+            self.invalidate_scheduler_index()
+            return False
+        self.index_scheduler_rows(worksheet, data_values[0], data_values[1:])
+        return True
+
+    def get_scheduler_column(self, column_name):
+        """Get the 1-based column number for a scheduler header, or None if the sheet has no such column"""
+        if column_name in self.scheduler_headers:
+            return self.scheduler_headers.index(column_name) + 1
+        return None
+
+    def write_scheduler_rows(self, gc, updates, max_retries=3):
+        """Write scheduler columns for several bot rows in one batch_update - returns (written, missing) or None"""
         for attempt in range(1, max_retries + 1):
             try:
-                sheet = gc.open("scheduler")
-                worksheet = sheet.sheet1
-                
-                # MODIFIED: Only search in first 30 rows
-                # Get data from first 30 rows
-                data_range = "A1:S30"
-                data_values = worksheet.get(data_range)
-                
-                if not data_values:
-                    print(f"  ✗ No data found in scheduler sheet")
-                    return False
-                
-                headers = data_values[0]
-                rows = data_values[1:]
+                with self.sheet_lock:
+                    cached = self.scheduler_worksheet is not None and all(
+                        bot_name in self.scheduler_row_index for bot_name in updates
+                    )
+                if not cached:
+                    self.refresh_scheduler_index(gc)
                 
-                # Find the row for this bot in first 30 rows
-                for i, row in enumerate(rows, start=2):  # start=2 because row 1 is header
-                    if i > 31:  # Only check up to row 31 (30 data rows + 1 header)
-                        break
-                        
-                    if len(row) > 0 and row[0].strip() == bot_name:
-                        # Update status column (column Q, which is index 16 in 0-based)
-                        status_col_index = 16  # Q is 17th column, 0-based index is 16
-                        
-                        # Ensure we have enough columns
-                        if len(row) <= status_col_index:
-                            # Need to extend the row
-                            row.extend([''] * (status_col_index - len(row) + 1))
+                with self.sheet_lock:
+                    data = []
+                    written = []
+                    missing = []
+                    for bot_name, values in updates.items():
+                        row_number = self.scheduler_row_index.get(bot_name)
+                        if not row_number:
+                            print(f"  ✗ Bot {bot_name} not found in scheduler sheet")
+                            missing.append(bot_name)
+                            continue
                         
-                        # Update the cell
-                        worksheet.update_cell(i, status_col_index + 1, status)  # +1 because worksheet is 1-based
-                        print(f"  ✓ Updated Google Sheet status for {bot_name}: {status}")
-                        return True
-                
-                print(f"  ✗ Bot {bot_name} not found in first 30 rows of scheduler sheet")
-                return False
+                        written.append(bot_name)
+                        for column_name, value in values.items():
+                            column = self.get_scheduler_column(column_name)
+                            if column is None:
+                                print(f"  ✗ Scheduler sheet has no '{column_name}' column")
+                                continue
+                            cell = rowcol_to_a1(row_number, column)
+                            data.append({'range': cell, 'values': [[value]]})
+                    
+                    if data:
+                        with self.metrics.time_request('sheets', 'write'):
+                            self.scheduler_worksheet.batch_update(data)
+                return written, missing
                 
             except Exception as e:
-                print(f"  ⚠ Attempt {attempt}/{max_retries} failed to update Google Sheet for {bot_name}: {e}")
+                print(f"  ⚠ Attempt {attempt}/{max_retries} failed to update Google Sheet for {', '.join(updates)}: {e}")
+                # The sheet may have been edited since the last snapshot
+                self.invalidate_scheduler_index()
                 if attempt < max_retries:
+                    self.metrics.inc('scheduler_retries_total', "Retried operations", {'operation': 'sheet_write'})
                     time.sleep(2)  # Wait before retry
                 else:
-                    print(f"  ✗ Failed to update Google Sheet for {bot_name} after {max_retries} attempts")
-                    return False
+                    print(f"  ✗ Failed to update Google Sheet after {max_retries} attempts")
+                    return None
 
-    def prepare_run_command(self, bot_name):
-        """Prepare the run command for a bot based on its name"""
-        # Convert bot name to GitHub format for the folder
-        github_bot_name = bot_name.replace(' ', '-')
+    def write_scheduler_row(self, gc, bot_name, values, max_retries=3):
+        """Write several scheduler columns of one bot row in a single batch_update"""
+        result = self.write_scheduler_rows(gc, {bot_name: values}, max_retries)
+        return result is not None and bot_name in result[0]
+
+    def open_state_store(self):
+        """Open the local SQLite (WAL) store for schedule rows, pending sheet writes and run history"""
+        if self.state_db is not None:
+            return self.state_db
+        
+        self.state_db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.state_db_path), check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS schedule_rows (
+                position INTEGER PRIMARY KEY,
+                row_json TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pending_sheet_writes (
+                bot_name TEXT PRIMARY KEY,
+                status TEXT,
+                last_run TEXT,
+                remark TEXT,
+                queued_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS run_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bot_name TEXT,
+                started_at TEXT,
+                ended_at TEXT,
+                exit_code INTEGER,
+                remark TEXT,
+                peak_rss_mb REAL,
+                cpu_seconds REAL,
+                peak_children INTEGER
+            );
+            DROP TABLE IF EXISTS bot_state;
+        """)
+        
+        # Stores created before resource accounting lack the usage columns
+        run_history_columns = {row[1] for row in connection.execute("PRAGMA table_info(run_history)")}
+        for column, column_type in (("peak_rss_mb", "REAL"), ("cpu_seconds", "REAL"), ("peak_children", "INTEGER")):
+            if column not in run_history_columns:
+                connection.execute(f"ALTER TABLE run_history ADD COLUMN {column} {column_type}")
+        
+        self.state_db = connection
+        return connection
+
+    @contextlib.contextmanager
+    def state_transaction(self):
+        """BEGIN ... COMMIT on the state store, rolled back when a statement fails - the caller holds state_db_lock"""
+        db_conn = self.open_state_store()
+        db_conn.execute("BEGIN")
+        try:
+            yield db_conn
+            db_conn.execute("COMMIT")
+        except BaseException:
+            # A transaction left open would make every later BEGIN fail
+            if db_conn.in_transaction:
+                db_conn.execute("ROLLBACK")
+            raise
+
+    def record_bot_state(self, bot_name, status=None, last_run=None, remark=None):
+        """Queue a bot state change for the Google Sheet in the local store - never waits on the network"""
+        with self.state_db_lock:
+            # Coalesce with any unsent change - the newest value of each column wins
+            self.open_state_store().execute("""
+                INSERT INTO pending_sheet_writes (bot_name, status, last_run, remark, queued_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(bot_name) DO UPDATE SET
+                    status = COALESCE(excluded.status, status),
+                    last_run = COALESCE(excluded.last_run, last_run),
+                    remark = COALESCE(excluded.remark, remark),
+                    queued_at = excluded.queued_at
+            """, (bot_name, status, last_run, remark, time.time()))
+        
+        self.flush_event.set()
+        return True
+
+    def record_run_history(self, bot_name, started_at, ended_at, exit_code, remark, usage=None):
+        """Append a finished bot run and its resource peaks to the local run history"""
+        usage = usage or {}
+        self.record_run_metrics(bot_name, started_at, ended_at, exit_code, remark, usage)
+        try:
+            with self.state_db_lock:
+                self.open_state_store().execute(
+                    """INSERT INTO run_history
+                       (bot_name, started_at, ended_at, exit_code, remark, peak_rss_mb, cpu_seconds, peak_children)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (bot_name, started_at.strftime("%d-%m-%Y %H:%M:%S"), ended_at.strftime("%d-%m-%Y %H:%M:%S"),
+                     exit_code, remark, usage.get('peak_rss_mb'), usage.get('cpu_seconds'), usage.get('peak_children'))
+                )
+        except Exception as e:
+            print(f"  ⚠ Could not record run history for {bot_name}: {e}")
+
+    def store_schedule_rows(self, schedule_data):
+        """Keep a local copy of the scheduler rows so control decisions survive a Sheets outage - only changed rows are written"""
+        try:
+            with self.state_db_lock:
+                db_conn = self.open_state_store()
+                if self.stored_schedule_rows is None:
+                    self.stored_schedule_rows = [
+                        row_json for (row_json,) in db_conn.execute("SELECT row_json FROM schedule_rows ORDER BY position")
+                    ]
+                    self.stored_schedule_objects = []
+                
+                stored = self.stored_schedule_rows
+                objects = self.stored_schedule_objects
+                # Unchanged sheet rows parse to the same dicts - only new dicts need encoding
+                rows_json = [
+                    stored[position] if position < len(objects) and objects[position] is row
+                    else json.dumps(row, sort_keys=True)
+                    for position, row in enumerate(schedule_data)
+                ]
+                self.stored_schedule_objects = list(schedule_data)
+                changed = [
+                    (position, row_json) for position, row_json in enumerate(rows_json)
+                    if position >= len(stored) or stored[position] != row_json
+                ]
+                if not changed and len(stored) == len(rows_json):
+                    return
+                
+                with self.state_transaction():
+                    db_conn.executemany("INSERT OR REPLACE INTO schedule_rows (position, row_json) VALUES (?, ?)", changed)
+                    db_conn.execute("DELETE FROM schedule_rows WHERE position >= ?", (len(rows_json),))
+                self.stored_schedule_rows = rows_json
+        except Exception as e:
+            self.stored_schedule_rows = None
+            self.stored_schedule_objects = []
+            print(f"  ⚠ Could not store scheduler rows locally: {e}")
+
+    def load_schedule_rows(self):
+        """Load the last scheduler rows stored locally, or None"""
+        try:
+            with self.state_db_lock:
+                rows = self.open_state_store().execute(
+                    "SELECT row_json FROM schedule_rows ORDER BY position"
+                ).fetchall()
+            return [json.loads(row_json) for (row_json,) in rows] or None
+        except Exception as e:
+            print(f"  ⚠ Could not load local scheduler rows: {e}")
+            return None
+
+    def load_pending_sheet_writes(self):
+        """Get the queued sheet changes as {bot name: (values, queued_at)}"""
+        with self.state_db_lock:
+            rows = self.open_state_store().execute(
+                "SELECT bot_name, status, last_run, remark, queued_at FROM pending_sheet_writes"
+            ).fetchall()
+        
+        pending = {}
+        for bot_name, status, last_run, remark, queued_at in rows:
+            values = {'status': status, 'last_run': last_run, 'remark': remark}
+            pending[bot_name] = ({column: value for column, value in values.items() if value is not None}, queued_at)
+        return pending
+
+    def apply_local_state(self, schedule_data):
+        """Overlay changes not yet pushed to the sheet onto a sheet snapshot"""
+        try:
+            pending = self.load_pending_sheet_writes()
+        except Exception as e:
+            print(f"  ⚠ Could not read pending sheet writes: {e}")
+            return schedule_data
         
-        # For the filename, we need to URL encode the spaces
-        github_file_name = bot_name.replace(' ', '%20') + '.py'
+        if not pending:
+            return schedule_data
         
-        # Get the username programmatically
-        username = self.username
+        merged = []
+        for row in schedule_data:
+            bot_name = row.get('bots name', '').strip()
+            if bot_name in pending:
+                row = dict(row)
+                row.update(pending[bot_name][0])
+            merged.append(row)
+        return merged
+
+    def flush_pending_sheet_writes(self, gc):
+        """Push all queued changes to the scheduler sheet in one batch - returns False if the sheet was unreachable"""
+        pending = self.load_pending_sheet_writes()
+        if not pending:
+            return True
         
-        # Construct the run command with proper quoting for paths with spaces
-        run_command = f'bash -c "cd \\"/home/{username}/bots/{bot_name}\\" && source venv/bin/activate && curl -sL https://raw.githubusercontent.com/Thaniyanki/raspberry-pi-bots/main/{github_bot_name}/{github_file_name} | python3"'
+        result = self.write_scheduler_rows(gc, {bot_name: values for bot_name, (values, _) in pending.items()}, max_retries=1)
+        if result is None:
+            return False
         
-        print(f"  Run command prepared for {bot_name}:")
-        print(f"    {run_command}")
+        written, missing = result
+        # The cached rows take the written values before the queue drops them, so no snapshot misses them
+        self.merge_cached_schedule_rows({bot_name: pending[bot_name][0] for bot_name in written})
+        with self.state_db_lock:
+            db_conn = self.open_state_store()
+            for bot_name in written + missing:
+                # Keep the entry if a newer change was queued while this batch was in flight
+                db_conn.execute(
+                    "DELETE FROM pending_sheet_writes WHERE bot_name = ? AND queued_at = ?",
+                    (bot_name, pending[bot_name][1])
+                )
         
-        return run_command
+        if written:
+            print(f"\n  ✓ Synced {len(written)} bot state change(s) to the scheduler sheet")
+        return True
 
-    def run_bot_with_command(self, bot_name, run_command, start_time, stop_time, gc):
-        """Run the bot using the prepared command and monitor its execution with LIVE output"""
-        print(f"  Starting bot execution for {bot_name}...")
-        
-        try:
-            # Start the bot process with proper shell execution and live output
-            process = subprocess.Popen(
-                run_command,
-                shell=True,
-                executable='/bin/bash',
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-            
-            # Store the process
-            self.bot_processes[bot_name] = process
+    def run_sheet_flusher(self, gc):
+        """Background thread - coalesce queued state changes and push them to the sheet, backing off while offline"""
+        backoff = self.flush_interval
+        while not self.flusher_stop.is_set():
+            self.flush_event.wait(backoff)
+            self.flush_event.clear()
             
-            # Monitor the process
-            start_timestamp = datetime.now()
-            print(f"  Bot {bot_name} started at: {start_timestamp.strftime('%d-%m-%Y %H:%M:%S')}")
-            print(f"  {'='*60}")
-            print(f"  LIVE OUTPUT FOR {bot_name}:")
-            print(f"  {'='*60}")
-            
-            # Parse times with error handling
             try:
-                # Normalize time formats first
-                start_time_norm = self.normalize_time_format(start_time)
-                stop_time_norm = self.normalize_time_format(stop_time)
-                
-                if not start_time_norm or not stop_time_norm:
-                    print(f"  ⚠ Invalid time format: start='{start_time}', stop='{stop_time}'")
-                    # Use default 1-hour window if times are invalid
-                    stop_datetime = start_timestamp.replace(hour=start_timestamp.hour + 1)
+                if self.flush_pending_sheet_writes(gc):
+                    backoff = self.flush_interval
                 else:
-                    current_date = datetime.now().strftime("%d-%m-%Y")
-                    try:
-                        start_datetime = datetime.strptime(f"{current_date} {start_time_norm}", "%d-%m-%Y %H:%M")
-                        stop_datetime = datetime.strptime(f"{current_date} {stop_time_norm}", "%d-%m-%Y %H:%M")
-                        
-                        # Handle overnight schedules
-                        if stop_datetime < start_datetime:
-                            stop_datetime = stop_datetime.replace(day=stop_datetime.day + 1)
+                    backoff = min(backoff * 2, 300)
+            except Exception as e:
+                print(f"\n  ⚠ Sheet sync failed, will retry: {e}")
+                self.metrics.inc('scheduler_retries_total', "Retried operations", {'operation': 'sheet_flush'})
+                backoff = min(backoff * 2, 300)
+
+    def start_sheet_flusher(self, gc):
+        """Start the background thread that writes queued state changes to the scheduler sheet"""
+        if self.sheet_flusher is not None and self.sheet_flusher.is_alive():
+            return
+        
+        self.flusher_gc = gc
+        self.flusher_stop.clear()
+        self.sheet_flusher = threading.Thread(target=self.run_sheet_flusher, args=(gc,), name="sheet-flusher")
+        self.sheet_flusher.daemon = True
+        self.sheet_flusher.start()
+        # Changes left over from a previous run or outage go out right away
+        self.flush_event.set()
+
+    def stop_sheet_flusher(self):
+        """Stop the flusher thread after one last attempt to push queued changes"""
+        if self.sheet_flusher is None:
+            return
+        
+        self.flusher_stop.set()
+        self.flush_event.set()
+        self.sheet_flusher.join(timeout=10)
+        self.sheet_flusher = None
+        
+        try:
+            self.flush_pending_sheet_writes(self.flusher_gc)
+        except Exception as e:
+            print(f"  ⚠ Queued sheet changes kept locally for the next run: {e}")
+
+    def update_google_sheet_status(self, gc, bot_name, status, max_retries=3):
+        """Record bot status locally and queue it for the Google Sheet"""
+        self.record_bot_state(bot_name, status=status)
+        print(f"  ✓ Queued Google Sheet status for {bot_name}: {status}")
+        return True
+
+    def update_google_sheet_transition(self, gc, bot_name, status, last_run, remark, max_retries=3):
+        """Record status, last_run and remark for a bot state transition locally and queue them as one sheet write"""
+        self.record_bot_state(bot_name, status=status, last_run=last_run, remark=remark)
+        print(f"  ✓ Queued Google Sheet update for {bot_name}: status='{status}', last_run='{last_run}', remark='{remark}'")
+        return True
+
+    def get_bot_resources(self, bot_name):
+        """Get the resources a bot needs exclusively, from its venv 'resources' file (one per line)"""
+        resources_file = self.bots_base_path / bot_name / "venv" / "resources"
+        if resources_file.exists():
+            try:
+                with open(resources_file, 'r') as f:
+                    resources = {line.strip() for line in f if line.strip()}
+                if resources:
+                    return resources
+            except Exception as e:
+                print(f"  ⚠ Could not read resources for {bot_name}: {e}")
+        
+        # Without a resources file a bot has a Chromium profile of its own
+        return {f"chromium profile: {bot_name}"}
+
+    def get_bot_chrome_profile(self, bot_name):
+        """Get the Chromium profile folder a bot runs with - named by its 'chromium profile:' resource"""
+        for resource in self.get_bot_resources(bot_name):
+            if resource.startswith("chromium profile:"):
+                profile = resource.split(":", 1)[1].strip()
+                if profile:
+                    return Path(profile) if os.path.isabs(profile) else self.bot_profiles_path / profile
+        return self.chrome_profile
+
+    def prepare_bot_chrome_profile(self, profile):
+        """Create a bot profile on first use as a copy of the shared profile, so existing logins carry over"""
+        if profile == self.chrome_profile or profile.exists():
+            return
+        
+        profile.parent.mkdir(parents=True, exist_ok=True)
+        if self.chrome_profile.is_dir():
+            print(f"  Creating Chromium profile {profile} from {self.chrome_profile}")
+            shutil.copytree(self.chrome_profile, profile, symlinks=True, ignore=shutil.ignore_patterns(
+                'Singleton*', 'Cache', 'Code Cache', 'GPUCache', 'ShaderCache', 'GrShaderCache'))
+        else:
+            profile.mkdir()
+
+    def get_bot_environment(self, bot_name):
+        """Extra environment for a bot run - the Chromium profile it must use and close"""
+        profile = self.get_bot_chrome_profile(bot_name)
+        try:
+            self.prepare_bot_chrome_profile(profile)
+        except Exception as e:
+            print(f"  ⚠ Could not prepare Chromium profile for {bot_name}: {e}")
+        return {'BOT_CHROME_PROFILE': str(profile)}
+
+    def get_bot_limits(self, bot_name):
+        """Get a bot's memory/CPU ceilings - scheduler defaults, overridden by its venv 'limits' file (key=value)"""
+        limits = {
+            'memory_mb': self.bot_memory_limit_mb,
+            'cpu_seconds': self.bot_cpu_limit_seconds
+        }
+        
+        limits_file = self.bots_base_path / bot_name / "venv" / "limits"
+        if limits_file.exists():
+            try:
+                with open(limits_file, 'r') as f:
+                    for line in f:
+                        key, _, value = line.partition('=')
+                        if key.strip() in limits and value.strip():
+                            limits[key.strip()] = float(value.strip())
+            except Exception as e:
+                print(f"  ⚠ Could not read limits for {bot_name}: {e}")
+        
+        return limits
+
+    def get_process_memory(self, proc):
+        """Bytes of memory a process accounts for - PSS splits the pages Chromium's processes share, unlike RSS"""
+        try:
+            memory = proc.memory_full_info()
+        except (psutil.AccessDenied, NotImplementedError):
+            return proc.memory_info().rss
+        for field in ('pss', 'uss'):
+            if hasattr(memory, field):
+                return getattr(memory, field)
+        return memory.rss
+
+    def sample_bot_resources(self, process, usage):
+        """Sample memory, CPU time and child count of a bot's whole process tree (including Chromium) into usage"""
+        try:
+            root = psutil.Process(process.pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return
+        
+        rss = 0
+        for proc in tree:
+            try:
+                with proc.oneshot():
+                    rss += self.get_process_memory(proc)
+                    cpu = proc.cpu_times()
+                # Keep the last reading per process so CPU of children that already exited still counts
+                usage['cpu_by_pid'][proc.pid] = cpu.user + cpu.system
+            except psutil.Error:
+                continue
+        
+        usage['rss_mb'] = rss / (1024 * 1024)
+        usage['peak_rss_mb'] = max(usage['peak_rss_mb'], usage['rss_mb'])
+        usage['cpu_seconds'] = sum(usage['cpu_by_pid'].values())
+        usage['peak_children'] = max(usage['peak_children'], len(tree) - 1)
+
+    def check_bot_limits(self, bot_name, usage, limits):
+        """Return why the bot exceeded its limits, or None"""
+        if limits['memory_mb'] and usage['rss_mb'] > limits['memory_mb']:
+            return f"memory {usage['rss_mb']:.0f}MB over limit {limits['memory_mb']:.0f}MB"
+        
+        # Per-bot limits from limits files can add up to more than the Pi has - stop the largest bot first
+        with self.worker_lock:
+            self.bot_rss_mb[bot_name] = usage['rss_mb']
+            total_rss = sum(self.bot_rss_mb.values())
+            largest_bot = max(self.bot_rss_mb, key=self.bot_rss_mb.get)
+        if self.total_memory_limit_mb and total_rss > self.total_memory_limit_mb and largest_bot == bot_name:
+            return f"memory of all bots {total_rss:.0f}MB over limit {self.total_memory_limit_mb:.0f}MB"
+        if limits['cpu_seconds'] and usage['cpu_seconds'] > limits['cpu_seconds']:
+            return f"CPU {usage['cpu_seconds']:.0f}s over limit {limits['cpu_seconds']:.0f}s"
+        return None
+
+    def format_resource_usage(self, usage):
+        """Short summary of a run's peaks for the remark column"""
+        return f"peak {usage['peak_rss_mb']:.0f}MB PSS, {usage['cpu_seconds']:.0f}s CPU, {usage['peak_children']} child procs"
+
+    def terminate_process_tree(self, process):
+        """Stop a bot and every process it spawned - SIGTERM first, SIGKILL after 10 seconds"""
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        
+        process.terminate()
+        for child in children:
+            try:
+                child.terminate()
+            except psutil.Error:
+                pass
+        
+        _, alive = psutil.wait_procs(children, timeout=10)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        
+        for child in alive:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+
+    def record_run_metrics(self, bot_name, started_at, ended_at, exit_code, remark, usage):
+        """Export a finished run's duration, outcome, exit code and resource peaks"""
+        if remark.startswith("sucessfully done"):
+            result = "success"
+        elif remark.startswith("forcefully stopped"):
+            result = "stopped"
+        else:
+            result = "failed"
+        
+        labels = {'bot': bot_name}
+        self.metrics.inc('scheduler_bot_runs_total', "Finished bot runs by result", dict(labels, result=result))
+        self.metrics.observe('scheduler_bot_run_duration_seconds', "Bot run duration", labels,
+                             max((ended_at - started_at).total_seconds(), 0))
+        if exit_code is not None:
+            self.metrics.set('scheduler_bot_last_exit_code', "Exit code of the bot's last run", labels, exit_code)
+        if usage.get('peak_rss_mb') is not None:
+            self.metrics.set('scheduler_bot_last_peak_rss_bytes', "Peak memory (PSS) of the bot's last run", labels,
+                             usage['peak_rss_mb'] * 1024 * 1024)
+        self.metrics.set('scheduler_bot_rss_bytes', "Memory (PSS) of the bot's whole process tree", labels, 0)
+
+    def receive_bot_metrics(self, receiver):
+        """Background loop - record step timings bots send as JSON datagrams {"bot", "step", "seconds"}"""
+        while self.metrics_receiver is receiver:
+            try:
+                data = receiver.recv(4096)
+            except OSError:
+                return  # socket closed
+            if not data:
+                continue  # wake-up sent by stop_metrics_server
+            try:
+                message = json.loads(data.decode('utf-8'))
+                self.metrics.observe('bot_step_duration_seconds', "Step timings pushed by the bots",
+                                     {'bot': str(message['bot']), 'step': str(message['step'])}, float(message['seconds']))
+            except (ValueError, KeyError, TypeError):
+                self.metrics.inc('scheduler_bot_metrics_rejected_total', "Malformed datagrams on the bot metrics socket")
+
+    def start_metrics_server(self):
+        """Serve /metrics over HTTP and accept bot step timings on the local metrics socket"""
+        if self.metrics_server is not None or not self.metrics_port:
+            return
+        
+        try:
+            server = http.server.ThreadingHTTPServer((self.metrics_address, self.metrics_port), MetricsRequestHandler)
+            server.daemon_threads = True
+            server.metrics = self.metrics
+            thread = threading.Thread(target=server.serve_forever, name="metrics-http")
+            thread.daemon = True
+            thread.start()
+            self.metrics_server = server
+            print(f"{self.GREEN}✓ Metrics at http://{self.metrics_address}:{self.metrics_port}/metrics{self.ENDC}")
+        except OSError as e:
+            print(f"{self.YELLOW}⚠ Metrics endpoint not started: {e}{self.ENDC}")
+            return
+        
+        try:
+            self.metrics_socket.parent.mkdir(parents=True, exist_ok=True)
+            if self.metrics_socket.exists():
+                self.metrics_socket.unlink()  # left over from a previous run
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            receiver.bind(str(self.metrics_socket))
+            self.metrics_receiver = receiver
+            thread = threading.Thread(target=self.receive_bot_metrics, args=(receiver,), name="metrics-socket")
+            thread.daemon = True
+            thread.start()
+        except OSError as e:
+            print(f"{self.YELLOW}⚠ Bot metrics socket not started: {e}{self.ENDC}")
+
+    def stop_metrics_server(self):
+        """Stop the metrics endpoint and the bot metrics socket"""
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+        receiver = self.metrics_receiver
+        if receiver is not None:
+            self.metrics_receiver = None
+            try:
+                # Closing does not interrupt a blocked recv() - an empty datagram does
+                with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as client:
+                    client.sendto(b"", str(self.metrics_socket))
+            except OSError:
+                pass
+            receiver.close()
+            try:
+                self.metrics_socket.unlink()
+            except OSError:
+                pass
+
+    def store_xpath_node(self, path, value, etag=None):
+        """Keep a database node in memory with a version stamp and its reply pre-encoded for the socket"""
+        with self.xpath_nodes_lock:
+            entry = self.xpath_nodes.get(path)
+            if entry and entry['value'] == value:
+                if etag:
+                    entry['etag'] = etag
+                return False
+            
+            version = entry['version'] + 1 if entry else 1
+            reply = json.dumps({'found': True, 'path': path, 'version': version, 'value': value}) + "\n"
+            self.xpath_nodes[path] = {
+                'value': value,
+                'etag': etag or (entry['etag'] if entry else None),
+                'version': version,
+                'reply': reply.encode('utf-8')
+            }
+            return True
+
+    def refresh_xpath_nodes(self):
+        """Re-read every served node whose ETag changed - unchanged nodes cost no download"""
+        for path in self.xpath_service_nodes:
+            try:
+                ref = db.reference(path)
+                with self.xpath_nodes_lock:
+                    entry = self.xpath_nodes.get(path)
+                with self.metrics.time_request('firebase', 'xpath_refresh'):
+                    if entry and entry['etag']:
+                        changed, value, etag = ref.get_if_changed(entry['etag'])
+                    else:
+                        changed = True
+                        value, etag = ref.get(etag=True)
+                if not changed:
+                    continue
+                if self.store_xpath_node(path, value, etag):
+                    print(f"\n  ✓ XPath service loaded {path}")
+            except Exception as e:
+                print(f"\n  ⚠ XPath service could not refresh {path}: {e}")
+
+    def apply_xpath_event(self, path, event):
+        """Apply a Firebase listener event (put or patch below the node) to the in-memory copy"""
+        try:
+            with self.xpath_nodes_lock:
+                entry = self.xpath_nodes.get(path)
+                value = json.loads(json.dumps(entry['value'])) if entry else None
+            
+            keys = [key for key in event.path.split('/') if key]
+            if not keys:
+                if event.event_type == 'patch' and isinstance(value, dict):
+                    value.update(event.data or {})
+                else:
+                    value = event.data
+            else:
+                if not isinstance(value, dict):
+                    value = {}
+                parent = value
+                for key in keys[:-1]:
+                    if not isinstance(parent.get(key), dict):
+                        parent[key] = {}
+                    parent = parent[key]
+                
+                if event.event_type == 'patch':
+                    child = parent.get(keys[-1])
+                    parent[keys[-1]] = dict(child, **event.data) if isinstance(child, dict) else event.data
+                elif event.data is None:
+                    parent.pop(keys[-1], None)
+                else:
+                    parent[keys[-1]] = event.data
+            
+            self.store_xpath_node(path, value)
+        except Exception as e:
+            print(f"\n  ⚠ XPath service could not apply a change to {path}: {e}")
+
+    def get_xpath_service_reply(self, path):
+        """Get the encoded reply for a node, or for a child of one (e.g. 'Facebook/Xpath/Xpath001')"""
+        with self.xpath_nodes_lock:
+            entry = self.xpath_nodes.get(path)
+            if entry:
+                return entry['reply']
+            
+            for node_path, entry in self.xpath_nodes.items():
+                if path.startswith(node_path + "/"):
+                    value = entry['value']
+                    for key in path[len(node_path) + 1:].split('/'):
+                        value = value.get(key) if isinstance(value, dict) else None
+                    if value is not None:
+                        reply = {'found': True, 'path': path, 'version': entry['version'], 'value': value}
+                        return (json.dumps(reply) + "\n").encode('utf-8')
+        return b'{"found": false}\n'
+
+    def start_xpath_server(self):
+        """Serve the in-memory nodes on the Unix socket"""
+        try:
+            self.xpath_service_socket.parent.mkdir(parents=True, exist_ok=True)
+            if self.xpath_service_socket.exists():
+                self.xpath_service_socket.unlink()  # left over from a previous run
+            
+            server = socketserver.ThreadingUnixStreamServer(str(self.xpath_service_socket), XPathRequestHandler)
+            server.daemon_threads = True
+            server.scheduler = self
+            thread = threading.Thread(target=server.serve_forever, name="xpath-service")
+            thread.daemon = True
+            thread.start()
+            self.xpath_server = server
+            return True
+        except Exception as e:
+            print(f"{self.YELLOW}⚠ XPath service unavailable, bots will read Firebase directly: {e}{self.ENDC}")
+            return False
+
+    def run_xpath_refresher(self):
+        """Background loop re-checking the node ETags in case a listener dropped a change"""
+        while not self.xpath_refresher_stop.wait(self.xpath_refresh_interval):
+            self.refresh_xpath_nodes()
+
+    def start_xpath_service(self):
+        """Load the served nodes, follow them with Firebase listeners and start answering bots"""
+        if self.xpath_server is not None:
+            return True
+        if not self.initialize_firebase():
+            print(f"{self.YELLOW}⚠ XPath service not started - bots will read Firebase directly{self.ENDC}")
+            return False
+        
+        self.refresh_xpath_nodes()
+        if not self.start_xpath_server():
+            return False
+        
+        for path in self.xpath_service_nodes:
+            try:
+                listener = db.reference(path).listen(lambda event, path=path: self.apply_xpath_event(path, event))
+                self.xpath_listeners.append(listener)
+            except Exception as e:
+                print(f"  ⚠ No live updates for {path}, checking every {self.xpath_refresh_interval}s: {e}")
+        
+        self.xpath_refresher_stop.clear()
+        self.xpath_refresher = threading.Thread(target=self.run_xpath_refresher, name="xpath-refresher")
+        self.xpath_refresher.daemon = True
+        self.xpath_refresher.start()
+        
+        print(f"{self.GREEN}✓ XPath service serving {len(self.xpath_nodes)} database nodes on {self.xpath_service_socket}{self.ENDC}")
+        return True
+
+    def stop_xpath_service(self):
+        """Stop the socket server, listeners and refresher"""
+        self.xpath_refresher_stop.set()
+        for listener in self.xpath_listeners:
+            try:
+                listener.close()
+            except Exception:
+                pass
+        self.xpath_listeners = []
+        
+        if self.xpath_server is not None:
+            self.xpath_server.shutdown()
+            self.xpath_server.server_close()
+            self.xpath_server = None
+            try:
+                self.xpath_service_socket.unlink()
+            except OSError:
+                pass
+
+    def create_lease_backend(self, gc):
+        """Create the coordination backend named by SCHEDULER_LEASE_BACKEND - None runs in single-node mode"""
+        name = self.lease_backend_name
+        if not name:
+            return None
+        
+        try:
+            if name == 'sqlite':
+                backend = SQLiteLeaseBackend(self.lease_db_path)
+                backend.connect()
+            elif name == 'firebase':
+                if not self.initialize_firebase():
+                    raise RuntimeError("Firebase is not available")
+                backend = FirebaseLeaseBackend()
+            elif name == 'sheet':
+                backend = SheetLeaseBackend(self, gc)
+            else:
+                raise ValueError(f"unknown lease backend '{name}'")
+        except Exception as e:
+            print(f"{self.YELLOW}⚠ Multi-node mode disabled, running every bot on this node: {e}{self.ENDC}")
+            return None
+        
+        print(f"{self.GREEN}✓ Multi-node mode: node '{self.node_id}' claims bot runs through {name} leases{self.ENDC}")
+        return backend
+
+    def get_window_start(self, start_time, stop_time):
+        """Get when the bot's current schedule window opened, or None if the start time does not parse"""
+        now = datetime.now()
+        start_t = self.parse_schedule_time(start_time)
+        stop_t = self.parse_schedule_time(stop_time)
+        if not start_t:
+            return None
+        
+        start_at = datetime.combine(now.date(), start_t)
+        # Past midnight in an overnight window, the window opened yesterday
+        if start_at > now and stop_t and stop_t < start_t:
+            start_at -= timedelta(days=1)
+        return start_at
+
+    def get_run_id(self, start_time, stop_time):
+        """Identify a bot run by the start of its current window, e.g. '05-01-2024 09:00'"""
+        start_at = self.get_window_start(start_time, stop_time)
+        if start_at is None:
+            return datetime.now().strftime("%d-%m-%Y")
+        return start_at.strftime("%d-%m-%Y %H:%M")
+
+    def claim_bot_run(self, bot_name, start_time, stop_time):
+        """Claim this bot run for this node - always True in single-node mode"""
+        if self.lease_backend is None:
+            return True
+        
+        run_id = self.get_run_id(start_time, stop_time)
+        now = time.time()
+        with self.lease_lock:
+            if self.held_leases.get(bot_name) == run_id:
+                return True
+            
+            refusal = self.lease_refusals.get(bot_name)
+            if refusal and refusal[0] == run_id and (refusal[2] is None or refusal[2] > now):
+                state = "already done by" if refusal[2] is None else "claimed by"
+                print(f"  ⏳ {bot_name} {state} node {refusal[1]}")
+                return False
+            
+            # Busy nodes hold back a little so the least loaded node claims first
+            claim = self.claim_deadlines.get(bot_name)
+            if not claim or claim[0] != run_id:
+                claim = (run_id, now + len(self.get_active_bot_workers()) * self.lease_claim_delay)
+                self.claim_deadlines[bot_name] = claim
+            if claim[1] > now:
+                print(f"  ⏳ {bot_name} waiting {claim[1] - now:.0f}s so less busy nodes can claim it first")
+                return False
+        
+        try:
+            acquired, holder, expires_at = self.lease_backend.acquire(bot_name, run_id, self.node_id, self.lease_ttl)
+        except Exception as e:
+            print(f"  ⚠ Could not claim {bot_name}: {e}")
+            # Nothing else wakes the loop for this run - try again after a sync interval
+            with self.lease_lock:
+                self.claim_deadlines[bot_name] = (run_id, time.time() + self.sync_interval)
+            return False
+        
+        with self.lease_lock:
+            self.claim_deadlines.pop(bot_name, None)
+            if acquired:
+                self.held_leases[bot_name] = run_id
+                self.lost_leases.discard(bot_name)
+                self.lease_refusals.pop(bot_name, None)
+                print(f"  ✓ Claimed {bot_name} ({run_id}) for node {self.node_id}")
+                return True
+            
+            self.lease_refusals[bot_name] = (run_id, holder, expires_at)
+        state = "already done by" if expires_at is None else "claimed by"
+        print(f"  ⏳ {bot_name} {state} node {holder}")
+        return False
+
+    def release_bot_run(self, bot_name, done):
+        """Release this node's lease on a bot run"""
+        with self.lease_lock:
+            run_id = self.held_leases.pop(bot_name, None)
+            self.lost_leases.discard(bot_name)
+        if self.lease_backend is None or run_id is None:
+            return
+        
+        try:
+            self.lease_backend.release(bot_name, run_id, self.node_id, done)
+        except Exception as e:
+            print(f"  ⚠ Could not release the lease on {bot_name}, it expires in {self.lease_ttl}s: {e}")
+
+    def renew_held_leases(self):
+        """Extend every lease this node holds - a lease taken over by another node stops the local run"""
+        with self.lease_lock:
+            held = dict(self.held_leases)
+        
+        for bot_name, run_id in held.items():
+            try:
+                renewed = self.lease_backend.renew(bot_name, run_id, self.node_id, self.lease_ttl)
+            except Exception as e:
+                # Keep running - the lease only lapses if renewals keep failing until it expires
+                print(f"\n  ⚠ Could not renew the lease on {bot_name}: {e}")
+                continue
+            
+            if not renewed:
+                print(f"\n  ⚠ Lease on {bot_name} was taken over by another node")
+                with self.lease_lock:
+                    self.lost_leases.add(bot_name)
+                run_event = self.bot_run_events.get(bot_name)
+                if run_event:
+                    run_event.set()
+
+    def run_lease_renewer(self):
+        """Background loop renewing held leases at a third of their lifetime"""
+        while not self.lease_renewer_stop.wait(self.lease_ttl / 3):
+            self.renew_held_leases()
+
+    def start_lease_renewer(self):
+        """Start the background lease renewer"""
+        if self.lease_renewer is not None and self.lease_renewer.is_alive():
+            return
+        
+        self.lease_renewer_stop.clear()
+        self.lease_renewer = threading.Thread(target=self.run_lease_renewer, name="lease-renewer")
+        self.lease_renewer.daemon = True
+        self.lease_renewer.start()
+
+    def stop_lease_renewer(self):
+        """Stop renewing and give back unfinished runs so another node can pick them up"""
+        if self.lease_renewer is None:
+            return
+        
+        self.lease_renewer_stop.set()
+        self.lease_renewer.join(timeout=5)
+        self.lease_renewer = None
+        
+        for bot_name in list(self.held_leases):
+            self.release_bot_run(bot_name, done=False)
+
+    def is_bot_worker_active(self, bot_name):
+        """Check if a worker thread is currently running this bot"""
+        with self.worker_lock:
+            worker = self.bot_workers.get(bot_name)
+            return worker is not None and worker.is_alive()
+
+    def get_active_bot_workers(self):
+        """Get the names of bots that currently have a live worker"""
+        with self.worker_lock:
+            return [name for name, worker in self.bot_workers.items() if worker.is_alive()]
+
+    def get_resource_conflict(self, bot_name, resources):
+        """Get the name of a running bot holding any of these resources, or None"""
+        with self.worker_lock:
+            for resource in resources:
+                holder = self.held_resources.get(resource)
+                if holder and holder != bot_name:
+                    return holder
+        return None
+
+    def launch_bot_worker(self, bot_name, resources, start_time, stop_time, gc):
+        """Reserve the bot's resources and run it on its own worker thread"""
+        worker = threading.Thread(
+            target=self.run_bot_worker,
+            args=(bot_name, resources, start_time, stop_time, gc),
+            name=f"bot-{bot_name}"
+        )
+        worker.daemon = True
+        
+        with self.worker_lock:
+            for resource in resources:
+                self.held_resources[resource] = bot_name
+            self.bot_workers[bot_name] = worker
+        
+        worker.start()
+
+    def run_bot_worker(self, bot_name, resources, start_time, stop_time, gc):
+        """Worker thread body - run one bot to completion, then release its resources"""
+        success = False
+        try:
+            run_command = self.prepare_run_command(bot_name)
+            success = self.run_bot_with_command(bot_name, run_command, start_time, stop_time, gc)
+            
+            if success:
+                print(f"  ✓ Bot {bot_name} executed successfully")
+            else:
+                print(f"  ✗ Bot {bot_name} execution failed")
+        except Exception as e:
+            print(f"  ❌ Worker for {bot_name} failed: {e}")
+        finally:
+            with self.worker_lock:
+                for resource in resources:
+                    if self.held_resources.get(resource) == bot_name:
+                        del self.held_resources[resource]
+                self.bot_workers.pop(bot_name, None)
+                self.bot_rss_mb.pop(bot_name, None)
+                
+                # A bot that keeps failing waits longer before each retry instead of restarting in a loop
+                if success:
+                    self.bot_retry_after.pop(bot_name, None)
+                else:
+                    failures = self.bot_retry_after.get(bot_name, (0, 0))[1] + 1
+                    delay = min(self.retry_backoff_seconds * 2 ** (failures - 1), self.retry_backoff_max_seconds)
+                    self.bot_retry_after[bot_name] = (time.time() + delay, failures)
+                    print(f"  ⏳ {bot_name} may retry in {delay:.0f}s (failure {failures})")
+            
+            self.bot_run_events.pop(bot_name, None)
+            
+            # Only a successful run is final - after a failure any node may retry within the window
+            self.release_bot_run(bot_name, done=success)
+            
+            # Wake the monitoring loop so a waiting bot can start right away
+            self.scheduler_wakeup.set()
+
+    def get_bot_retry_delay(self, bot_name):
+        """Seconds until a bot whose last run failed may run again - 0 when it may run now"""
+        with self.worker_lock:
+            retry_at = self.bot_retry_after.get(bot_name, (0, 0))[0]
+        return max(retry_at - time.time(), 0)
+
+    def get_bot_zygote(self, bot_name):
+        """Get the socket of the bot venv's warm-start zygote, starting it if needed - None if unavailable"""
+        with self.zygote_lock:
+            bot_lock = self.zygote_locks.setdefault(bot_name, threading.Lock())
+        
+        with bot_lock:
+            zygote = self.bot_zygotes.get(bot_name)
+            if zygote and zygote['process'].poll() is None:
+                return zygote['socket']
+            
+            bot_folder = self.bots_base_path / bot_name
+            venv_path = bot_folder / "venv"
+            python_executable = venv_path / "bin" / "python3"
+            if not python_executable.exists():
+                return None
+            
+            try:
+                self.zygote_path.mkdir(parents=True, exist_ok=True)
+                os.chmod(self.zygote_path, 0o700)
+                socket_path = self.zygote_path / f"{bot_name}.sock"
+                
+                # Same environment as "source venv/bin/activate"
+                env = os.environ.copy()
+                env['VIRTUAL_ENV'] = str(venv_path)
+                env['PATH'] = f"{venv_path / 'bin'}:{env.get('PATH', '')}"
+                env.pop('PYTHONHOME', None)
+                
+                process = subprocess.Popen(
+                    [str(python_executable), "-c", ZYGOTE_SOURCE, str(socket_path)] + self.zygote_preload_modules,
+                    cwd=str(bot_folder),
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True
+                )
+                
+                # The zygote prints "ready" once the heavy modules are imported
+                if process.stdout.readline().strip() != "ready":
+                    process.kill()
+                    process.wait()
+                    print(f"  ⚠ Warm-start zygote for {bot_name} failed to start")
+                    return None
+                
+                self.bot_zygotes[bot_name] = {'process': process, 'socket': socket_path}
+                print(f"  ✓ Warm-start zygote ready for {bot_name} (pid {process.pid})")
+                return socket_path
+                
+            except Exception as e:
+                print(f"  ⚠ Could not start warm-start zygote for {bot_name}: {e}")
+                return None
+
+    def prewarm_bot_zygotes(self, bot_names):
+        """Start zygotes for all bots in the background so their first run is already warm"""
+        if not self.warm_start_enabled:
+            return
+        
+        for bot_name in bot_names:
+            thread = threading.Thread(target=self.get_bot_zygote, args=(bot_name,), name=f"zygote-{bot_name}")
+            thread.daemon = True
+            thread.start()
+
+    def stop_bot_zygotes(self):
+        """Stop all warm-start zygotes"""
+        with self.zygote_lock:
+            zygotes = list(self.bot_zygotes.items())
+            self.bot_zygotes = {}
+        
+        for bot_name, zygote in zygotes:
+            try:
+                zygote['process'].terminate()
+                zygote['process'].wait(timeout=5)
+            except Exception:
+                zygote['process'].kill()
+            try:
+                zygote['socket'].unlink()
+            except OSError:
+                pass
+
+    def start_bot_process(self, bot_name, request, cold_command, **popen_kwargs):
+        """Fork the bot from its warm zygote, falling back to a cold subprocess"""
+        if self.warm_start_enabled:
+            socket_path = self.get_bot_zygote(bot_name)
+            if socket_path:
+                try:
+                    process = ZygoteProcess(str(socket_path), request)
+                    print(f"  ✓ Warm-started {bot_name} (pid {process.pid})")
+                    return process
+                except Exception as e:
+                    print(f"  ⚠ Warm start failed for {bot_name}, starting cold: {e}")
+        
+        return subprocess.Popen(cold_command, **popen_kwargs)
+
+    def get_bot_script_url(self, bot_name):
+        """Raw GitHub URL of a bot's main script"""
+        # Convert bot name to GitHub format for the folder
+        github_bot_name = bot_name.replace(' ', '-')
+        
+        # For the filename, we need to URL encode the spaces
+        github_file_name = bot_name.replace(' ', '%20') + '.py'
+        
+        return f"{self.github_raw_base}/{github_bot_name}/{github_file_name}"
+
+    def prepare_run_command(self, bot_name):
+        """Prepare the run command for a bot based on its name"""
+        # Get the username programmatically
+        username = self.username
+        
+        # Construct the run command with proper quoting for paths with spaces
+        run_command = f'bash -c "cd \\"/home/{username}/bots/{bot_name}\\" && source venv/bin/activate && curl -sL {self.get_bot_script_url(bot_name)} | python3"'
+        
+        print(f"  Run command prepared for {bot_name}:")
+        print(f"    {run_command}")
+        
+        return run_command
+
+    def open_bot_output_log(self, bot_name):
+        """Open a buffered, size-rotated log file that receives the full output stream of a bot"""
+        self.bot_logs_path.mkdir(parents=True, exist_ok=True)
+        log_file = self.bot_logs_path / f"{bot_name}.log"
+        
+        logger = logging.getLogger(f"bot output.{bot_name}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        self.close_bot_output_log(logger)  # drop handlers left from a previous run
+        
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=self.bot_log_max_bytes,
+            backupCount=self.bot_log_backup_count,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%d-%m-%Y %H:%M:%S"))
+        
+        # Buffer lines in memory and write them to disk in batches
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=100,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        logger.addHandler(buffered_handler)
+        return logger
+
+    def close_bot_output_log(self, logger):
+        """Flush and close the handlers of a bot output log"""
+        for handler in list(logger.handlers):
+            try:
+                handler.flush()
+                if isinstance(handler, logging.handlers.MemoryHandler) and handler.target:
+                    handler.target.close()
+                handler.close()
+            except Exception:
+                pass
+            logger.removeHandler(handler)
+
+    def run_bot_with_command(self, bot_name, run_command, start_time, stop_time, gc):
+        """Run the bot using the prepared command and monitor its execution with LIVE output"""
+        print(f"  Starting bot execution for {bot_name}...")
+        
+        try:
+            # Start the bot process with live output - forked from the warm zygote when possible
+            bot_env = self.get_bot_environment(bot_name)
+            process = self.start_bot_process(
+                bot_name,
+                {'cwd': str(self.bots_base_path / bot_name), 'url': self.get_bot_script_url(bot_name), 'env': bot_env},
+                run_command,
+                env=dict(os.environ, **bot_env),
+                shell=True,
+                executable='/bin/bash',
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1
+            )
+            
+            # Store the process
+            self.bot_processes[bot_name] = process
+            
+            # The monitor sleeps until the bot exits, its lease is lost or a deadline comes up
+            run_event = threading.Event()
+            self.bot_run_events[bot_name] = run_event
+            self.process_watcher.watch(process, run_event)
+            
+            # Monitor the process
+            start_timestamp = datetime.now()
+            print(f"  Bot {bot_name} started at: {start_timestamp.strftime('%d-%m-%Y %H:%M:%S')}")
+            print(f"  {'='*60}")
+            print(f"  LIVE OUTPUT FOR {bot_name}:")
+            print(f"  {'='*60}")
+            
+            # Parse times with error handling
+            try:
+                # Normalize time formats first
+                start_time_norm = self.normalize_time_format(start_time)
+                stop_time_norm = self.normalize_time_format(stop_time)
+                
+                if not start_time_norm or not stop_time_norm:
+                    print(f"  ⚠ Invalid time format: start='{start_time}', stop='{stop_time}'")
+                    # Use default 1-hour window if times are invalid
+                    stop_datetime = start_timestamp.replace(hour=start_timestamp.hour + 1)
+                else:
+                    current_date = datetime.now().strftime("%d-%m-%Y")
+                    try:
+                        start_datetime = datetime.strptime(f"{current_date} {start_time_norm}", "%d-%m-%Y %H:%M")
+                        stop_datetime = datetime.strptime(f"{current_date} {stop_time_norm}", "%d-%m-%Y %H:%M")
+                        
+                        # Handle overnight schedules
+                        if stop_datetime < start_datetime:
+                            stop_datetime = stop_datetime.replace(day=stop_datetime.day + 1)
                     except ValueError as e:
                         print(f"  ⚠ Time parsing error: {e}, using default 1-hour window")
                         stop_datetime = start_timestamp.replace(hour=start_timestamp.hour + 1)
@@ -2633,8 +4998,9 @@ class BotScheduler:
             print(f"  Bot {bot_name} will run until: {stop_datetime.strftime('%d-%m-%Y %H:%M:%S')}")
             print(f"  {'='*60}")
             
-            # Read output line by line in real-time
-            output_lines = []
+            # Read output line by line in real-time - keep only the last lines in memory
+            output_lines = deque(maxlen=self.bot_output_tail_lines)
+            output_log = self.open_bot_output_log(bot_name)
             process_output_complete = False
             
             def read_output():
@@ -2645,7 +5011,9 @@ class BotScheduler:
                         line = line.strip()
                         if line:
                             output_lines.append(line)
-                            print(f"  [{bot_name}] {line}")
+                            output_log.info(line)
+                            if self.echo_bot_output:
+                                print(f"  [{bot_name}] {line}")
                     process_output_complete = True
                 except Exception as e:
                     print(f"  ⚠ Error reading output: {e}")
@@ -2656,39 +5024,63 @@ class BotScheduler:
             output_thread.daemon = True
             output_thread.start()
             
+            # Resource usage of the bot's process tree, sampled at a low rate
+            limits = self.get_bot_limits(bot_name)
+            usage = {'rss_mb': 0, 'peak_rss_mb': 0, 'cpu_seconds': 0, 'peak_children': 0, 'cpu_by_pid': {}}
+            next_sample = time.monotonic()
+            
             # Monitor process and check for timeout with live output
             while process.poll() is None:
                 current_datetime = datetime.now()
+                stop_reason = None
                 
                 # Check if current time exceeds stop_time
                 if current_datetime > stop_datetime:
                     print(f"  ⚠ Bot {bot_name} exceeded allocated time, stopping forcefully...")
-                    
-                    # Forcefully stop the bot
-                    process.terminate()
-                    try:
-                        process.wait(timeout=10)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        process.wait()
+                    stop_reason = "forcefully stopped"
+                elif bot_name in self.lost_leases:
+                    print(f"  ⚠ Bot {bot_name} lost its lease to another node, stopping...")
+                    stop_reason = "forcefully stopped - lease lost"
+                elif time.monotonic() >= next_sample:
+                    next_sample = time.monotonic() + self.resource_sample_interval
+                    self.sample_bot_resources(process, usage)
+                    self.metrics.set('scheduler_bot_rss_bytes', "Memory (PSS) of the bot's whole process tree",
+                                     {'bot': bot_name}, usage['rss_mb'] * 1024 * 1024)
+                    limit_exceeded = self.check_bot_limits(bot_name, usage, limits)
+                    if limit_exceeded:
+                        print(f"  ⚠ Bot {bot_name} exceeded its resource limit ({limit_exceeded}), stopping...")
+                        stop_reason = f"forcefully stopped - {limit_exceeded}"
+                
+                if stop_reason:
+                    # Stop the bot together with its browser and other children
+                    self.sample_bot_resources(process, usage)
+                    self.terminate_process_tree(process)
+                    output_thread.join(timeout=5)
+                    self.close_bot_output_log(output_log)
                     
                     # Update status and remark for forceful stop
                     self.update_local_status(bot_name, "idle")
-                    self.update_google_sheet_status(gc, bot_name, "idle")
                     
-                    # Update last_run and remark in local and Google Sheet
+                    # Update last_run and remark locally, then write the whole transition to the Google Sheet
                     last_run_time = current_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                    remark_text = "forcefully stopped"
+                    remark_text = f"{stop_reason} | {self.format_resource_usage(usage)}"
                     
                     self.update_local_last_run_and_remark(bot_name, last_run_time, remark_text)
-                    self.update_google_sheet_last_run_and_remark(gc, bot_name, last_run_time, remark_text)
+                    self.update_google_sheet_transition(gc, bot_name, "idle", last_run_time, remark_text)
+                    self.record_run_history(bot_name, start_timestamp, current_datetime, process.poll(), remark_text, usage)
                     
                     print(f"  ✓ Bot {bot_name} forcefully stopped and status updated")
                     print(f"  {'='*60}")
                     return False
                 
-                # Wait a bit before checking again
-                time.sleep(2)
+                # Sleep until the next event - exit, lost lease, stop time or resource sample
+                run_event.clear()
+                if process.poll() is not None:
+                    break
+                until_stop = (stop_datetime - datetime.now()).total_seconds()
+                until_sample = next_sample - time.monotonic()
+                # A hair past the stop time so the check above sees it passed
+                run_event.wait(max(min(until_stop + 0.01, until_sample), 0))
             
             # Wait for output thread to complete
             output_thread.join(timeout=5)
@@ -2706,16 +5098,21 @@ class BotScheduler:
                         for line in lines:
                             if line.strip():
                                 output_lines.append(line.strip())
-                                print(f"  [{bot_name}] {line.strip()}")
+                                output_log.info(line.strip())
+                                if self.echo_bot_output:
+                                    print(f"  [{bot_name}] {line.strip()}")
                 except:
                     pass
             
+            self.close_bot_output_log(output_log)
+            
             print(f"  {'='*60}")
             print(f"  Bot {bot_name} execution completed")
             print(f"  Exit code: {exit_code}")
             print(f"  Start time: {start_timestamp.strftime('%d-%m-%Y %H:%M:%S')}")
             print(f"  End time: {end_timestamp.strftime('%d-%m-%Y %H:%M:%S')}")
             print(f"  Duration: {end_timestamp - start_timestamp}")
+            print(f"  Resources: {self.format_resource_usage(usage)}")
             print(f"  {'='*60}")
             
             if exit_code == 0:
@@ -2723,30 +5120,37 @@ class BotScheduler:
                 
                 # Update status, last_run and remark for successful completion
                 self.update_local_status(bot_name, "idle")
-                self.update_google_sheet_status(gc, bot_name, "idle")
                 
-                # Update last_run and remark in local and Google Sheet
+                # Update last_run and remark locally, then write the whole transition to the Google Sheet
                 last_run_time = end_timestamp.strftime("%d-%m-%Y %H:%M:%S")
-                remark_text = "sucessfully done"
+                remark_text = f"sucessfully done | {self.format_resource_usage(usage)}"
                 
                 self.update_local_last_run_and_remark(bot_name, last_run_time, remark_text)
-                self.update_google_sheet_last_run_and_remark(gc, bot_name, last_run_time, remark_text)
+                self.update_google_sheet_transition(gc, bot_name, "idle", last_run_time, remark_text)
+                self.record_run_history(bot_name, start_timestamp, end_timestamp, exit_code, remark_text, usage)
                 
                 print(f"  ✓ Bot {bot_name} status updated to 'idle' with remark 'sucessfully done'")
                 return True
             else:
                 print(f"  ✗ Bot {bot_name} failed with exit code: {exit_code}")
+                if output_lines:
+                    print(f"  Last output lines from {bot_name}:")
+                    for line in list(output_lines)[-10:]:
+                        print(f"    {line}")
                 
                 # Update status and remark for failed execution
                 self.update_local_status(bot_name, "idle")
-                self.update_google_sheet_status(gc, bot_name, "idle")
                 
-                # Update last_run and remark in local and Google Sheet
+                # Update last_run and remark locally, then write the whole transition to the Google Sheet
                 last_run_time = end_timestamp.strftime("%d-%m-%Y %H:%M:%S")
                 remark_text = f"failed with exit code {exit_code}"
+                if output_lines:
+                    remark_text += f" - {output_lines[-1][:100]}"
+                remark_text += f" | {self.format_resource_usage(usage)}"
                 
                 self.update_local_last_run_and_remark(bot_name, last_run_time, remark_text)
-                self.update_google_sheet_last_run_and_remark(gc, bot_name, last_run_time, remark_text)
+                self.update_google_sheet_transition(gc, bot_name, "idle", last_run_time, remark_text)
+                self.record_run_history(bot_name, start_timestamp, end_timestamp, exit_code, remark_text, usage)
                 
                 return False
                 
@@ -2755,69 +5159,16 @@ class BotScheduler:
             
             # Update status for error case
             self.update_local_status(bot_name, "idle")
-            self.update_google_sheet_status(gc, bot_name, "idle")
             
-            # Update last_run and remark in local and Google Sheet
+            # Update last_run and remark locally, then write the whole transition to the Google Sheet
             last_run_time = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
             remark_text = f"error: {str(e)}"
             
             self.update_local_last_run_and_remark(bot_name, last_run_time, remark_text)
-            self.update_google_sheet_last_run_and_remark(gc, bot_name, last_run_time, remark_text)
+            self.update_google_sheet_transition(gc, bot_name, "idle", last_run_time, remark_text)
             
             return False
 
-    def update_google_sheet_last_run_and_remark(self, gc, bot_name, last_run, remark, max_retries=3):
-        """Update last_run and remark in Google Sheet - MODIFIED: Only update first 30 rows"""
-        for attempt in range(1, max_retries + 1):
-            try:
-                sheet = gc.open("scheduler")
-                worksheet = sheet.sheet1
-                
-                # MODIFIED: Only search in first 30 rows
-                # Get data from first 30 rows
-                data_range = "A1:S30"
-                data_values = worksheet.get(data_range)
-                
-                if not data_values:
-                    print(f"  ✗ No data found in scheduler sheet")
-                    return False
-                
-                headers = data_values[0]
-                rows = data_values[1:]
-                
-                # Find the row for this bot in first 30 rows
-                for i, row in enumerate(rows, start=2):  # start=2 because row 1 is header
-                    if i > 31:  # Only check up to row 31 (30 data rows + 1 header)
-                        break
-                        
-                    if len(row) > 0 and row[0].strip() == bot_name:
-                        # Update last_run column (column R, which is index 17 in 0-based)
-                        last_run_col_index = 17  # R is 18th column, 0-based index is 17
-                        # Update remark column (column S, which is index 18 in 0-based)
-                        remark_col_index = 18    # S is 19th column, 0-based index is 18
-                        
-                        # Ensure we have enough columns
-                        if len(row) <= remark_col_index:
-                            # Need to extend the row
-                            row.extend([''] * (remark_col_index - len(row) + 1))
-                        
-                        # Update the cells
-                        worksheet.update_cell(i, last_run_col_index + 1, last_run)  # +1 because worksheet is 1-based
-                        worksheet.update_cell(i, remark_col_index + 1, remark)      # +1 because worksheet is 1-based
-                        print(f"  ✓ Updated Google Sheet for {bot_name}: last_run='{last_run}', remark='{remark}'")
-                        return True
-                
-                print(f"  ✗ Bot {bot_name} not found in first 30 rows of scheduler sheet")
-                return False
-                
-            except Exception as e:
-                print(f"  ⚠ Attempt {attempt}/{max_retries} failed to update Google Sheet for {bot_name}: {e}")
-                if attempt < max_retries:
-                    time.sleep(2)  # Wait before retry
-                else:
-                    print(f"  ✗ Failed to update Google Sheet for {bot_name} after {max_retries} attempts")
-                    return False
-
     def execute_steps_9a_to_9d(self, schedule_data, valid_bots, gc, check_count):
         """Execute steps 9a to 9d for bot execution management - FIXED VERSION"""
         current_day = datetime.now().strftime("%A").lower()
@@ -2838,8 +5189,8 @@ class BotScheduler:
         
         start_col, stop_col = day_columns[current_day]
         
-        # Track if any bot was executed successfully
-        bot_executed_successfully = False
+        # Track how many bots were started in this cycle
+        bots_started = 0
         
         # Step 9a: Check every second for time range and switch
         for row in schedule_data:
@@ -2891,37 +5242,61 @@ class BotScheduler:
                         current_date = datetime.now().strftime("%d-%m-%Y")
                         print(f"  {current_day_name} {current_date} | Check #{check_count} | Next sync: 21s")
                         
-                        # Step 9d: Mark status as "in progress" and run the bot
+                        # Step 9d: Mark status as "in progress" and run the bot on a worker
                         print(f"{self.BLUE}  Step 9d: Updating status and running {bot_name}{self.ENDC}")
                         
+                        if self.is_bot_worker_active(bot_name):
+                            print(f"  ✓ {bot_name} is already running on a worker")
+                            continue
+                        
+                        retry_delay = self.get_bot_retry_delay(bot_name)
+                        if retry_delay:
+                            print(f"  ⏳ {bot_name} failed its last run - retrying in {retry_delay:.0f}s")
+                            continue
+                        
+                        active_workers = self.get_active_bot_workers()
+                        if len(active_workers) >= self.max_parallel_bots:
+                            print(f"  ⏳ {bot_name} waiting - {len(active_workers)}/{self.max_parallel_bots} bots already running")
+                            continue
+                        
+                        resources = self.get_bot_resources(bot_name)
+                        conflicting_bot = self.get_resource_conflict(bot_name, resources)
+                        if conflicting_bot:
+                            print(f"  ⏳ {bot_name} waiting - shares a resource with running bot {conflicting_bot}")
+                            continue
+                        
+                        # In multi-node mode only the node holding the run's lease starts it
+                        if not self.claim_bot_run(bot_name, start_time, stop_time):
+                            continue
+                        
                         # First update local status
                         self.update_local_status(bot_name, "in progress")
                         
-                        # Then update Google Sheet with retry
-                        if self.update_google_sheet_status(gc, bot_name, "in progress"):
+                        # Then update Google Sheet with retry - a sheet lease already shows the bot in progress
+                        lease_wrote_status = self.lease_backend is not None and self.lease_backend.writes_status
+                        if lease_wrote_status or self.update_google_sheet_status(gc, bot_name, "in progress"):
                             print(f"  ✓ Successfully updated both local and Google Sheet status for {bot_name}")
                             
-                            # Set other bots to "idle" ONLY if they were "in progress"
+                            # Set other bots to "idle" ONLY if they were "in progress" but are not running
+                            # (with leases, a bot in progress may be running on another node)
                             for other_bot in valid_bots:
-                                if other_bot != bot_name and self.local_schedule_data.get(other_bot, {}).get('status') == 'in progress':
+                                if (other_bot != bot_name
+                                        and self.lease_backend is None
+                                        and self.local_schedule_data.get(other_bot, {}).get('status') == 'in progress'
+                                        and not self.is_bot_worker_active(other_bot)):
                                     self.update_local_status(other_bot, "idle")
                                     self.update_google_sheet_status(gc, other_bot, "idle")
                             
-                            print(f"  ✓ Set other 'in progress' bots to 'idle'")
-                            
-                            # Prepare run command and run the bot
-                            run_command = self.prepare_run_command(bot_name)
+                            print(f"  ✓ Set other stale 'in progress' bots to 'idle'")
                             
-                            # Run the bot with the prepared command
-                            success = self.run_bot_with_command(bot_name, run_command, start_time, stop_time, gc)
-                            
-                            if success:
-                                print(f"  ✓ Bot {bot_name} executed successfully")
-                                bot_executed_successfully = True
-                                # BREAK OUT OF THE LOOP - don't check other bots in this cycle
-                                break
-                            else:
-                                print(f"  ✗ Bot {bot_name} execution failed")
+                            # Run the bot without blocking the other bots
+                            self.launch_bot_worker(bot_name, resources, start_time, stop_time, gc)
+                            window_start = self.get_window_start(start_time, stop_time)
+                            if window_start:
+                                self.metrics.observe('scheduler_start_delay_seconds', "Time from a schedule window opening to the bot starting",
+                                                     {'bot': bot_name}, max((datetime.now() - window_start).total_seconds(), 0))
+                            print(f"  ✓ Bot {bot_name} started ({len(active_workers) + 1}/{self.max_parallel_bots} running)")
+                            bots_started += 1
                         else:
                             print(f"  ✗ Failed to update Google Sheet status for {bot_name}")
                     
@@ -2932,7 +5307,10 @@ class BotScheduler:
             else:
                 print(f"{self.YELLOW}  ⚠ Step 9a: Time check FAILED for {bot_name}{self.ENDC}")
                 # Bot not in scheduled time range - ONLY stop if it's actually running
-                if self.is_bot_running(bot_name):
+                if self.is_bot_worker_active(bot_name):
+                    # The worker enforces the stop time and records the remark itself
+                    print(f"  ✓ {bot_name} is finishing on its worker - stop time enforced there")
+                elif self.is_bot_running(bot_name):
                     print(f"  ⚠ {bot_name} is running but not in scheduled time, stopping...")
                     if self.stop_bot(bot_name):
                         print(f"  ✓ Successfully stopped {bot_name}")
@@ -2944,8 +5322,183 @@ class BotScheduler:
                     # Bot is not running and not in scheduled time - this is normal, no action needed
                     print(f"  ✓ {bot_name} is idle (not running) and not in scheduled time - no action needed")
         
-        # Return whether a bot was executed successfully
-        return bot_executed_successfully
+        # Return how many bots were started in this cycle
+        return bots_started
+
+    async def run_blocking(self, func, *args):
+        """Run a blocking call (gspread, Drive, SQLite) on the bounded executor without stalling the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.blocking_executor, lambda: func(*args))
+
+    async def poll_scheduler_sheet(self, gc, drive):
+        """Step 9 sheet poll task - check the sheet every sync_interval and wake the decision loop when its rows change"""
+        last_rows = None
+        while True:
+            # Only re-read when the Drive revision changed - a slow call here never delays a due start
+            try:
+                rows = await self.run_blocking(self.fetch_scheduler_rows, gc, drive)
+                error = None
+            except Exception as e:
+                rows, error = None, e
+            
+            changed = (not self.schedule_polled or rows != last_rows
+                       or error is not None or self.schedule_poll_error is not None)
+            last_rows = rows
+            self.schedule_poll_error = error
+            self.schedule_polled = True
+            if changed:
+                self.scheduler_wakeup.set()
+            
+            await asyncio.sleep(self.sync_interval)
+
+    async def monitor_schedule(self, gc, drive, valid_bots):
+        """Step 9 monitoring - a sheet poll task feeding the decision loop that starts and stops bots"""
+        poll_task = asyncio.create_task(self.poll_scheduler_sheet(gc, drive))
+        try:
+            # Nothing to decide on before the first poll
+            while not self.schedule_polled:
+                await self.scheduler_wakeup.wait_async()
+            self.scheduler_wakeup.clear()
+            await self.decide_schedule(gc, valid_bots)
+        finally:
+            poll_task.cancel()
+
+    async def decide_schedule(self, gc, valid_bots):
+        """Run steps 9a-9d on every schedule event, finished bot or sheet change"""
+        check_count = 0
+        
+        while True:
+            check_count += 1
+            
+            # Get current day and date for display
+            current_day = datetime.now().strftime("%A").lower()
+            current_date = datetime.now().strftime("%d-%m-%Y")
+            day = current_day.capitalize()
+            date = current_date
+            
+            # Display "00s" while deciding
+            print(f"\r{day} {date} | Check #{check_count} | Next sync: 00s", end="", flush=True)
+            
+            if self.schedule_poll_error is not None:
+                # Show error message
+                print(f"\n{day} {date} | Check #{check_count} | Next sync: {self.sync_interval}s")
+                print("-" * 80)
+                print(f"{self.RED}Error accessing scheduler sheet: {self.schedule_poll_error}{self.ENDC}")
+                print(f"{self.YELLOW}scheduler not available{self.ENDC}")
+                
+                # Wait for the next sync with countdown
+                await self.wait_for_next_sync(day, date, check_count, self.sync_interval)
+                continue
+            
+            rows = self.cached_schedule_data
+            if rows is None:
+                # Show no data available
+                print(f"\n{day} {date} | Check #{check_count} | Next sync: {self.sync_interval}s")
+                print("-" * 80)
+                print(f"{self.YELLOW}scheduler not available{self.ENDC}")
+                
+                # Wait for the next sync with countdown
+                await self.wait_for_next_sync(day, date, check_count, self.sync_interval)
+                continue
+            
+            # The polled rows plus state changes not yet pushed to the sheet
+            schedule_data = await self.run_blocking(self.apply_local_state, rows)
+            
+            # Recompile the start/stop timeline only when the schedule changed
+            if self.build_schedule_timeline(schedule_data, valid_bots):
+                next_event = self.get_next_schedule_event()
+                if next_event:
+                    event_time, event_kind, event_bot = next_event
+                    print(f"\n  Next schedule event: {event_kind} {event_bot} at {event_time.strftime('%d-%m-%Y %H:%M')}")
+            
+            # Execute steps 9a-9d for bot execution management
+            bots_started = await self.run_blocking(self.execute_steps_9a_to_9d, schedule_data, valid_bots, gc, check_count)
+            
+            if bots_started:
+                print(f"\n{self.GREEN}✓ Started {bots_started} bot(s), running alongside the scheduler{self.ENDC}")
+            
+            # Format and display schedule - ONLY ONCE per sync
+            result = self.format_schedule_display(schedule_data, valid_bots)
+            
+            if result:
+                day, date, display_data = result
+                
+                if not display_data:
+                    print(f"\n{day} {date} | Check #{check_count} | Next sync: {self.sync_interval}s")
+                    print("-" * 80)
+                    print("No scheduled bots for today")
+                else:
+                    # Calculate column widths for all columns including new ones
+                    max_name_len = max(len(item['bot_name']) for item in display_data)
+                    max_name_len = max(max_name_len, len("bots name"))
+                    max_start_len = max(len(item['start_at']) for item in display_data)
+                    max_start_len = max(max_start_len, len("start_at"))
+                    max_stop_len = max(len(item['stop_at']) for item in display_data)
+                    max_stop_len = max(max_stop_len, len("stop_at"))
+                    max_switch_len = max(len(item['switch']) for item in display_data)
+                    max_switch_len = max(max_switch_len, len("switch"))
+                    max_status_len = max(len(item['status']) for item in display_data)
+                    max_status_len = max(max_status_len, len("status"))
+                    max_last_run_len = max(len(item['last_run']) for item in display_data)
+                    max_last_run_len = max(max_last_run_len, len("last_run"))
+                    max_remark_len = max(len(item['remark']) for item in display_data)
+                    max_remark_len = max(max_remark_len, len("remark"))
+                    
+                    # Add padding
+                    max_name_len += 2
+                    max_start_len += 2
+                    max_stop_len += 2
+                    max_switch_len += 2
+                    max_status_len += 2
+                    max_last_run_len += 2
+                    max_remark_len += 2
+                    
+                    # Build header string to calculate table width
+                    header = (f"{'bots name':<{max_name_len}} "
+                             f"{'start_at':<{max_start_len}} "
+                             f"{'stop_at':<{max_stop_len}} "
+                             f"{'switch':<{max_switch_len}} "
+                             f"{'status':<{max_status_len}} "
+                             f"{'last_run':<{max_last_run_len}} "
+                             f"{'remark':<{max_remark_len}}")
+                    
+                    # Calculate table width for consistent dash lines
+                    table_width = len(header)
+                    
+                    # Display table ONLY ONCE
+                    print("\n" + "-" * table_width)
+                    print(header)
+                    print("-" * table_width)
+                    
+                    # Data rows
+                    for item in display_data:
+                        row = (f"{item['bot_name']:<{max_name_len}} "
+                               f"{item['start_at']:<{max_start_len}} "
+                               f"{item['stop_at']:<{max_stop_len}} "
+                               f"{item['switch']:<{max_switch_len}} "
+                               f"{item['status']:<{max_status_len}} "
+                               f"{item['last_run']:<{max_last_run_len}} "
+                               f"{item['remark']:<{max_remark_len}}")
+                        print(row)
+                
+                # Sync bots with current schedule - FIXED VERSION (stopping a bot can block for seconds)
+                await self.run_blocking(self.sync_bots_with_schedule, schedule_data, valid_bots)
+                
+                # Sleep until the next start/stop event - the poll task wakes the loop when the sheet changes
+                await self.wait_for_next_sync(day, date, check_count, self.get_seconds_until_next_sync())
+            
+            else:
+                # Show no data for today
+                print(f"\n{day} {date} | Check #{check_count} | Next sync: {self.sync_interval}s")
+                print("-" * 80)
+                print(f"{self.YELLOW}⚠ No valid schedule data for today{self.ENDC}")
+                
+                # Wait for the next sync with countdown
+                await self.wait_for_next_sync(day, date, check_count, self.sync_interval)
+            
+            # Store current schedule data
+            self.schedule_data = schedule_data
+            self.last_sync_time = datetime.now()
 
     def run_step9(self):
         """Step 9: Monitor Scheduler Sheet and Control Bots with Steps 9a-9d"""
@@ -2973,9 +5526,24 @@ class BotScheduler:
                 scopes=SCOPES
             )
             gc = gspread.authorize(creds)
+            drive = build("drive", "v3", credentials=creds)
             
             print(f"{self.GREEN}✓ Successfully authorized with Google Sheets API{self.ENDC}")
             
+            # Bot state changes are recorded locally and pushed to the sheet in the background
+            self.start_sheet_flusher(gc)
+            
+            # Expose run, API and resource metrics for scraping
+            self.start_metrics_server()
+            
+            # Bots read XPaths, URLs and colors from the scheduler instead of downloading them per lookup
+            self.start_xpath_service()
+            
+            # Several Pis can share the schedule, each claiming bot runs through leases
+            self.lease_backend = self.create_lease_backend(gc)
+            if self.lease_backend is not None:
+                self.start_lease_renewer()
+            
             # Get valid bot names (from Step 5 comparison)
             valid_bots = self.get_valid_bot_names()
             
@@ -2984,147 +5552,17 @@ class BotScheduler:
                 if bot_name not in self.bot_processes:
                     self.bot_processes[bot_name] = None
             
-            # Monitor scheduler sheet and control bots
-            check_count = 0
+            # Preload each bot's interpreter so scheduled runs start warm
+            self.prewarm_bot_zygotes(valid_bots)
             
-            while True:
-                check_count += 1
-                
-                # Get current day and date for display
-                current_day = datetime.now().strftime("%A").lower()
-                current_date = datetime.now().strftime("%d-%m-%Y")
-                day = current_day.capitalize()
-                date = current_date
-                
-                # Display "00s" while syncing with Google Sheets
-                print(f"\r{day} {date} | Check #{check_count} | Next sync: 00s", end="", flush=True)
-                
-                # Get scheduler data with error handling - MODIFIED: Only reads first 30 rows
-                try:
-                    schedule_data = self.get_scheduler_data(gc)
-                except Exception as e:
-                    # Show error message
-                    print(f"\n{day} {date} | Check #{check_count} | Next sync: 30s")
-                    print("-" * 80)
-                    print(f"{self.RED}Error accessing scheduler sheet: {e}{self.ENDC}")
-                    print(f"{self.YELLOW}scheduler not available{self.ENDC}")
-                    
-                    # Wait 30 seconds with countdown
-                    for countdown in range(30, 0, -1):
-                        print(f"\r{day} {date} | Check #{check_count} | Next sync: {countdown:02d}s", end="", flush=True)
-                        time.sleep(1)
-                    print("\r" + " " * 80 + "\r", end="", flush=True)
-                    continue
-                
-                if schedule_data is None:
-                    # Show no data available
-                    print(f"\n{day} {date} | Check #{check_count} | Next sync: 30s")
-                    print("-" * 80)
-                    print(f"{self.YELLOW}scheduler not available{self.ENDC}")
-                    
-                    # Wait 30 seconds with countdown
-                    for countdown in range(30, 0, -1):
-                        print(f"\r{day} {date} | Check #{check_count} | Next sync: {countdown:02d}s", end="", flush=True)
-                        time.sleep(1)
-                    print("\r" + " " * 80 + "\r", end="", flush=True)
-                    continue
-                
-                # Execute steps 9a-9d for bot execution management
-                bot_executed_successfully = self.execute_steps_9a_to_9d(schedule_data, valid_bots, gc, check_count)
-                
-                # If a bot was executed successfully, immediately start next check cycle
-                if bot_executed_successfully:
-                    print(f"\n{self.GREEN}✓ Bot executed successfully, starting next check cycle immediately{self.ENDC}")
-                    continue  # Skip the rest of this cycle and go to next check
-                
-                # Format and display schedule - ONLY ONCE per sync
-                result = self.format_schedule_display(schedule_data, valid_bots)
-                
-                if result:
-                    day, date, display_data = result
-                    
-                    if not display_data:
-                        print(f"\n{day} {date} | Check #{check_count} | Next sync: 30s")
-                        print("-" * 80)
-                        print("No scheduled bots for today")
-                    else:
-                        # Calculate column widths for all columns including new ones
-                        max_name_len = max(len(item['bot_name']) for item in display_data)
-                        max_name_len = max(max_name_len, len("bots name"))
-                        max_start_len = max(len(item['start_at']) for item in display_data)
-                        max_start_len = max(max_start_len, len("start_at"))
-                        max_stop_len = max(len(item['stop_at']) for item in display_data)
-                        max_stop_len = max(max_stop_len, len("stop_at"))
-                        max_switch_len = max(len(item['switch']) for item in display_data)
-                        max_switch_len = max(max_switch_len, len("switch"))
-                        max_status_len = max(len(item['status']) for item in display_data)
-                        max_status_len = max(max_status_len, len("status"))
-                        max_last_run_len = max(len(item['last_run']) for item in display_data)
-                        max_last_run_len = max(max_last_run_len, len("last_run"))
-                        max_remark_len = max(len(item['remark']) for item in display_data)
-                        max_remark_len = max(max_remark_len, len("remark"))
-                        
-                        # Add padding
-                        max_name_len += 2
-                        max_start_len += 2
-                        max_stop_len += 2
-                        max_switch_len += 2
-                        max_status_len += 2
-                        max_last_run_len += 2
-                        max_remark_len += 2
-                        
-                        # Build header string to calculate table width
-                        header = (f"{'bots name':<{max_name_len}} "
-                                 f"{'start_at':<{max_start_len}} "
-                                 f"{'stop_at':<{max_stop_len}} "
-                                 f"{'switch':<{max_switch_len}} "
-                                 f"{'status':<{max_status_len}} "
-                                 f"{'last_run':<{max_last_run_len}} "
-                                 f"{'remark':<{max_remark_len}}")
-                        
-                        # Calculate table width for consistent dash lines
-                        table_width = len(header)
-                        
-                        # Display table ONLY ONCE
-                        print("\n" + "-" * table_width)
-                        print(header)
-                        print("-" * table_width)
-                        
-                        # Data rows
-                        for item in display_data:
-                            row = (f"{item['bot_name']:<{max_name_len}} "
-                                   f"{item['start_at']:<{max_start_len}} "
-                                   f"{item['stop_at']:<{max_stop_len}} "
-                                   f"{item['switch']:<{max_switch_len}} "
-                                   f"{item['status']:<{max_status_len}} "
-                                   f"{item['last_run']:<{max_last_run_len}} "
-                                   f"{item['remark']:<{max_remark_len}}")
-                            print(row)
-                    
-                    # Sync bots with current schedule - FIXED VERSION
-                    self.sync_bots_with_schedule(schedule_data, valid_bots)
-                    
-                    # Countdown timer - use carriage return to update in place
-                    for countdown in range(30, 0, -1):
-                        time.sleep(1)
-                        print(f"\r{day} {date} | Check #{check_count} | Next sync: {countdown:02d}s", end="", flush=True)
-                    print("\r" + " " * 80 + "\r", end="", flush=True)
-                
-                else:
-                    # Show no data for today
-                    print(f"\n{day} {date} | Check #{check_count} | Next sync: 30s")
-                    print("-" * 80)
-                    print(f"{self.YELLOW}⚠ No valid schedule data for today{self.ENDC}")
-                    
-                    # Wait 30 seconds with countdown
-                    for countdown in range(30, 0, -1):
-                        print(f"\r{day} {date} | Check #{check_count} | Next sync: {countdown:02d}s", end="", flush=True)
-                        time.sleep(1)
-                    print("\r" + " " * 80 + "\r", end="", flush=True)
-                
-                # Store current schedule data
-                self.schedule_data = schedule_data
-                self.last_sync_time = datetime.now()
+            # Monitor scheduler sheet and control bots on an asyncio loop - blocking
+            # Sheets/Drive calls run on a bounded thread pool so they never stall it
+            self.blocking_executor = ThreadPoolExecutor(max_workers=self.blocking_workers, thread_name_prefix="scheduler-io")
+            try:
+                asyncio.run(self.monitor_schedule(gc, drive, valid_bots))
+            finally:
+                self.blocking_executor.shutdown(wait=False)
+                self.blocking_executor = None
                 
         except KeyboardInterrupt:
             print(f"\n\n{self.YELLOW}Scheduler monitoring stopped by user{self.ENDC}")
@@ -3154,9 +5592,204 @@ class BotScheduler:
             if self.is_bot_running(bot_name):
                 self.stop_bot(bot_name)
         
+        # Stop answering the bots' XPath requests
+        self.stop_xpath_service()
+        self.stop_metrics_server()
+        
+        # Hand unfinished bot runs to the other nodes
+        self.stop_lease_renewer()
+        
+        # Push any queued state changes to the scheduler sheet
+        self.stop_sheet_flusher()
+        
+        # Stop the warm-start zygotes
+        self.stop_bot_zygotes()
+        
         # Close browser
         self.close_chrome_browser()
 
+    def hash_file(self, file_path):
+        """SHA-256 of a file's contents, or None if it does not exist"""
+        try:
+            with open(file_path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def list_spreadsheet_revisions(self, source_key_file):
+        """List spreadsheets visible to the service account with their Drive modified time"""
+        creds = Credentials.from_service_account_file(
+            str(source_key_file),
+            scopes=["https://www.googleapis.com/auth/drive.readonly"]
+        )
+        drive = build("drive", "v3", credentials=creds)
+        
+        sheets = []
+        page_token = None
+        while True:
+            response = drive.files().list(
+                q="mimeType='application/vnd.google-apps.spreadsheet'",
+                spaces='drive',
+                fields="nextPageToken, files(id, name, modifiedTime)",
+                pageToken=page_token
+            ).execute()
+            
+            for file in response.get('files', []):
+                sheets.append({
+                    'name': file['name'],
+                    'id': file['id'],
+                    'number': len(sheets) + 1,
+                    'modified_time': file.get('modifiedTime')
+                })
+            
+            page_token = response.get('nextPageToken', None)
+            if not page_token:
+                break
+        
+        return sheets
+
+    def compute_startup_fingerprint(self, bot_folders):
+        """Fingerprint everything steps 1-8 depend on - returns (fingerprint, available_sheets) or (None, None)"""
+        try:
+            key_exists, _, source_key_file = self.check_spreadsheet_key_exists(bot_folders)
+            if not key_exists:
+                return None, None
+            
+            tree = self.get_github_tree()
+            if not tree or not tree.get('sha'):
+                return None, None
+            
+            key_hashes = {}
+            for folder in bot_folders:
+                venv_path = self.get_venv_path(folder) or folder / "venv"
+                for file_name in self.startup_key_files:
+                    key_hashes[f"{folder.name}/{file_name}"] = self.hash_file(venv_path / file_name)
+            
+            sheets = self.list_spreadsheet_revisions(source_key_file)
+            # The scheduler sheet changes on every status write and is read by step 9 anyway
+            sheet_revisions = sorted(
+                (sheet['id'], sheet['name'], sheet['modified_time'] if sheet['name'] != self.scheduler_folder else None)
+                for sheet in sheets
+            )
+            
+            fingerprint_data = {
+                'bot_folders': sorted(folder.name for folder in bot_folders),
+                'key_hashes': key_hashes,
+                'github_tree_sha': tree['sha'],
+                'sheet_revisions': sheet_revisions
+            }
+            fingerprint = hashlib.sha256(json.dumps(fingerprint_data, sort_keys=True).encode()).hexdigest()
+            return fingerprint, sheets
+            
+        except Exception as e:
+            print(f"  ⚠ Could not compute startup fingerprint: {e}")
+            return None, None
+
+    def load_startup_fingerprint(self):
+        """Load the fingerprint saved after the last successful full startup"""
+        try:
+            with open(self.startup_fingerprint_file, 'r') as f:
+                return json.load(f).get('fingerprint')
+        except Exception:
+            return None
+
+    def save_startup_fingerprint(self):
+        """Record the current fingerprint after steps 1-8 succeeded"""
+        fingerprint, _ = self.compute_startup_fingerprint(self.get_bot_folders())
+        if not fingerprint:
+            return False
+        
+        try:
+            self.startup_fingerprint_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.startup_fingerprint_file.with_name(self.startup_fingerprint_file.name + ".tmp")
+            with open(temp_file, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'saved_at': datetime.now().isoformat()}, f)
+            os.replace(temp_file, self.startup_fingerprint_file)
+            print(f"  ✓ Startup fingerprint saved - the next start can skip steps 1-8")
+            return True
+        except Exception as e:
+            print(f"  ⚠ Could not save startup fingerprint: {e}")
+            return False
+
+    def clear_startup_fingerprint(self):
+        """Forget the saved fingerprint so the next start runs all steps"""
+        try:
+            self.startup_fingerprint_file.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"  ⚠ Could not remove startup fingerprint: {e}")
+
+    def revalidate_startup_steps(self):
+        """Background thread - re-run the steps skipped by the fast path and refresh the fingerprint"""
+        print(f"\n{self.BLUE}Re-validating skipped startup steps in the background...{self.ENDC}")
+        
+        try:
+            # Steps 2 and 3 would wait for missing keys - leave that to the next full start
+            bot_folders = self.get_bot_folders()
+            valid = (self.check_all_bots_have_database_key(bot_folders)
+                     and self.check_all_bots_have_spreadsheet_key(bot_folders))
+            
+            # Steps 4-6 run on a copy, so step 9 never sees their half-built sheet and bot lists
+            snapshot = copy.copy(self)
+            valid = valid and snapshot.run_step4()
+            
+            if valid:
+                step5_success, all_match = snapshot.run_step5()
+                valid = step5_success and all_match
+            
+            if valid:
+                step6_success, all_sheets_available = snapshot.run_step6()
+                valid = step6_success
+            
+            if valid:
+                # Installing bots and WhatsApp notifications need the browser, so only detect here
+                local_bot_names = [folder.name for folder in self.get_bot_folders()]
+                new_bots = [
+                    github_bot for github_bot in snapshot.get_completed_github_bots()
+                    if self.convert_github_to_local_name(github_bot) not in local_bot_names
+                ]
+                valid = not new_bots
+            
+            if valid:
+                with self.startup_state_lock:
+                    self.available_sheets = snapshot.available_sheets
+                    self.missing_sheets = snapshot.missing_sheets
+                self.save_startup_fingerprint()
+                print(f"\n{self.GREEN}✓ Background re-validation of steps 2-8 passed{self.ENDC}")
+            else:
+                self.clear_startup_fingerprint()
+                print(f"\n{self.YELLOW}⚠ Background re-validation found changes - the next start will run all steps{self.ENDC}")
+                
+        except Exception as e:
+            self.clear_startup_fingerprint()
+            print(f"\n{self.YELLOW}⚠ Background re-validation failed: {e}{self.ENDC}")
+
+    def try_fast_startup(self, bot_folders):
+        """Go straight to step 9 when the startup fingerprint matches - returns False to run the full startup"""
+        saved_fingerprint = self.load_startup_fingerprint()
+        if not saved_fingerprint:
+            return False
+        
+        print("\nChecking startup fingerprint...")
+        fingerprint, available_sheets = self.compute_startup_fingerprint(bot_folders)
+        if fingerprint != saved_fingerprint:
+            print(f"{self.YELLOW}⚠ Keys, bots, GitHub or sheets changed since the last start - running all steps{self.ENDC}")
+            return False
+        
+        print(f"{self.GREEN}✓ Nothing changed since the last start - skipping steps 1-8{self.ENDC}")
+        self.available_sheets = available_sheets
+        
+        revalidation = threading.Thread(target=self.revalidate_startup_steps, name="startup-revalidation")
+        revalidation.daemon = True
+        revalidation.start()
+        
+        print(f"\n{self.BLUE}Starting Step 9: Scheduler Monitoring & Bot Control{self.ENDC}")
+        if not self.run_step9():
+            print(f"\n{self.RED}❌ Step 9 failed.{self.ENDC}")
+            sys.exit(1)
+        return True
+
     def run(self):
         """Main execution function with proper cleanup"""
         try:
@@ -3176,6 +5809,11 @@ class BotScheduler:
                 return
             
             self.list_bot_folders(bot_folders)
+            
+            # Fast path - nothing changed since the last full startup
+            if self.try_fast_startup(bot_folders):
+                return
+            
             self.handle_report_numbers(bot_folders)
             report_numbers_ok = self.verify_report_numbers(bot_folders)
             
@@ -3231,6 +5869,10 @@ class BotScheduler:
                                     # Run Step 8 - Detect new bots
                                     step8_success, new_bots = self.run_step8()
                                     
+                                    # Steps 1-8 are clean - let the next start take the fast path
+                                    if not new_bots:
+                                        self.save_startup_fingerprint()
+                                    
                                     # Continue to Step 9 regardless of new bots
                                     print(f"\n{self.BLUE}Starting Step 9: Scheduler Monitoring & Bot Control{self.ENDC}")
                                     step9_success = self.run_step9()
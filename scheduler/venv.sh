@@ -16,47 +16,96 @@ OS=$(uname -s)
 ARCH=$(uname -m)
 echo "[INFO] Detected OS: $OS | Architecture: $ARCH"
 
-# === Step 1: Folder Setup ===
-mkdir -p "$BOTS_DIR"
-if [ -d "$BOT_PATH" ]; then
-    echo "[INFO] Removing existing bot folder..."
-    rm -rf "$BOT_PATH"
-fi
-mkdir -p "$BOT_PATH"
-echo "[OK] Created bot folder at: $BOT_PATH"
+# System packages from apt - "a|b" means the first of a, b that apt knows about.
+# The all-in-one installer reads this list from every bot, installs them all in a
+# single apt run and then runs this script with SKIP_APT=1.
+SYSTEM_PACKAGES="python3 python3-venv python3-pip git curl"
 
-# === Step 2: Dependencies ===
-echo "[INFO] Installing system dependencies..."
-sudo apt update -y
-sudo apt install -y python3 python3-venv python3-pip git curl
+# Python packages - the all-in-one installer pre-builds these into a shared wheelhouse
+# and points pip at it through PIP_FIND_LINKS
+PYTHON_PACKAGES="gspread oauth2client google-auth google-api-python-client firebase_admin google-auth-oauthlib \
+    google-cloud-storage google-cloud-firestore psutil pyautogui python3-xlib requests Pillow python-dateutil"
 
-# === Step 3: Python Virtual Environment ===
-echo "[INFO] Creating Python virtual environment..."
-if [ -d "$VENV_PATH" ]; then
-    echo "[INFO] Removing old virtual environment..."
-    rm -rf "$VENV_PATH"
+if [ "$1" = "--list-system-packages" ]; then
+    echo $SYSTEM_PACKAGES
+    exit 0
+fi
+if [ "$1" = "--list-python-packages" ]; then
+    echo $PYTHON_PACKAGES
+    exit 0
 fi
-python3 -m venv "$VENV_PATH"
-source "$VENV_PATH/bin/activate"
 
-pip install --upgrade pip setuptools wheel
+# Dependency fingerprint, kept in the venv so a re-run only redoes what changed: apt when
+# the system packages change, pip when the Python packages change and a venv rebuild only
+# for a new interpreter. FORCE_REBUILD=1 redoes everything.
+FINGERPRINT_FILE="$VENV_PATH/.dependency-fingerprint"
 
-# === Step 4: Install Python Dependencies ===
-echo "[INFO] Installing Python dependencies..."
+dependency_fingerprint() {
+    echo "interpreter=$(python3 -c 'import sys; print(sys.version.split()[0])' 2>/dev/null || echo none) $ARCH"
+    echo "system=$(echo $SYSTEM_PACKAGES | sha256sum | cut -d' ' -f1)"
+    echo "python=$(echo $PYTHON_PACKAGES | sha256sum | cut -d' ' -f1)"
+}
 
-# Core Python standard library (already available)
-echo "[OK] Python standard libraries: os, time, json, subprocess, shutil, re, sys, pathlib"
+fingerprint_matches() {
+    [ "$FORCE_REBUILD" != "1" ] && [ -f "$FINGERPRINT_FILE" ] &&
+        [ "$(grep "^$1=" "$FINGERPRINT_FILE")" = "$(dependency_fingerprint | grep "^$1=")" ]
+}
 
-# Google Sheets API
-pip install gspread oauth2client
+# Exit 0 when a setup run would change nothing
+if [ "$1" = "--check-fingerprint" ]; then
+    if [ -x "$VENV_PATH/bin/python" ] && fingerprint_matches interpreter &&
+        fingerprint_matches system && fingerprint_matches python; then
+        exit 0
+    fi
+    exit 1
+fi
 
-# Additional Google API packages for Google Sheets
-pip install google-auth google-api-python-client
+# === Step 1: Folder Setup ===
+# An existing folder is kept - it holds the access keys, report number and local data
+mkdir -p "$BOT_PATH"
+echo "[OK] Bot folder at: $BOT_PATH"
+
+# === Step 2: Dependencies ===
+if [ "$SKIP_APT" = "1" ]; then
+    echo "[INFO] System packages already installed by the all-in-one installer"
+elif fingerprint_matches system; then
+    echo "[OK] System packages unchanged since the last setup"
+else
+    echo "[INFO] Installing system dependencies..."
+    sudo apt update -y
+    sudo apt install -y python3 python3-venv python3-pip git curl
+fi
 
-# Additional dependencies used in your code
-pip install firebase_admin google-auth-oauthlib \
-    google-cloud-storage google-cloud-firestore psutil \
-    pyautogui python3-xlib requests Pillow python-dateutil
+# === Step 3: Python Virtual Environment ===
+if [ -x "$VENV_PATH/bin/python" ] && fingerprint_matches interpreter; then
+    source "$VENV_PATH/bin/activate"
+    if fingerprint_matches python; then
+        echo "[OK] Python packages unchanged - keeping the virtual environment"
+    else
+        echo "[INFO] Python packages changed - updating the virtual environment in place..."
+        pip install $PYTHON_PACKAGES
+    fi
+else
+    echo "[INFO] Creating Python virtual environment..."
+    # Access keys and the report number live in venv/ - move them aside during the rebuild.
+    # The keep folder sits in the bot folder so a failed rebuild cannot lose them.
+    KEEP_DIR="$BOT_PATH/.venv-keep"
+    mkdir -p "$KEEP_DIR"
+    if [ -d "$VENV_PATH" ]; then
+        echo "[INFO] Removing old virtual environment..."
+        find "$VENV_PATH" -mindepth 1 -maxdepth 1 ! -name bin ! -name include ! -name lib ! -name lib64 \
+            ! -name share ! -name pyvenv.cfg ! -name .dependency-fingerprint -exec mv -t "$KEEP_DIR" {} +
+        rm -rf "$VENV_PATH"
+    fi
+    python3 -m venv "$VENV_PATH"
+    find "$KEEP_DIR" -mindepth 1 -maxdepth 1 -exec mv -t "$VENV_PATH" {} +
+    rmdir "$KEEP_DIR"
+    source "$VENV_PATH/bin/activate"
+
+    pip install --upgrade pip setuptools wheel
+    pip install $PYTHON_PACKAGES
+fi
+dependency_fingerprint > "$FINGERPRINT_FILE"
 
 echo "[OK] All Python dependencies installed"
 
@@ -1,8 +1,9 @@
 # WhatsApp Birthday Wisher Python Script
 import psutil
 import time
-import subprocess
 import os
+import json
+import socket
 import gspread
 import firebase_admin
 from selenium import webdriver
@@ -34,7 +35,9 @@ WHATSAPP_REPORT_FILE = os.path.join(WHATSAPP_BOT_DIR, "WhatsApp report")
 
 # Browser settings
 CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
-CHROME_PROFILE_PATH = os.path.join(USER_HOME, ".config", "chromium") 
+# The scheduler passes the Chromium profile this bot runs with, so several bots can run at once
+BOT_CHROME_PROFILE = os.environ.get("BOT_CHROME_PROFILE")
+CHROME_PROFILE_PATH = BOT_CHROME_PROFILE or os.path.join(USER_HOME, ".config", "chromium")
 
 # Application settings
 SPREADSHEET_NAME = "whatsapp birthday wisher"
@@ -53,6 +56,18 @@ extracted_phone_number = None
 skip_to_step31 = False
 selected_wish_stored = None
 
+def is_own_browser_process(proc, names=('chrome', 'chromium', 'chromedriver')):
+    """True for a browser process this bot may close - all of them unless the scheduler assigned a profile"""
+    if (proc.info['name'] or '').lower() not in names:
+        return False
+    if not BOT_CHROME_PROFILE:
+        return True
+    # Other bots run their own profiles alongside this one - leave their browsers open
+    try:
+        return f"--user-data-dir={BOT_CHROME_PROFILE}" in proc.cmdline()
+    except psutil.Error:
+        return False
+
 def close_chrome():
     """Closes all running instances of Chrome, Chromium, and chromedriver."""
     global driver
@@ -62,7 +77,7 @@ def close_chrome():
             driver = None
         
         for proc in psutil.process_iter(['name']):
-            if proc.info['name'] in ['chrome', 'chromium', 'chromedriver']:
+            if is_own_browser_process(proc):
                 try:
                     proc.kill()
                     print(f"Killed process: {proc.info['name']}")
@@ -74,15 +89,80 @@ def close_chrome():
     except Exception as e:
         print(f"Error closing Chrome: {str(e)}")
 
+# Connectivity state published by the scheduler's monitor - bots read it instead of forking ping
+CONNECTIVITY_STATE_FILE = os.path.join(BOTS_DIR, "scheduler", "connectivity.json")
+CONNECTIVITY_MAX_AGE = 20  # seconds a shared "online" result is trusted
+_last_probe = {"online": False, "checked_at": 0.0}
+
+def is_internet_available():
+    """Return the shared connectivity state, verifying locally with a TCP probe when it is stale or offline"""
+    now = time.time()
+    try:
+        with open(CONNECTIVITY_STATE_FILE) as f:
+            state = json.load(f)
+        if state.get("online") and now - state.get("checked_at", 0) <= CONNECTIVITY_MAX_AGE:
+            return True
+    except (OSError, ValueError):
+        pass
+    
+    # Re-probe at most once a second so tight retry loops stay cheap
+    if now - _last_probe["checked_at"] >= 1:
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+            _last_probe["online"] = True
+        except OSError:
+            _last_probe["online"] = False
+        _last_probe["checked_at"] = now
+    return _last_probe["online"]
+
+# XPath service run by the scheduler - answers from memory, Firebase is only read when it is down
+XPATH_SERVICE_SOCKET = os.path.join(BOTS_DIR, "scheduler", "xpath.sock")
+
+def read_xpath_service(path):
+    """Get a database node from the scheduler's XPath service, or None if the service is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(XPATH_SERVICE_SOCKET)
+            client.sendall(f"{path}\n".encode("utf-8"))
+            reply = json.loads(client.makefile("r", encoding="utf-8").readline())
+        if reply.get("found"):
+            return reply["value"]
+    except (OSError, ValueError):
+        pass
+    return None
+
+def read_database_node(path):
+    """Read a database node through the XPath service, falling back to Firebase"""
+    value = read_xpath_service(path)
+    if value is not None:
+        return value
+    return db.reference(path).get()
+
+# Step timings are pushed to the scheduler's /metrics endpoint
+METRICS_SOCKET = os.path.join(BOTS_DIR, "scheduler", "metrics.sock")
+METRICS_BOT_NAME = "whatsapp birthday wisher"
+
+def report_step_time(step, seconds):
+    """Send a step timing to the scheduler - skipped silently when the scheduler is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as client:
+            message = {"bot": METRICS_BOT_NAME, "step": step, "seconds": round(seconds, 3)}
+            client.sendto(json.dumps(message).encode("utf-8"), METRICS_SOCKET)
+    except OSError:
+        pass
+
+def timed_step(step, func, *args):
+    """Run one step and report how long it took"""
+    started = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        report_step_time(step, time.monotonic() - started)
+
 def check_internet():
     """Checks for an active internet connection."""
-    try:
-        subprocess.check_call(["ping", "-c", "1", "8.8.8.8"],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL)
-        return True
-    except subprocess.CalledProcessError:
-        return False
+    return is_internet_available()
         
 def wait_for_internet():
     """Waits for internet connection with countdown (retries forever)."""
@@ -340,8 +420,7 @@ def step9c_fetch_xpath():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath001" not in xpath_data:
                 raise Exception("Xpath001 not found in database")
@@ -501,8 +580,7 @@ def step9i_fetch_xpath002():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath002" not in xpath_data:
                 raise Exception("Xpath002 not found in database")
@@ -617,8 +695,7 @@ def step9l_wait_and_press_enter():
                 if not initialize_firebase():
                     raise Exception("Failed to initialize Firebase")
                 
-                whatsapp_ref = db.reference("WhatsApp/Xpath")
-                xpath_data = whatsapp_ref.get()
+                xpath_data = read_database_node("WhatsApp/Xpath")
                 
                 if not xpath_data or "Xpath003" not in xpath_data:
                     raise Exception("Xpath003 not found in database")
@@ -719,8 +796,7 @@ def step9p_fetch_xpath001():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath001" not in xpath_data:
                 raise Exception("Xpath001 not found in database")
@@ -1098,8 +1174,7 @@ def step18_fetch_xpath001():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath001" not in xpath_data:
                 raise Exception("Xpath001 not found in database")
@@ -1297,8 +1372,7 @@ def step23_fetch_xpath004():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath004" not in xpath_data:
                 raise Exception("Xpath004 not found in database")
@@ -1437,8 +1511,7 @@ def step26_fetch_xpath002():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath002" not in xpath_data:
                 raise Exception("Xpath002 not found in database")
@@ -1579,8 +1652,7 @@ def step31_fetch_xpath003():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath003" not in xpath_data:
                 raise Exception("Xpath003 not found in database")
@@ -2052,8 +2124,7 @@ def step43_fetch_xpath001():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath001" not in xpath_data:
                 raise Exception("Xpath001 not found in database")
@@ -2208,8 +2279,7 @@ def step49_fetch_xpath002():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath002" not in xpath_data:
                 raise Exception("Xpath002 not found in database")
@@ -2325,8 +2395,7 @@ def step52_wait_and_press_enter():
                 if not initialize_firebase():
                     raise Exception("Failed to initialize Firebase")
                 
-                whatsapp_ref = db.reference("WhatsApp/Xpath")
-                xpath_data = whatsapp_ref.get()
+                xpath_data = read_database_node("WhatsApp/Xpath")
                 
                 if not xpath_data or "Xpath003" not in xpath_data:
                     raise Exception("Xpath003 not found in database")
@@ -2429,8 +2498,7 @@ def step56_fetch_xpath001():
             if not initialize_firebase():
                 raise Exception("Failed to initialize Firebase")
             
-            whatsapp_ref = db.reference("WhatsApp/Xpath")
-            xpath_data = whatsapp_ref.get()
+            xpath_data = read_database_node("WhatsApp/Xpath")
             
             if not xpath_data or "Xpath001" not in xpath_data:
                 raise Exception("Xpath001 not found in database")
@@ -2694,7 +2762,7 @@ if __name__ == "__main__":
                 
                 # Step 2: Check internet connection (retries forever)
                 print("\n=== Step 2: Checking internet connection ===")
-                wait_for_internet()
+                timed_step("check internet", wait_for_internet)
                     
                 # Step 3: Check spreadsheet access key (exits if missing)
                 print("\n=== Step 3: Checking for the spreadsheet access key ===")
@@ -2707,16 +2775,16 @@ if __name__ == "__main__":
                     
                     # Step 5: Access Google Spreadsheet (retries forever)
                     print("\n=== Step 5: Accessing Google Spreadsheet ===")
-                    spreadsheet = initialize_spreadsheet()
+                    spreadsheet = timed_step("access spreadsheet", initialize_spreadsheet)
                     print("Reached the spread sheet")
                     
                     # Step 7: Remove duplicates (retries forever)
                     print("\n=== Step 7: Removing duplicate rows ===")
-                    step7_remove_duplicates(spreadsheet)
+                    timed_step("remove duplicates", step7_remove_duplicates, spreadsheet)
                     
                     # Step 8: Filter birthdays (retries forever)
                     print("\n=== Step 8: Filtering today's birthdays ===")
-                    step8_output = step8_filter_birthdays(spreadsheet)
+                    step8_output = timed_step("filter birthdays", step8_filter_birthdays, spreadsheet)
                     
                     if next_step == "step9a":
                         print("\n=== Step 9a: Opening WhatsApp Web ===")
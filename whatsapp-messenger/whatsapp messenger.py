@@ -1,7 +1,9 @@
 import psutil
 import time
-import subprocess
 import os
+import json
+import socket
+import sqlite3
 import gspread
 import random
 from selenium import webdriver
@@ -31,7 +33,9 @@ REPORT_NUMBER_FILE = os.path.join(WHATSAPP_BOT_DIR, "venv", "report number")
 
 # Browser settings
 CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
-CHROME_PROFILE_PATH = os.path.join(USER_HOME, ".config", "chromium")
+# The scheduler passes the Chromium profile this bot runs with, so several bots can run at once
+BOT_CHROME_PROFILE = os.environ.get("BOT_CHROME_PROFILE")
+CHROME_PROFILE_PATH = BOT_CHROME_PROFILE or os.path.join(USER_HOME, ".config", "chromium")
 
 # Application settings
 SPREADSHEET_NAME = "whatsapp messenger"
@@ -50,6 +54,77 @@ PROGRAM_START_TIME = None
 # Global dictionary to store all XPaths
 XPATH_CACHE = {}
 
+# Connectivity state published by the scheduler's monitor - bots read it instead of forking ping
+CONNECTIVITY_STATE_FILE = os.path.join(BOTS_DIR, "scheduler", "connectivity.json")
+CONNECTIVITY_MAX_AGE = 20  # seconds a shared "online" result is trusted
+_last_probe = {"online": False, "checked_at": 0.0}
+
+def is_internet_available():
+    """Return the shared connectivity state, verifying locally with a TCP probe when it is stale or offline"""
+    now = time.time()
+    try:
+        with open(CONNECTIVITY_STATE_FILE) as f:
+            state = json.load(f)
+        if state.get("online") and now - state.get("checked_at", 0) <= CONNECTIVITY_MAX_AGE:
+            return True
+    except (OSError, ValueError):
+        pass
+    
+    # Re-probe at most once a second so tight retry loops stay cheap
+    if now - _last_probe["checked_at"] >= 1:
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=1).close()
+            _last_probe["online"] = True
+        except OSError:
+            _last_probe["online"] = False
+        _last_probe["checked_at"] = now
+    return _last_probe["online"]
+
+# XPath service run by the scheduler - answers from memory, Firebase is only read when it is down
+XPATH_SERVICE_SOCKET = os.path.join(BOTS_DIR, "scheduler", "xpath.sock")
+
+def read_xpath_service(path):
+    """Get a database node from the scheduler's XPath service, or None if the service is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(XPATH_SERVICE_SOCKET)
+            client.sendall(f"{path}\n".encode("utf-8"))
+            reply = json.loads(client.makefile("r", encoding="utf-8").readline())
+        if reply.get("found"):
+            return reply["value"]
+    except (OSError, ValueError):
+        pass
+    return None
+
+def read_database_node(path):
+    """Read a database node through the XPath service, falling back to Firebase"""
+    value = read_xpath_service(path)
+    if value is not None:
+        return value
+    return db.reference(path).get()
+
+# Step timings are pushed to the scheduler's /metrics endpoint
+METRICS_SOCKET = os.path.join(BOTS_DIR, "scheduler", "metrics.sock")
+METRICS_BOT_NAME = "whatsapp messenger"
+
+def report_step_time(step, seconds):
+    """Send a step timing to the scheduler - skipped silently when the scheduler is not running"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as client:
+            message = {"bot": METRICS_BOT_NAME, "step": step, "seconds": round(seconds, 3)}
+            client.sendto(json.dumps(message).encode("utf-8"), METRICS_SOCKET)
+    except OSError:
+        pass
+
+def timed_step(step, func, *args):
+    """Run one step and report how long it took"""
+    started = time.monotonic()
+    try:
+        return func(*args)
+    finally:
+        report_step_time(step, time.monotonic() - started)
+
 def initialize_firebase():
     """Initialize Firebase app"""
     try:
@@ -80,9 +155,8 @@ def import_all_xpaths_from_database():
             print("❌ Failed to initialize Firebase")
             return False
         
-        # Get reference to WhatsApp XPaths
-        whatsapp_ref = db.reference("WhatsApp/Xpath")
-        xpath_data = whatsapp_ref.get()
+        # Get WhatsApp XPaths (from the scheduler's XPath service when it is running)
+        xpath_data = read_database_node("WhatsApp/Xpath")
         
         if not xpath_data:
             print("❌ No XPath data found in Firebase")
@@ -168,7 +242,16 @@ def get_xpath_from_cache(xpath_number):
 
 def initialize_xpaths():
     """Initialize XPaths - import from database or load from file"""
-    # First try to load from local file (if it exists from previous run)
+    global XPATH_CACHE
+    
+    # The scheduler's XPath service always holds the current XPaths
+    xpath_data = read_xpath_service("WhatsApp/Xpath")
+    if xpath_data:
+        XPATH_CACHE = dict(xpath_data)
+        print(f"✅ Loaded {len(XPATH_CACHE)} XPaths from the scheduler's XPath service")
+        return True
+    
+    # Then try to load from local file (if it exists from previous run)
     if os.path.exists(XPATH_FILE):
         print("📁 Found existing XPath file, loading from local file...")
         if load_xpaths_from_file():
@@ -180,6 +263,18 @@ def initialize_xpaths():
     print("🌐 Importing XPaths from database...")
     return import_all_xpaths_from_database()
 
+def is_own_browser_process(proc, names=('chrome', 'chromium', 'chromedriver')):
+    """True for a browser process this bot may close - all of them unless the scheduler assigned a profile"""
+    if (proc.info['name'] or '').lower() not in names:
+        return False
+    if not BOT_CHROME_PROFILE:
+        return True
+    # Other bots run their own profiles alongside this one - leave their browsers open
+    try:
+        return f"--user-data-dir={BOT_CHROME_PROFILE}" in proc.cmdline()
+    except psutil.Error:
+        return False
+
 def step1_close_chromium_browser():
     """Step 1: Check if Chromium browser is open and close it."""
     print("\n=== Step 1: Checking and closing Chromium browser ===")
@@ -194,7 +289,7 @@ def step1_close_chromium_browser():
                 process_pid = proc.info['pid']
                 
                 # Close Chromium browser processes
-                if process_name in ['chromium', 'chromium-browser', 'chrome']:
+                if is_own_browser_process(proc, ['chromium', 'chromium-browser', 'chrome']):
                     try:
                         proc.kill()
                         print(f"Closed {process_name} process (PID: {process_pid})")
@@ -219,18 +314,12 @@ def step1_close_chromium_browser():
         return False
 
 def step2_check_internet_connection():
-    """Step 2: Check internet connection using ping method."""
+    """Step 2: Check internet connection using the shared connectivity state."""
     print("\n=== Step 2: Checking internet connection ===")
     
     def check_internet():
-        """Checks for an active internet connection using ping."""
-        try:
-            subprocess.check_call(["ping", "-c", "1", "8.8.8.8"],
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        """Checks for an active internet connection using the shared connectivity state."""
+        return is_internet_available()
     
     # Check internet immediately first
     if check_internet():
@@ -251,7 +340,7 @@ def step2_check_internet_connection():
             print(f"\rInternet is not present waiting upto...{count}", end="", flush=True)
 
 def step3_import_spreadsheet_data():
-    """Step 3: Import data from Google Spreadsheet to Receiver list.txt"""
+    """Step 3: Import data from Google Spreadsheet to Receiver list.txt and the receiver store"""
     print("\n=== Step 3: Importing data from spreadsheet ===")
     
     # Use centralized configuration
@@ -293,16 +382,17 @@ def step3_import_spreadsheet_data():
     def format_data_for_output(all_data):
         """Format the spreadsheet data for text file output - SKIP ROWS without Country Code or WhatsApp Number"""
         formatted_lines = []
+        receiver_rows = []
         
         # Check if we have data (including header)
         if len(all_data) == 0:
-            return ["No data found in spreadsheet"]
+            return ["No data found in spreadsheet"], receiver_rows
         
         # Skip the header row (index 0) and start from actual data (index 1)
         data_rows = all_data[1:] if len(all_data) > 1 else []
         
         if len(data_rows) == 0:
-            return ["No data rows found (only header row present)"]
+            return ["No data rows found (only header row present)"], receiver_rows
         
         print(f"Processing {len(data_rows)} data rows (excluding header)")
         
@@ -344,9 +434,12 @@ def step3_import_spreadsheet_data():
             formatted_lines.append(f"Video Path = {video_path}")
             formatted_lines.append(f"Remark = {remark}")
             formatted_lines.append("")  # Empty line between rows
+            
+            receiver_rows.append((row_index + 2, date_time, name, country_code, whatsapp_number, message,
+                                  image_path, document_path, audio_path, video_path, remark))
         
         print(f"✅ Imported {len(data_rows) - skipped_rows} valid rows, skipped {skipped_rows} invalid rows")
-        return formatted_lines
+        return formatted_lines, receiver_rows
     
     def save_to_text_file(formatted_lines):
         """Save formatted data to text file"""
@@ -376,11 +469,11 @@ def step3_import_spreadsheet_data():
             print(f"Retrieved {len(all_data)} total rows from spreadsheet (including header)")
             
             # Format data for output
-            formatted_lines = format_data_for_output(all_data)
+            formatted_lines, receiver_rows = format_data_for_output(all_data)
             print("Data formatted successfully")
             
-            # Save to text file
-            if save_to_text_file(formatted_lines):
+            # Save to text file and build the receiver store Step 4 works from
+            if save_to_text_file(formatted_lines) and build_receiver_store(receiver_rows):
                 print("Step 3 completed successfully!")
                 return True
             
@@ -399,35 +492,108 @@ def step3_import_spreadsheet_data():
     
     return False
 
-def update_row_status_in_receiver_list(row_number, status):
-    """Update Row line with status like 'Row2:Processed successfully' or 'Row2:Invalid WhatsApp Number'"""
+# Receiver store - an indexed copy of Receiver list.txt so Step 4 never rescans or rewrites the text file
+RECEIVER_STORE_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.db")
+RECEIVER_FIELDS = [
+    ("date_time", "Date-Time"),
+    ("name", "Name"),
+    ("country_code", "Country Code"),
+    ("whatsapp_number", "WhatsApp Number"),
+    ("message", "Message"),
+    ("image_path", "Image | Photo Path"),
+    ("document_path", "Document Path"),
+    ("audio_path", "Audio Path"),
+    ("video_path", "Video Path"),
+    ("remark", "Remark"),
+]
+
+def open_receiver_store(path=RECEIVER_STORE_FILE):
+    """Open the receiver store with rows returned as dictionaries"""
+    connection = sqlite3.connect(path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+def build_receiver_store(receiver_rows):
+    """Create the receiver store from imported rows, replacing the previous one in a single rename"""
+    temp_file = RECEIVER_STORE_FILE + ".tmp"
     try:
-        RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
         
-        if not os.path.isfile(RECEIVER_LIST_FILE):
-            print(f"Receiver list file '{RECEIVER_LIST_FILE}' not found")
+        connection = open_receiver_store(temp_file)
+        try:
+            columns = ", ".join(f"{field} TEXT NOT NULL" for field, _ in RECEIVER_FIELDS)
+            connection.execute(f"CREATE TABLE receivers (row_number INTEGER PRIMARY KEY, {columns}, status TEXT NOT NULL DEFAULT '')")
+            # Pending rows have an empty status, so the next one is a single index seek
+            connection.execute("CREATE INDEX receivers_status ON receivers (status, row_number)")
+            placeholders = ", ".join("?" for _ in range(len(RECEIVER_FIELDS) + 1))
+            connection.executemany(f"INSERT INTO receivers VALUES ({placeholders}, '')", receiver_rows)
+            connection.commit()
+        finally:
+            connection.close()
+        
+        os.replace(temp_file, RECEIVER_STORE_FILE)
+        print(f"Receiver store built with {len(receiver_rows)} rows")
+        return True
+    except Exception as e:
+        raise Exception(f"Failed to build receiver store: {str(e)}")
+
+def next_pending_receiver(last_processed_row=None):
+    """Return the first row after last_processed_row that has no status yet, or None when all are done"""
+    connection = open_receiver_store()
+    try:
+        return connection.execute(
+            "SELECT * FROM receivers WHERE status = '' AND row_number > ? ORDER BY row_number LIMIT 1",
+            (int(last_processed_row) if last_processed_row else 0,)).fetchone()
+    finally:
+        connection.close()
+
+def update_receiver_field(row_number, field, value):
+    """Update one column of one row in place - returns True if the row exists"""
+    connection = open_receiver_store()
+    try:
+        with connection:
+            cursor = connection.execute(f"UPDATE receivers SET {field} = ? WHERE row_number = ?", (value, int(row_number)))
+        return cursor.rowcount == 1
+    finally:
+        connection.close()
+
+def read_receiver_rows():
+    """Return every row in the receiver store as (row number, data) pairs in sheet order"""
+    connection = open_receiver_store()
+    try:
+        rows = connection.execute("SELECT * FROM receivers ORDER BY row_number").fetchall()
+    finally:
+        connection.close()
+    return [(str(row["row_number"]), {field: row[field] for field, _ in RECEIVER_FIELDS}) for row in rows]
+
+def export_receiver_list_text():
+    """Write the receiver store back to Receiver list.txt so the file shows the latest status and remarks"""
+    RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
+    try:
+        if not os.path.isfile(RECEIVER_STORE_FILE):
             return False
         
-        # Read the current file
-        with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        updated = False
-        
-        # Find and update the Row line
-        for i, line in enumerate(lines):
-            if line.startswith(f"Row{row_number}:"):
-                # Update the Row line with status
-                lines[i] = f"Row{row_number}:{status}\n"
-                updated = True
-                print(f"Updated Row{row_number} status to: {status}")
-                break
-        
-        if updated:
-            # Write the updated content back to the file
+        connection = open_receiver_store()
+        try:
             with open(RECEIVER_LIST_FILE, 'w', encoding='utf-8') as file:
-                file.writelines(lines)
-            print(f"✅ Successfully updated Row{row_number} status in Receiver list.txt")
+                for row in connection.execute("SELECT * FROM receivers ORDER BY row_number"):
+                    file.write(f"Row{row['row_number']}:{row['status']}\n")
+                    for field, label in RECEIVER_FIELDS:
+                        file.write(f"{label} = {row[field]}\n")
+                    file.write("\n")
+        finally:
+            connection.close()
+        return True
+    except Exception as e:
+        print(f"❌ Error writing Receiver list.txt from the receiver store: {str(e)}")
+        return False
+
+def update_row_status_in_receiver_list(row_number, status):
+    """Update Row status like 'Processed successfully' or 'Invalid WhatsApp Number' in the receiver store"""
+    try:
+        if update_receiver_field(row_number, "status", status):
+            print(f"✅ Updated Row{row_number} status to: {status}")
             return True
         else:
             print(f"❌ Could not find Row{row_number} to update")
@@ -1056,36 +1222,14 @@ def send_video_with_caption_flow(video_path, current_row_number):
 def update_receiver_list_timestamp(current_row_number):
     """Update Date-Time in Receiver list with current timestamp"""
     try:
-        RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
-        
         if not current_row_number:
             print("No current row number to update")
             return False
         
-        # Read the current file
-        with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        # Find and update the Date-Time line
-        updated = False
-        for i, line in enumerate(lines):
-            if (line.startswith(f"Row{current_row_number}:") or 
-                (f"Row{current_row_number}:" in line and (i == 0 or lines[i-1].startswith("Row")))):
-                # Found the row, now find the Date-Time line
-                for j in range(i, min(i+10, len(lines))):
-                    if lines[j].startswith("Date-Time = "):
-                        # Update with current datetime
-                        current_datetime = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-                        lines[j] = f"Date-Time = {current_datetime}\n"
-                        updated = True
-                        print(f"Updated Date-Time for Row{current_row_number} to {current_datetime}")
-                        break
-                break
-        
-        if updated:
-            # Write the updated content back to the file
-            with open(RECEIVER_LIST_FILE, 'w', encoding='utf-8') as file:
-                file.writelines(lines)
+        # Update with current datetime
+        current_datetime = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        if update_receiver_field(current_row_number, "date_time", current_datetime):
+            print(f"Updated Date-Time for Row{current_row_number} to {current_datetime}")
             return True
         else:
             print(f"Could not find Date-Time line for Row{current_row_number} to update")
@@ -1098,16 +1242,10 @@ def update_receiver_list_timestamp(current_row_number):
 def update_remark_based_on_media(current_row_number, processed_media, current_person_data):
     """Update Remark field with timestamp and all person data with | separators"""
     try:
-        RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
-        
         if not current_row_number:
             print("No current row number to update in remark")
             return False
         
-        # Read the current file
-        with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
         # Get current timestamp
         current_timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
         
@@ -1117,32 +1255,17 @@ def update_remark_based_on_media(current_row_number, processed_media, current_pe
         whatsapp_number = current_person_data.get('phone_number', 'Empty Cell')
         message = current_person_data.get('message', 'Empty Cell')
         
-        # Find and update the Remark line
-        updated = False
-        for i, line in enumerate(lines):
-            if (line.startswith(f"Row{current_row_number}:") or 
-                (f"Row{current_row_number}:" in line and (i == 0 or lines[i-1].startswith("Row")))):
-                # Found the row, now find the Remark line
-                for j in range(i, min(i+15, len(lines))):
-                    if lines[j].startswith("Remark = "):
-                        # Update remark with timestamp, person data, and processed media status with | separators
-                        if processed_media:
-                            # Join all status items with | separator
-                            status_text = " | ".join(processed_media)
-                            # Only include person data once, then media status
-                            remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | {status_text}"
-                        else:
-                            remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | No media processed"
-                        lines[j] = f"Remark = {remark_text}\n"
-                        updated = True
-                        print(f"Updated Remark for Row{current_row_number}")
-                        break
-                break
+        # Update remark with timestamp, person data, and processed media status with | separators
+        if processed_media:
+            # Join all status items with | separator
+            status_text = " | ".join(processed_media)
+            # Only include person data once, then media status
+            remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | {status_text}"
+        else:
+            remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | No media processed"
         
-        if updated:
-            # Write the updated content back to the file
-            with open(RECEIVER_LIST_FILE, 'w', encoding='utf-8') as file:
-                file.writelines(lines)
+        if update_receiver_field(current_row_number, "remark", remark_text):
+            print(f"Updated Remark for Row{current_row_number}")
             return True
         else:
             print(f"Could not find Remark line for Row{current_row_number} to update")
@@ -1155,16 +1278,10 @@ def update_remark_based_on_media(current_row_number, processed_media, current_pe
 def update_remark_for_invalid_number(current_row_number, current_person_data):
     """Update Remark field for invalid WhatsApp number with full person data and failed media status"""
     try:
-        RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
-        
         if not current_row_number:
             print("No current row number to update")
             return False
         
-        # Read the current file
-        with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
         # Get current timestamp
         current_timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
         
@@ -1174,26 +1291,10 @@ def update_remark_for_invalid_number(current_row_number, current_person_data):
         whatsapp_number = current_person_data.get('phone_number', 'Empty Cell')
         message = current_person_data.get('message', 'Empty Cell')
         
-        # Find and update the Remark line
-        updated = False
-        for i, line in enumerate(lines):
-            if (line.startswith(f"Row{current_row_number}:") or 
-                (f"Row{current_row_number}:" in line and (i == 0 or lines[i-1].startswith("Row")))):
-                # Found the row, now find the Remark line
-                for j in range(i, min(i+15, len(lines))):
-                    if lines[j].startswith("Remark = "):
-                        # Update remark with timestamp, person data, and failed media status with | separators
-                        remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | Failed to send Image | Failed to send document | Failed to send audio | Failed to send video | Invalid WhatsApp Number"
-                        lines[j] = f"Remark = {remark_text}\n"
-                        updated = True
-                        print(f"Updated Remark for Row{current_row_number}")
-                        break
-                break
-        
-        if updated:
-            # Write the updated content back to the file
-            with open(RECEIVER_LIST_FILE, 'w', encoding='utf-8') as file:
-                file.writelines(lines)
+        # Update remark with timestamp, person data, and failed media status with | separators
+        remark_text = f"{current_timestamp} | {name} | {country_code} | {whatsapp_number} | {message} | Failed to send Image | Failed to send document | Failed to send audio | Failed to send video | Invalid WhatsApp Number"
+        if update_receiver_field(current_row_number, "remark", remark_text):
+            print(f"Updated Remark for Row{current_row_number}")
             print(f"✅ Successfully updated Remark for invalid number with full data")
             return True
         else:
@@ -1337,7 +1438,8 @@ def create_manual_export_backup():
             print("❌ No Receiver list file found for manual backup")
             return False
         
-        # Copy the Receiver list file as backup
+        # Refresh the file from the receiver store, then copy it as backup
+        export_receiver_list_text()
         import shutil
         shutil.copy2(RECEIVER_LIST_FILE, MANUAL_EXPORT_FILE)
         print(f"✅ Created manual export backup: {MANUAL_EXPORT_FILE}")
@@ -1349,12 +1451,11 @@ def create_manual_export_backup():
         return False
 
 def step5_export_to_google_sheets():
-    """Step 5: Export data from Receiver list.txt to Google Sheets Sent Report"""
+    """Step 5: Export data from the receiver store to Google Sheets Sent Report"""
     print("\n=== Step 5: Exporting data to Google Sheets Sent Report ===")
     
     # Use centralized configuration
     SHEET_NAME = "sent report"  # Changed from "Sent Report" to "sent report"
-    RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
     
     def setup_google_sheets_client():
         """Setup and authenticate Google Sheets client"""
@@ -1373,64 +1474,16 @@ def step5_export_to_google_sheets():
             raise Exception(f"Failed to setup Google Sheets client: {str(e)}")
     
     def parse_receiver_list_file():
-        """Parse Receiver list.txt file and extract all processed data"""
+        """Read all processed data from the receiver store and refresh Receiver list.txt"""
         try:
-            if not os.path.isfile(RECEIVER_LIST_FILE):
-                print(f"Receiver list file '{RECEIVER_LIST_FILE}' not found")
+            if not os.path.isfile(RECEIVER_STORE_FILE):
+                print(f"Receiver store '{RECEIVER_STORE_FILE}' not found")
                 return []
             
-            with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-                content = file.read()
+            export_receiver_list_text()
+            rows_data = read_receiver_rows()
             
-            lines = content.split('\n')
-            rows_data = []
-            current_row = {}
-            current_row_number = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if line.startswith("Row"):
-                    # Save previous row if exists
-                    if current_row and current_row_number:
-                        rows_data.append((current_row_number, current_row))
-                        # Debug output
-                        print(f"DEBUG - Parsed Row{current_row_number}: Name='{current_row.get('name', 'NOT FOUND')}'")
-                    
-                    # Start new row
-                    current_row_number = line.replace("Row", "").replace(":", "").replace("Processed successfully", "").replace("Invalid WhatsApp Number", "").strip()
-                    current_row = {}
-                
-                elif line.startswith("Date-Time = "):
-                    current_row['date_time'] = line.replace("Date-Time = ", "").strip()
-                elif line.startswith("Name = "):
-                    current_row['name'] = line.replace("Name = ", "").strip()
-                elif line.startswith("Country Code = "):
-                    current_row['country_code'] = line.replace("Country Code = ", "").strip()
-                elif line.startswith("WhatsApp Number = "):
-                    current_row['whatsapp_number'] = line.replace("WhatsApp Number = ", "").strip()
-                elif line.startswith("Message = "):
-                    current_row['message'] = line.replace("Message = ", "").strip()
-                elif line.startswith("Image | Photo Path = "):
-                    current_row['image_path'] = line.replace("Image | Photo Path = ", "").strip()
-                elif line.startswith("Document Path = "):
-                    current_row['document_path'] = line.replace("Document Path = ", "").strip()
-                elif line.startswith("Audio Path = "):
-                    current_row['audio_path'] = line.replace("Audio Path = ", "").strip()
-                elif line.startswith("Video Path = "):
-                    current_row['video_path'] = line.replace("Video Path = ", "").strip()
-                elif line.startswith("Remark = "):
-                    current_row['remark'] = line.replace("Remark = ", "").strip()
-            
-            # Add the last row
-            if current_row and current_row_number:
-                rows_data.append((current_row_number, current_row))
-                # Debug output for last row
-                print(f"DEBUG - Parsed Row{current_row_number}: Name='{current_row.get('name', 'NOT FOUND')}'")
-            
-            print(f"Parsed {len(rows_data)} rows from Receiver list.txt")
+            print(f"Parsed {len(rows_data)} rows from the receiver store")
             return rows_data
             
         except Exception as e:
@@ -1589,7 +1642,7 @@ def step5_export_to_google_sheets():
             client = setup_google_sheets_client()
             print("Google Sheets client authenticated successfully")
             
-            # Parse Receiver list.txt
+            # Read rows from the receiver store
             rows_data = parse_receiver_list_file()
             if not rows_data:
                 print("No data found in Receiver list.txt to export")
@@ -1701,7 +1754,7 @@ def send_whatsapp_report():
         
         # Close existing browsers
         for proc in psutil.process_iter(['name']):
-            if proc.info['name'] in ['chrome', 'chromium', 'chromedriver']:
+            if is_own_browser_process(proc):
                 try:
                     proc.kill()
                 except:
@@ -2057,9 +2110,6 @@ def step4_open_chrome_and_enter_phone_number():
     global driver
     print("\n=== Step 4: Opening Chrome and entering WhatsApp phone number ===")
     
-    # Use centralized configuration
-    RECEIVER_LIST_FILE = os.path.join(WHATSAPP_BOT_DIR, "Receiver list.txt")
-    
     current_phone_number = None
     current_row_number = None
     current_person_data = None
@@ -2068,7 +2118,7 @@ def step4_open_chrome_and_enter_phone_number():
         """Close all Chrome/Chromium browsers"""
         try:
             for proc in psutil.process_iter(['name']):
-                if proc.info['name'] in ['chrome', 'chromium', 'chromedriver']:
+                if is_own_browser_process(proc):
                     try:
                         proc.kill()
                         print(f"Killed process: {proc.info['name']}")
@@ -2082,13 +2132,7 @@ def step4_open_chrome_and_enter_phone_number():
     
     def check_internet():
         """Check internet connection"""
-        try:
-            subprocess.check_call(["ping", "-c", "1", "8.8.8.8"],
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return is_internet_available()
     
     def wait_for_internet():
         """Wait for internet connection"""
@@ -2269,111 +2313,45 @@ def step4_open_chrome_and_enter_phone_number():
             return False
     
     def read_phone_number_from_receiver_list(last_processed_row=None):
-        """Read next phone number from Receiver list.txt file - finds next valid number after last_processed_row"""
+        """Read next phone number from the receiver store - finds next pending row after last_processed_row"""
         nonlocal current_phone_number, current_row_number, current_person_data
         
         try:
-            if not os.path.isfile(RECEIVER_LIST_FILE):
-                print(f"Receiver list file '{RECEIVER_LIST_FILE}' not found")
+            if not os.path.isfile(RECEIVER_STORE_FILE):
+                print(f"Receiver store '{RECEIVER_STORE_FILE}' not found")
                 return None
             
-            with open(RECEIVER_LIST_FILE, 'r', encoding='utf-8') as file:
-                content = file.read()
-            
-            # Find the next valid phone number in the file that hasn't been processed yet
-            lines = content.split('\n')
-            phone_number = None
-            country_code = None
-            current_row = None
-            found_last_row = last_processed_row is None  # If no last processed row, start from first
-            skip_current_row = False
-            
-            # Store person data
-            person_data = {}
+            # Rows already marked with a status are skipped by the index lookup
+            receiver = next_pending_receiver(last_processed_row)
+            if receiver is None:
+                print("No more valid phone numbers found in Receiver list")
+                return None
             
-            for i, line in enumerate(lines):
-                if line.startswith("Row"):
-                    current_row = line.replace("Row", "").replace(":", "").replace("Processed successfully", "").replace("Invalid WhatsApp Number", "").strip()
-                    
-                    # Check if we should start processing from this row
-                    if found_last_row:
-                        current_row_number = current_row
-                        person_data = {'row': current_row}
-                        skip_current_row = False
-                    elif current_row == last_processed_row:
-                        found_last_row = True
-                        continue
-                    else:
-                        continue
-                
-                if found_last_row and not skip_current_row:
-                    if line.startswith("Country Code = ") and "Empty Cell" not in line:
-                        country_code = line.replace("Country Code = ", "").strip()
-                        person_data['country_code'] = country_code
-                    
-                    if line.startswith("WhatsApp Number = ") and "Empty Cell" not in line:
-                        whatsapp_number_line = line
-                        whatsapp_number = line.replace("WhatsApp Number = ", "").strip()
-                        
-                        # Check if this row has already been processed (Row line contains status)
-                        row_line_index = i
-                        while row_line_index >= 0 and not lines[row_line_index].startswith("Row"):
-                            row_line_index -= 1
-                        
-                        if row_line_index >= 0 and ("Processed successfully" in lines[row_line_index] or "Invalid WhatsApp Number" in lines[row_line_index]):
-                            # This row has already been processed, skip it and continue to next row
-                            print(f"Row {current_row} already processed, skipping...")
-                            skip_current_row = True
-                            # Reset for next row but keep looking
-                            country_code = None
-                            whatsapp_number = None
-                            person_data = {}
-                            continue
-                        
-                        # Only process if we have both country code and whatsapp number
-                        if country_code and whatsapp_number:
-                            # Format as +countrycode whatsappnumber (with space)
-                            phone_number = f"+{country_code} {whatsapp_number}"
-                            current_phone_number = whatsapp_number  # Store the raw number for updating
-                            
-                            # Store all person data
-                            person_data['phone_number'] = whatsapp_number
-                            person_data['formatted_phone'] = phone_number
-                            
-                            print(f"Found valid phone number in {current_row}: {phone_number}")
-                            
-                            # Read the rest of the person's data
-                            for j in range(i, min(i+20, len(lines))):
-                                if lines[j].startswith("Name = "):
-                                    person_data['name'] = lines[j].replace("Name = ", "").strip()
-                                elif lines[j].startswith("Message = "):
-                                    person_data['message'] = lines[j].replace("Message = ", "").strip()
-                                elif lines[j].startswith("Image | Photo Path = "):
-                                    person_data['image_path'] = lines[j].replace("Image | Photo Path = ", "").strip()
-                                elif lines[j].startswith("Document Path = "):
-                                    person_data['document_path'] = lines[j].replace("Document Path = ", "").strip()
-                                elif lines[j].startswith("Audio Path = "):
-                                    person_data['audio_path'] = lines[j].replace("Audio Path = ", "").strip()
-                                elif lines[j].startswith("Video Path = "):
-                                    person_data['video_path'] = lines[j].replace("Video Path = ", "").strip()
-                                elif lines[j].startswith("Remark = "):
-                                    person_data['remark'] = lines[j].replace("Remark = ", "").strip()
-                                elif lines[j].startswith("Row") and j > i:
-                                    break
-                            
-                            current_person_data = person_data
-                            return phone_number
-                        else:
-                            # Skip this row - missing either country code or phone number
-                            print(f"Skipping {current_row} - Missing Country Code or WhatsApp Number")
-                            # Reset for next row but keep looking
-                            country_code = None
-                            whatsapp_number = None
-                            person_data = {}
-                            skip_current_row = True
-            
-            print("No more valid phone numbers found in Receiver list.txt")
-            return None
+            current_row_number = str(receiver['row_number'])
+            country_code = receiver['country_code']
+            whatsapp_number = receiver['whatsapp_number']
+            
+            # Format as +countrycode whatsappnumber (with space)
+            phone_number = f"+{country_code} {whatsapp_number}"
+            current_phone_number = whatsapp_number  # Store the raw number for updating
+            
+            # Store all person data
+            current_person_data = {
+                'row': current_row_number,
+                'country_code': country_code,
+                'phone_number': whatsapp_number,
+                'formatted_phone': phone_number,
+                'name': receiver['name'],
+                'message': receiver['message'],
+                'image_path': receiver['image_path'],
+                'document_path': receiver['document_path'],
+                'audio_path': receiver['audio_path'],
+                'video_path': receiver['video_path'],
+                'remark': receiver['remark'],
+            }
+            
+            print(f"Found valid phone number in {current_row_number}: {phone_number}")
+            return phone_number
                 
         except Exception as e:
             print(f"Error reading phone number from Receiver list: {str(e)}")
@@ -2637,10 +2615,10 @@ def step4_open_chrome_and_enter_phone_number():
                 # Update Remark with full person data and failed media status
                 if update_remark_for_invalid_number(current_row_number, current_person_data):
                     print("✅ Successfully marked as invalid. Moving to next person...")
-                    return process_next_person(current_row_number)
+                    return True
             else:
                 print("❌ Failed to update file. Moving to next person...")
-                return process_next_person(current_row_number)
+                return True
         else:
             # Keyword not found, continue with normal process
             print("✅ Contact found! Continuing with normal process...")
@@ -2663,8 +2641,8 @@ def step4_open_chrome_and_enter_phone_number():
                 else:
                     print("⚠️ Person processed with some failures - marked as processed anyway")
             
-            # Process next person
-            return process_next_person(current_row_number)
+            # Move on to the next person
+            return True
     
     # Main execution with continuous retry
     retry_count = 0
@@ -2674,15 +2652,18 @@ def step4_open_chrome_and_enter_phone_number():
         try:
             print(f"🔄 Attempt {retry_count + 1} to open Chrome and enter phone number...")
             
+            # One person per call - a loop instead of recursion keeps long campaigns within the stack limit
             result = process_single_person()
-            if not result:
-                # If process_single_person returns False, it means no more valid numbers
-                print("✅ No more valid phone numbers to process - stopping bot")
-                # Close browser when done
-                if driver:
-                    driver.quit()
-                    driver = None
-                return True
+            while result:
+                result = process_next_person(current_row_number)
+            
+            # process_single_person returned False, which means no more valid numbers
+            print("✅ No more valid phone numbers to process - stopping bot")
+            # Close browser when done
+            if driver:
+                driver.quit()
+                driver = None
+            return True
                 
         except Exception as e:
             retry_count += 1
@@ -2716,7 +2697,7 @@ if __name__ == "__main__":
         print(f"📅 Program started at: {PROGRAM_START_TIME.strftime('%d-%m-%Y %H:%M:%S')}")
         
         # Step 0: Initialize XPaths (import from database or load from file)
-        if not initialize_xpaths():
+        if not timed_step("initialize xpaths", initialize_xpaths):
             print("❌ Failed to initialize XPaths. Exiting...")
             exit(1)
         
@@ -2724,16 +2705,16 @@ if __name__ == "__main__":
         should_send_report = True
         
         # Step 1: Close Chromium browser
-        if step1_close_chromium_browser():
+        if timed_step("close chromium", step1_close_chromium_browser):
             # Step 2: Check internet connection
-            if step2_check_internet_connection():
+            if timed_step("check internet", step2_check_internet_connection):
                 # Step 3: Import spreadsheet data
-                if step3_import_spreadsheet_data():
+                if timed_step("import spreadsheet", step3_import_spreadsheet_data):
                     # Step 4: Open Chrome and enter phone number
-                    step4_result = step4_open_chrome_and_enter_phone_number()
+                    step4_result = timed_step("send messages", step4_open_chrome_and_enter_phone_number)
                     
                     # Step 5: Export to Google Sheets Sent Report (with retry logic)
-                    step5_success = step5_export_to_google_sheets()
+                    step5_success = timed_step("export sent report", step5_export_to_google_sheets)
                     
                     # If Step 5 fails, create manual backup
                     if not step5_success:
@@ -2742,7 +2723,7 @@ if __name__ == "__main__":
                     
                     # ALWAYS send WhatsApp report regardless of previous steps
                     print("\n=== Proceeding to send WhatsApp Report ===")
-                    send_whatsapp_report()
+                    timed_step("send whatsapp report", send_whatsapp_report)
         
         # Final step: Delete XPath file after bot completion
         print("\n=== Cleaning up XPath files ===")